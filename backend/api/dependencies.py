@@ -1,13 +1,28 @@
 from functools import lru_cache
 import os
+import secrets
 from typing import Optional, Union
 
+from fastapi import Header, HTTPException, status
 from sqlalchemy.orm import Session, sessionmaker
 
 from backend.db.session import create_session_factory_from_env
+from backend.services.batch_service import BatchReportService
+from backend.services.generation_scheduler import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PER_USER_CONCURRENCY,
+    GenerationScheduler,
+)
+from backend.services.outline_cache import OutlineCache
 from backend.services.outline_service import OutlineService
+from backend.services.report_events import ReportEventLogRegistry
+from backend.services.related_topics import DEFAULT_REUSE_THRESHOLD, ExistingReportMatcher
 from backend.services.report_service import ReportGeneratorService
-from backend.services.suggestion_service import SuggestionService
+from backend.services.suggestion_service import (
+    DEFAULT_CACHE_STALE_SECONDS,
+    DEFAULT_CACHE_TTL_SECONDS,
+    SuggestionService,
+)
 from backend.storage import FilesystemReportStore, DatabaseReportStore
 
 @lru_cache
@@ -25,14 +40,66 @@ def get_report_store() -> Optional[Union[DatabaseReportStore, FilesystemReportSt
     return DatabaseReportStore()
 
 
+@lru_cache
+def get_generation_scheduler() -> Optional[GenerationScheduler]:
+    max_concurrency = int(
+        os.environ.get("EXPLORER_LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+    )
+    if max_concurrency <= 0:
+        return None
+    per_user_concurrency = int(
+        os.environ.get("EXPLORER_LLM_USER_CONCURRENCY", DEFAULT_PER_USER_CONCURRENCY)
+    )
+    return GenerationScheduler(
+        max_concurrency=max_concurrency,
+        per_user_concurrency=per_user_concurrency,
+    )
+
+
+@lru_cache
+def get_report_matcher() -> Optional[ExistingReportMatcher]:
+    report_store = get_report_store()
+    if not isinstance(report_store, DatabaseReportStore):
+        return None
+    return ExistingReportMatcher(
+        get_session_factory(),
+        base_dir=report_store.base_dir,
+        embedding_backend=report_store.embedding_backend,
+        threshold=float(
+            os.environ.get("EXPLORER_REPORT_REUSE_THRESHOLD", DEFAULT_REUSE_THRESHOLD)
+        ),
+    )
+
+
+@lru_cache
+def get_outline_cache() -> OutlineCache:
+    report_store = get_report_store()
+    return OutlineCache(
+        get_session_factory() if isinstance(report_store, DatabaseReportStore) else None
+    )
+
+
 @lru_cache
 def get_report_service() -> ReportGeneratorService:
     return ReportGeneratorService(
         outline_service=get_outline_service(),
         report_store=get_report_store(),
+        scheduler=get_generation_scheduler(),
+        report_matcher=get_report_matcher(),
+        outline_cache=get_outline_cache(),
     )
 
 
+@lru_cache
+def get_batch_report_service() -> BatchReportService:
+    return BatchReportService(get_report_service(), report_matcher=get_report_matcher())
+
+
+@lru_cache
+def get_report_event_logs() -> ReportEventLogRegistry:
+    return ReportEventLogRegistry()
+
+
 @lru_cache
 def get_session_factory() -> sessionmaker[Session]:
     return create_session_factory_from_env(
@@ -43,4 +110,21 @@ def get_session_factory() -> sessionmaker[Session]:
 
 @lru_cache
 def get_suggestion_service() -> SuggestionService:
-    return SuggestionService()
+    return SuggestionService(
+        cache_ttl=float(
+            os.environ.get("EXPLORER_SUGGESTION_CACHE_TTL", DEFAULT_CACHE_TTL_SECONDS)
+        ),
+        cache_stale_seconds=float(
+            os.environ.get("EXPLORER_SUGGESTION_CACHE_STALE", DEFAULT_CACHE_STALE_SECONDS)
+        ),
+    )
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Gate operational endpoints behind ``EXPLORER_ADMIN_TOKEN``; unset hides them."""
+
+    expected = os.environ.get("EXPLORER_ADMIN_TOKEN", "")
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token.")
@@ -1,12 +1,32 @@
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Literal, Optional
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Query, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from fastapi.staticfiles import StaticFiles
 
+from backend.api.dependencies import require_admin
 from backend.api.routers import collections, reports, suggestions, topics
+from backend.schemas import LoopMonitorSettings
+from backend.utils.loop_monitor import LOOP_MONITOR, loop_monitor_enabled_by_env
+from backend.utils.metrics import CONTENT_TYPE, REGISTRY
+from backend.utils.profiler import sample_stacks, to_collapsed, to_speedscope, tracemalloc_diff
 
-app = FastAPI(title="Explorer", version="2.0.0")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if loop_monitor_enabled_by_env():
+        LOOP_MONITOR.start()
+    try:
+        yield
+    finally:
+        LOOP_MONITOR.stop()
+
+
+app = FastAPI(title="Explorer", version="2.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,6 +49,72 @@ def list_routes():
     return {"paths": [route.path for route in app.routes]}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/debug/loop-monitor", include_in_schema=False, dependencies=[Depends(require_admin)])
+def loop_monitor_status():
+    return LOOP_MONITOR.snapshot()
+
+
+@app.put("/debug/loop-monitor", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def configure_loop_monitor(settings: LoopMonitorSettings):
+    # Async so start() attaches to the serving event loop rather than a threadpool worker.
+    LOOP_MONITOR.configure(
+        interval=settings.interval_ms / 1000 if settings.interval_ms else None,
+        slow_callback_threshold=(
+            settings.slow_callback_ms / 1000 if settings.slow_callback_ms else None
+        ),
+    )
+    if settings.reset:
+        LOOP_MONITOR.reset()
+    if settings.enabled:
+        LOOP_MONITOR.start()
+    else:
+        LOOP_MONITOR.stop()
+    return LOOP_MONITOR.snapshot()
+
+
+# One profiling session per worker: concurrent samplers would skew each other.
+_profiling_lock = asyncio.Lock()
+
+
+@app.get("/debug/profile", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def profile_worker(
+    seconds: float = Query(10.0, gt=0, le=120),
+    interval_ms: float = Query(10.0, ge=1, le=1000),
+    format: Literal["collapsed", "speedscope"] = Query("collapsed"),
+):
+    if _profiling_lock.locked():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running.")
+    async with _profiling_lock:
+        # Sample from a worker thread so the event loop keeps serving what we measure.
+        samples = await asyncio.to_thread(sample_stacks, seconds, interval=interval_ms / 1000)
+    if format == "speedscope":
+        return JSONResponse(
+            to_speedscope(samples),
+            headers={"Content-Disposition": 'attachment; filename="profile.speedscope.json"'},
+        )
+    return PlainTextResponse(to_collapsed(samples))
+
+
+@app.get("/debug/tracemalloc", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def tracemalloc_worker(
+    seconds: float = Query(30.0, gt=0, le=600),
+    top: int = Query(25, ge=1, le=500),
+    key_type: Literal["traceback", "lineno", "filename"] = Query("traceback"),
+    include: Optional[str] = Query(None, description="Keep allocations with a frame path containing this text."),
+):
+    if _profiling_lock.locked():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running.")
+    async with _profiling_lock:
+        return await asyncio.to_thread(
+            tracemalloc_diff, seconds, top=top, key_type=key_type, include=include
+        )
+
+
 frontend_dir = Path(__file__).resolve().parents[2] / "frontend" / "web" / "dist"
 if frontend_dir.exists():
     # Serve the built frontend and assets from the root so /assets/* resolves correctly.
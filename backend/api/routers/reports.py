@@ -3,20 +3,32 @@ import json
 from typing import List, Optional
 import uuid
 
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Header, Query, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
 from pydantic import EmailStr
 from sqlalchemy.orm import Session, sessionmaker
 
 from backend.api.dependencies import (
+    get_batch_report_service,
     get_session_factory,
+    get_report_event_logs,
     get_report_store,
     get_report_service,
 )
 from backend.db import Report, session_scope
-from backend.schemas import ReportResponse, GenerateRequest
+from backend.schemas import BatchGenerateRequest, ReportResponse, GenerateRequest
+from backend.services.batch_service import BatchReportService
+from backend.services.report_events import (
+    ReportEventLog,
+    ReportEventLogRegistry,
+    ReportStreamLimitError,
+    iter_ndjson_event,
+    iter_sse_event,
+    parse_event_id,
+)
 from backend.services.report_service import ReportGeneratorService
 from backend.storage import FilesystemReportStore, DatabaseReportStore
+from backend.utils.tracing import parse_traceparent
 from backend.utils.api_helpers import (
     build_report_response,
     get_user_report,
@@ -31,11 +43,50 @@ router = APIRouter()
 @router.post("/generate_report")
 def generate_report(
     generate_request: GenerateRequest,
+    http_request: Request,
+    traceparent: Optional[str] = Header(None),
     report_service: ReportGeneratorService = Depends(get_report_service),
+):
+    trace_parent = parse_traceparent(traceparent)
+
+    async def event_stream():
+        try:
+            async for event in report_service.stream_report(
+                generate_request,
+                trace_parent=trace_parent,
+                client_id=_client_id(http_request),
+            ):
+                for piece in iter_ndjson_event(event):
+                    yield piece
+        except asyncio.CancelledError:
+            raise
+        except Exception as exception:
+            yield json.dumps({"status": "error", "detail": str(exception)}) + "\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+def _client_id(http_request: Request) -> Optional[str]:
+    """Scheduler fairness key for requests that do not name a user."""
+
+    return http_request.client.host if http_request.client else None
+
+
+@router.post("/generate_reports/batch")
+def generate_reports_batch(
+    batch_request: BatchGenerateRequest,
+    batch_service: BatchReportService = Depends(get_batch_report_service),
 ):
     async def event_stream():
         try:
-            async for event in report_service.stream_report(generate_request):
+            async for event in batch_service.stream_batch(batch_request):
                 yield json.dumps(event) + "\n"
         except asyncio.CancelledError:
             raise
@@ -52,6 +103,91 @@ def generate_report(
     )
 
 
+@router.post("/generate_report/sse")
+async def generate_report_sse(
+    generate_request: GenerateRequest,
+    http_request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    traceparent: Optional[str] = Header(None),
+    report_service: ReportGeneratorService = Depends(get_report_service),
+    event_logs: ReportEventLogRegistry = Depends(get_report_event_logs),
+):
+    if last_event_id:
+        return _resume_event_stream(event_logs, last_event_id)
+    events = report_service.stream_report(
+        generate_request,
+        trace_parent=parse_traceparent(traceparent),
+        client_id=_client_id(http_request),
+    )
+    try:
+        log = event_logs.start(events)
+    except ReportStreamLimitError as exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exception),
+            headers={"Retry-After": "30"},
+        ) from exception
+    return _sse_response(log, 0)
+
+
+@router.get("/generate_report/sse/{stream_id}")
+def resume_report_sse(
+    stream_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    last_event_id_query: Optional[str] = Query(
+        None,
+        alias="last_event_id",
+        description="Fallback for clients that cannot send the Last-Event-ID header.",
+    ),
+    event_logs: ReportEventLogRegistry = Depends(get_report_event_logs),
+):
+    resume_from = last_event_id or last_event_id_query
+    if not resume_from:
+        resume_from = f"{stream_id}:0"
+    parsed = parse_event_id(resume_from)
+    if parsed is None or parsed[0] != stream_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Last-Event-ID does not belong to this stream.",
+        )
+    return _resume_event_stream(event_logs, resume_from)
+
+
+def _resume_event_stream(
+    event_logs: ReportEventLogRegistry, last_event_id: str
+) -> StreamingResponse:
+    parsed = parse_event_id(last_event_id)
+    if parsed is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Malformed Last-Event-ID header.",
+        )
+    stream_id, event_id = parsed
+    log = event_logs.get(stream_id)
+    if log is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event stream not found or expired.",
+        )
+    return _sse_response(log, event_id)
+
+
+def _sse_response(log: ReportEventLog, last_event_id: int) -> StreamingResponse:
+    async def event_stream():
+        async for event_id, event in log.follow(last_event_id):
+            for piece in iter_sse_event(log.stream_id, event_id, event):
+                yield piece
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.get("/reports", response_model=List[ReportResponse])
 def list_reports(
     user_email: Optional[EmailStr] = Query(
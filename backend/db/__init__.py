@@ -8,6 +8,7 @@ This module centralizes imports so application code can simply consume
 from .models import (
     Base,
     Report,
+    ReportHeading,
     ReportStatus,
     SavedTopic,
     TopicCollection,
@@ -23,6 +24,7 @@ from .session import (
 __all__ = [
     "Base",
     "Report",
+    "ReportHeading",
     "ReportStatus",
     "SavedTopic",
     "TopicCollection",
@@ -222,6 +222,8 @@ class Report(Base, TimestampMixin, SoftDeleteMixin):
         Index("ix_reports_owner_created_at", "owner_user_id", "created_at"),
         Index("ix_reports_topic_status", "saved_topic_id", "status"),
         Index("ix_reports_publication", "status", "published_at"),
+        Index("ix_reports_outline_cache_key", "outline_cache_key"),
+        Index("ix_reports_owner_topic_key", "owner_user_id", "topic_key"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -242,6 +244,9 @@ class Report(Base, TimestampMixin, SoftDeleteMixin):
     outline_snapshot: Mapped[Optional[Dict[str, Any]]] = mapped_column(
         MutableDict.as_mutable(JSON)
     )
+    outline_cache_key: Mapped[Optional[str]] = mapped_column(String(64))
+    topic_key: Mapped[Optional[str]] = mapped_column(String(255))
+    settings_key: Mapped[Optional[str]] = mapped_column(String(64))
     status: Mapped[ReportStatus] = mapped_column(
         Enum(ReportStatus),
         default=ReportStatus.DRAFT,
@@ -286,17 +291,82 @@ class Report(Base, TimestampMixin, SoftDeleteMixin):
         back_populates="reports",
         passive_deletes=True,
     )
+    headings: Mapped[List["ReportHeading"]] = relationship(
+        back_populates="report",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="ReportHeading.position",
+    )
 
     def mark_accessed(self) -> None:
         """Update ``last_accessed_at`` to now for engagement tracking."""
 
         self.last_accessed_at = datetime.now(tz=timezone.utc)
 
+    def set_headings(self, outline: Optional[Dict[str, Any]]) -> None:
+        """Replace the heading index rows with the section/subsection titles of ``outline``."""
+
+        headings: List[str] = []
+        for section in (outline or {}).get("sections") or []:
+            for title in [section.get("title"), *(section.get("subsections") or [])]:
+                cleaned = " ".join((title or "").split())[:255]
+                if cleaned:
+                    headings.append(cleaned)
+        created_at = self.created_at or datetime.now(tz=timezone.utc)
+        self.headings = [
+            ReportHeading(
+                owner_user_id=self.owner_user_id,
+                heading=heading,
+                position=position,
+                created_at=created_at,
+            )
+            for position, heading in enumerate(headings)
+        ]
+
+
+class ReportHeading(Base):
+    """Section and subsection titles of a report, denormalized for suggestion seeding."""
+
+    __tablename__ = "report_headings"
+    __table_args__ = (
+        Index("ix_report_headings_owner_created_at", "owner_user_id", "created_at"),
+        Index("ix_report_headings_report", "report_id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        GUID(),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    report_id: Mapped[uuid.UUID] = mapped_column(
+        GUID(),
+        ForeignKey("reports.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    owner_user_id: Mapped[uuid.UUID] = mapped_column(
+        GUID(),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    heading: Mapped[str] = mapped_column(String(255), nullable=False)
+    position: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    embedding: Mapped[Optional[List[float]]] = mapped_column(
+        MutableList.as_mutable(JSON)
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    report: Mapped[Report] = relationship(back_populates="headings")
+
 
 __all__ = [
     "Base",
     "GUID",
     "Report",
+    "ReportHeading",
     "ReportStatus",
     "SavedTopic",
     "SoftDeleteMixin",
@@ -4,10 +4,11 @@ from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Sequence, Set
 
-from sqlalchemy import MetaData, Table, inspect, text
+from sqlalchemy import MetaData, Table, inspect, select, text
 from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
 
-from .models import Report, SavedTopic, TopicCollection, User
+from .models import Report, ReportHeading, SavedTopic, TopicCollection, User
 
 try:
     import fcntl
@@ -30,19 +31,29 @@ def ensure_lightweight_schema(engine: Engine) -> None:
         "topic_collections": TopicCollection.__table__,
         "saved_topics": SavedTopic.__table__,
         "reports": Report.__table__,
+        "report_headings": ReportHeading.__table__,
     }
     ordered_table_names = _topologically_sorted_tables(managed_tables.values())
     username_default = '"full_name"'
+    # Read every table's columns up front: once a large rebuild spills to disk the
+    # write transaction holds an exclusive lock and the inspector's own connection blocks.
+    columns_by_table = {
+        table_name: [column["name"] for column in inspector.get_columns(table_name)]
+        for table_name in managed_tables
+        if table_name in existing_tables
+    }
 
     with _sqlite_migration_lock(engine):
         with engine.begin() as conn:
             conn.execute(text("PRAGMA foreign_keys=OFF"))
+            # Keep child-table foreign keys pointing at the rebuilt table, not "<name>__legacy".
+            conn.execute(text("PRAGMA legacy_alter_table=ON"))
             try:
                 for table_name in ordered_table_names:
                     table = managed_tables[table_name]
-                    if table_name not in existing_tables:
+                    if table_name not in columns_by_table:
                         continue
-                    legacy_columns = [column["name"] for column in inspector.get_columns(table_name)]
+                    legacy_columns = columns_by_table[table_name]
                     desired_columns = [column.name for column in table.columns]
                     if legacy_columns == desired_columns:
                         continue
@@ -56,9 +67,27 @@ def ensure_lightweight_schema(engine: Engine) -> None:
                         overrides.setdefault("sections", 'COALESCE("sections", json(\'{}\'))')
                     _rebuild_table(conn, table, legacy_columns, desired_columns, overrides)
             finally:
+                conn.execute(text("PRAGMA legacy_alter_table=OFF"))
                 conn.execute(text("PRAGMA foreign_keys=ON"))
 
 
+def backfill_report_headings(engine: Engine) -> int:
+    """Populate ``report_headings`` from stored outlines for reports that have none."""
+
+    with Session(engine) as session:
+        indexed = select(ReportHeading.report_id).distinct()
+        reports = session.scalars(
+            select(Report).where(
+                Report.outline_snapshot != None,  # noqa: E711
+                Report.id.not_in(indexed),
+            )
+        ).all()
+        for report in reports:
+            report.set_headings(report.outline_snapshot)
+        session.commit()
+    return len(reports)
+
+
 def _rebuild_table(
     conn: Connection,
     table: Table,
@@ -68,6 +97,13 @@ def _rebuild_table(
 ) -> None:
     temp_name = f"{table.name}__legacy"
     conn.execute(text(f'ALTER TABLE "{table.name}" RENAME TO "{temp_name}"'))
+    # Named indexes follow the renamed table; drop them so the rebuild can recreate them.
+    legacy_indexes = conn.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :name AND sql IS NOT NULL"),
+        {"name": temp_name},
+    ).scalars()
+    for index_name in list(legacy_indexes):
+        conn.execute(text(f'DROP INDEX "{index_name}"'))
 
     metadata = MetaData()
     new_table = table.to_metadata(metadata)
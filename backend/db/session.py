@@ -1,17 +1,22 @@
 from __future__ import annotations
 
 import os
+import time
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.utils.metrics import DB_SESSION_DURATION
+from backend.utils.tracing import get_tracer
 
 from .models import Base
-from .schema_migrations import ensure_lightweight_schema
+from .schema_migrations import backfill_report_headings, ensure_lightweight_schema
 
 def create_engine_from_url(
     database_url: str,
@@ -25,11 +30,20 @@ def create_engine_from_url(
         db_path = Path(url.database.replace("file:", "", 1)).expanduser().resolve()
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
+    engine_options = {}
+    if url.get_backend_name() == "sqlite" and url.database in {":memory:", "", None}:
+        # Blocking storage work runs in worker threads; they must all see the same
+        # in-memory database rather than one private database per thread.
+        engine_options = {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False},
+        }
     engine = create_engine(
         url,
         echo=echo,
         pool_pre_ping=pool_pre_ping,
         future=True,
+        **engine_options,
     )
     ensure_lightweight_schema(engine)
     return engine
@@ -61,7 +75,10 @@ def create_session_factory_from_env(
 
     database_url = os.environ.get(env_var, default_url)
     engine = create_engine_from_url(database_url, echo=echo)
+    headings_indexed = inspect(engine).has_table("report_headings")
     Base.metadata.create_all(engine)
+    if not headings_indexed:
+        backfill_report_headings(engine)
     return create_session_factory(engine, expire_on_commit=expire_on_commit)
 
 
@@ -72,11 +89,20 @@ def session_scope(
     """Provide a transactional scope around a series of operations."""
 
     session = session_factory()
+    started = time.perf_counter()
+    outcome = "error"
+    span = get_tracer().start_span("db.session", require_parent=True)
     try:
         yield session
         session.commit()
-    except Exception:
+        outcome = "commit"
+    except Exception as exception:
         session.rollback()
+        outcome = "rollback"
+        span.record_error(exception)
         raise
     finally:
         session.close()
+        DB_SESSION_DURATION.labels(outcome=outcome).observe(time.perf_counter() - started)
+        span.set_attribute("outcome", outcome)
+        span.end()
@@ -105,7 +105,68 @@ class GenerateRequest(SubjectFilters):
         }
     )
     writer_fallback: Optional[str] = None
+    priority: Literal["interactive", "batch"] = Field(
+        default="interactive",
+        description="Scheduling class for LLM calls; batch work yields to interactive requests.",
+    )
+    fresh_outline: bool = Field(
+        default=False,
+        description="Always generate a new outline instead of reusing a cached one for the same topic and settings.",
+    )
+    stream_outline: bool = Field(
+        default=False,
+        description=(
+            "Stream the outline and start writing each section as soon as it is parsed; "
+            "section prompts only see the headers generated so far."
+        ),
+    )
+    context_strategy: Literal["full", "rolling_summary", "token_budget"] = Field(
+        default="full",
+        description=(
+            "How earlier sections are passed to summary/conclusion sections: full bodies, "
+            "rolling per-section summaries captured while editing, or bodies trimmed to "
+            "context_token_budget."
+        ),
+    )
+    context_token_budget: int = Field(
+        default=2000,
+        ge=100,
+        description="Approximate token budget for the 'token_budget' context strategy.",
+    )
+    include_timings: bool = Field(
+        default=False,
+        description="Add a per-stage timings block (milliseconds) to the complete event.",
+    )
+    reuse: Literal["off", "offer", "return"] = Field(
+        default="off",
+        description=(
+            "How to treat an existing completed report for an equivalent topic: 'off' (default) "
+            "skips the lookup, 'offer' emits an existing_report event and keeps generating, "
+            "'return' streams the stored report instead of generating."
+        ),
+    )
     return_: Literal["report", "report_with_outline"] = Field(default="report", alias="return")
+    delivery: Literal["inline", "chunked", "reference"] = Field(
+        default="inline",
+        description=(
+            "How the finished report reaches the client: 'inline' puts it in the complete event, "
+            "'chunked' streams it as ordered report_chunk events before a small complete event, "
+            "'reference' returns the stored report's id instead (falls back to 'chunked' when the "
+            "report is not stored in the database)."
+        ),
+    )
+    report_chunk_chars: int = Field(
+        default=64 * 1024,
+        ge=1024,
+        description="Characters per report_chunk event for chunked delivery.",
+    )
+    stream_sections: bool = Field(
+        default=False,
+        description=(
+            "Include each finished section's text in its section_complete event; the complete "
+            "event then omits the report, which the client joins from the title and sections."
+        ),
+    )
 
     @model_validator(mode="after")
     def validate_topic_and_mode(self):
@@ -130,9 +191,30 @@ class GenerateRequest(SubjectFilters):
         return self
 
 
+class BatchGenerateRequest(BaseModel):
+    requests: List[GenerateRequest] = Field(
+        ...,
+        min_length=1,
+        description="Report requests to generate; each runs with batch scheduling priority.",
+    )
+    concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Maximum number of reports generated at the same time.",
+    )
+    skip_existing: bool = Field(
+        default=True,
+        description=(
+            "Skip topics that already have a completed stored report for the same user,"
+            " matched like report reuse (normalized topic and generation settings)."
+        ),
+    )
+
+
 class SuggestionItem(BaseModel):
     title: str
-    source: Literal["guided", "free_roam", "seed"] = "guided"
+    source: Literal["guided", "free_roam", "seed", "related"] = "guided"
 
 
 class SuggestionsRequest(BaseModel):
@@ -146,6 +228,14 @@ class SuggestionsRequest(BaseModel):
         default=False,
         description="When true, past report section headings are included as seeds.",
     )
+    user_email: Optional[str] = Field(
+        default=None,
+        description="Email whose past report headings seed suggestions; defaults to EXPLORER_DEFAULT_USER_EMAIL.",
+    )
+    mode: Literal["llm", "related"] = Field(
+        default="llm",
+        description="Use 'related' to return the user's past report topics nearest to the seeds by embedding, without an LLM call.",
+    )
     max_suggestions: int = Field(
         default=12,
         ge=1,
@@ -173,6 +263,7 @@ class SuggestionsRequest(BaseModel):
             seen.add(key)
             normalized_seeds.append(cleaned)
         self.seeds = normalized_seeds
+        self.user_email = (self.user_email or "").strip() or None
         return self
 
 
@@ -232,3 +323,11 @@ class ReportResponse(BaseModel):
     content: Optional[str] = None
     created_at: str
     updated_at: str
+
+
+class LoopMonitorSettings(BaseModel):
+    enabled: bool
+    # Floors keep a runtime toggle from turning the sampler into a busy loop.
+    interval_ms: Optional[float] = Field(default=None, ge=10)
+    slow_callback_ms: Optional[float] = Field(default=None, ge=10)
+    reset: bool = False
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from backend.schemas import BatchGenerateRequest, GenerateRequest
+from backend.utils.topic_keys import generation_settings_key
+
+from .related_topics import ExistingReportMatcher
+from .report_service import ReportGeneratorService
+
+_DEFAULT_USER_EMAIL_ENV = "EXPLORER_DEFAULT_USER_EMAIL"
+_SYSTEM_USER_EMAIL = "system@explorer.local"
+_TOPIC_TITLE_MAX_LENGTH = 255
+
+
+class BatchReportService:
+    """Run many report generations with bounded concurrency over one event stream."""
+
+    def __init__(
+        self,
+        report_service: ReportGeneratorService,
+        *,
+        report_matcher: Optional[ExistingReportMatcher] = None,
+    ) -> None:
+        self.report_service = report_service
+        self.report_matcher = report_matcher
+
+    async def stream_batch(
+        self, batch_request: BatchGenerateRequest
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        total = len(batch_request.requests)
+        started_at = time.monotonic()
+        yield {
+            "status": "batch_started",
+            "total": total,
+            "concurrency": batch_request.concurrency,
+        }
+
+        queue: asyncio.Queue[Optional[Dict[str, Any]]] = asyncio.Queue()
+        semaphore = asyncio.Semaphore(batch_request.concurrency)
+        outcomes: Dict[str, int] = {"complete": 0, "skipped": 0, "failed": 0}
+
+        async def run_item(index: int, request: GenerateRequest) -> None:
+            topic = _topic_title(request)
+            try:
+                async with semaphore:
+                    if batch_request.skip_existing and await asyncio.to_thread(
+                        self._has_stored_report, request
+                    ):
+                        outcomes["skipped"] += 1
+                        await queue.put(
+                            {"status": "report_skipped", "index": index, "topic": topic}
+                        )
+                        return
+                    final_status = None
+                    batch_item = request.model_copy(update={"priority": "batch"})
+                    async for event in self.report_service.stream_report(batch_item):
+                        final_status = event.get("status")
+                        await queue.put({**event, "index": index, "topic": topic})
+                    outcomes["complete" if final_status == "complete" else "failed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                outcomes["failed"] += 1
+                await queue.put(
+                    {
+                        "status": "error",
+                        "index": index,
+                        "topic": topic,
+                        "detail": str(exception),
+                    }
+                )
+            finally:
+                await queue.put(None)
+
+        tasks = [
+            asyncio.create_task(run_item(index, request))
+            for index, request in enumerate(batch_request.requests)
+        ]
+        try:
+            finished = 0
+            while finished < len(tasks):
+                event = await queue.get()
+                if event is None:
+                    finished += 1
+                    continue
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        elapsed = time.monotonic() - started_at
+        yield {
+            "status": "batch_complete",
+            "total": total,
+            "completed": outcomes["complete"],
+            "skipped": outcomes["skipped"],
+            "failed": outcomes["failed"],
+            "elapsed_seconds": round(elapsed, 3),
+            "reports_per_minute": (
+                round(outcomes["complete"] * 60 / elapsed, 2) if elapsed > 0 else None
+            ),
+        }
+
+    def _has_stored_report(self, request: GenerateRequest) -> bool:
+        if self.report_matcher is None:
+            return False
+        return has_stored_report(self.report_matcher, request)
+
+
+def has_stored_report(report_matcher: ExistingReportMatcher, request: GenerateRequest) -> bool:
+    """Match stored reports the way report reuse does: same topic key and settings."""
+
+    user_email = request.user_email or os.environ.get(_DEFAULT_USER_EMAIL_ENV, _SYSTEM_USER_EMAIL)
+    match = report_matcher.match(
+        user_email, _topic_title(request), generation_settings_key(request)
+    )
+    return match is not None
+
+def _topic_title(request: GenerateRequest) -> str:
+    topic = (request.topic or "").strip()
+    if not topic and request.outline is not None:
+        topic = request.outline.report_title.strip()
+    return topic[:_TOPIC_TITLE_MAX_LENGTH]
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Literal, Optional, Tuple
+
+PriorityClass = Literal["interactive", "batch"]
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_PER_USER_CONCURRENCY = 4
+
+_PRIORITY_RANK: Dict[str, int] = {"interactive": 0, "batch": 1}
+
+
+@dataclass
+class _UserShare:
+    weight: float = 1.0
+    finish_tag: float = 0.0
+    active: int = 0
+    granted: int = 0
+
+
+class SchedulerTicket:
+    """A queued request for one LLM call slot."""
+
+    def __init__(
+        self,
+        scheduler: "GenerationScheduler",
+        user_key: str,
+        priority: PriorityClass,
+        sequence: int,
+        cost: float,
+    ) -> None:
+        self._scheduler = scheduler
+        self.user_key = user_key
+        self.priority = priority
+        self.sequence = sequence
+        self.cost = cost
+        self._granted = asyncio.Event()
+        self._done = False
+
+    @property
+    def granted(self) -> bool:
+        return self._granted.is_set()
+
+    @property
+    def position(self) -> int:
+        """1-based position in the dispatch order; 0 once the slot is granted."""
+
+        return self._scheduler.queue_position(self)
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        if self.granted:
+            return True
+        # asyncio.wait does not swallow a cancellation that races with the grant.
+        waiter = asyncio.ensure_future(self._granted.wait())
+        try:
+            await asyncio.wait({waiter}, timeout=timeout)
+        finally:
+            waiter.cancel()
+        return self.granted
+
+    def release(self) -> None:
+        """Return the slot (or leave the queue when it was never granted)."""
+
+        if self._done:
+            return
+        self._done = True
+        self._scheduler._finish(self)
+
+    def _grant(self) -> None:
+        self._granted.set()
+
+
+class GenerationScheduler:
+    """Weighted fair queuing of LLM calls across users with priority classes.
+
+    Interactive work is always dispatched before batch work. Within a class,
+    users are served by start-time fair queuing so a user with many queued
+    calls cannot starve others, and each user is capped at
+    ``per_user_concurrency`` in-flight calls.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        per_user_concurrency: int = DEFAULT_PER_USER_CONCURRENCY,
+        user_weights: Optional[Dict[str, float]] = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        if per_user_concurrency < 1:
+            raise ValueError("per_user_concurrency must be at least 1.")
+        self.max_concurrency = max_concurrency
+        self.per_user_concurrency = per_user_concurrency
+        self._user_weights = dict(user_weights or {})
+        self._users: Dict[str, _UserShare] = {}
+        # One FIFO per (priority rank, user): only queue heads compete for a slot.
+        self._queues: Dict[Tuple[int, str], Deque[SchedulerTicket]] = {}
+        self._waiting = 0
+        self._active = 0
+        self._virtual_clock = 0.0
+        self._sequence = itertools.count()
+        self._positions: Optional[Dict[SchedulerTicket, int]] = None
+
+    def submit(
+        self,
+        user_key: str,
+        priority: PriorityClass = "interactive",
+        *,
+        cost: float = 1.0,
+    ) -> SchedulerTicket:
+        if priority not in _PRIORITY_RANK:
+            raise ValueError(f"Unknown priority class: {priority!r}")
+        ticket = SchedulerTicket(self, user_key, priority, next(self._sequence), cost)
+        self._user(user_key)
+        self._queues.setdefault((_PRIORITY_RANK[priority], user_key), deque()).append(ticket)
+        self._waiting += 1
+        self._positions = None
+        self._dispatch()
+        return ticket
+
+    def queue_position(self, ticket: SchedulerTicket) -> int:
+        if ticket.granted:
+            return 0
+        if self._positions is None:
+            self._positions = self._estimate_positions()
+        return self._positions.get(ticket, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active": self._active,
+            "waiting": self._waiting,
+            "users": {
+                key: {"active": share.active, "granted": share.granted}
+                for key, share in self._users.items()
+            },
+        }
+
+    def _user(self, user_key: str) -> _UserShare:
+        share = self._users.get(user_key)
+        if share is None:
+            share = _UserShare(weight=self._user_weights.get(user_key, 1.0))
+            self._users[user_key] = share
+        return share
+
+    def _start_tag(self, share: _UserShare, virtual_clock: float) -> float:
+        return max(virtual_clock, share.finish_tag)
+
+    def _dispatch(self) -> None:
+        while self._active < self.max_concurrency:
+            best: Optional[Tuple[Tuple[int, float, int], Tuple[int, str]]] = None
+            for queue_key, queue in self._queues.items():
+                share = self._users[queue_key[1]]
+                if share.active >= self.per_user_concurrency:
+                    continue
+                dispatch_key = (
+                    queue_key[0],
+                    self._start_tag(share, self._virtual_clock),
+                    queue[0].sequence,
+                )
+                if best is None or dispatch_key < best[0]:
+                    best = (dispatch_key, queue_key)
+            if best is None:
+                return
+            (_, start_tag, _), queue_key = best
+            ticket = self._pop(queue_key)
+            share = self._users[ticket.user_key]
+            share.finish_tag = start_tag + ticket.cost / share.weight
+            share.active += 1
+            share.granted += 1
+            self._virtual_clock = start_tag
+            self._active += 1
+            ticket._grant()
+
+    def _pop(self, queue_key: Tuple[int, str]) -> SchedulerTicket:
+        queue = self._queues[queue_key]
+        ticket = queue.popleft()
+        if not queue:
+            del self._queues[queue_key]
+        self._waiting -= 1
+        self._positions = None
+        return ticket
+
+    def _estimate_positions(self) -> Dict[SchedulerTicket, int]:
+        """Replay the dispatch order over queue heads with a heap.
+
+        Tickets whose user would be at ``per_user_concurrency`` cannot start
+        until that user's own calls finish, so they rank after every ticket
+        that could be dispatched first.
+        """
+
+        active = {key: share.active for key, share in self._users.items()}
+        finish_tags = {key: share.finish_tag for key, share in self._users.items()}
+        virtual_clock = self._virtual_clock
+        heap: List[Tuple[int, float, int, Tuple[int, str], int]] = []
+        for queue_key, queue in self._queues.items():
+            start = max(virtual_clock, finish_tags[queue_key[1]])
+            heapq.heappush(heap, (queue_key[0], start, queue[0].sequence, queue_key, 0))
+
+        order: List[SchedulerTicket] = []
+        blocked: List[Tuple[Tuple[int, float, int], SchedulerTicket]] = []
+        while heap:
+            rank, start, _, queue_key, index = heapq.heappop(heap)
+            user_key = queue_key[1]
+            queue = self._queues[queue_key]
+            ticket = queue[index]
+            if active[user_key] >= self.per_user_concurrency:
+                blocked.extend(
+                    ((rank, start, waiting.sequence), waiting)
+                    for waiting in itertools.islice(queue, index, None)
+                )
+                continue
+            order.append(ticket)
+            active[user_key] += 1
+            virtual_clock = max(virtual_clock, start)
+            finish_tags[user_key] = start + ticket.cost / self._users[user_key].weight
+            if index + 1 < len(queue):
+                next_start = max(virtual_clock, finish_tags[user_key])
+                heapq.heappush(
+                    heap, (rank, next_start, queue[index + 1].sequence, queue_key, index + 1)
+                )
+        order.extend(ticket for _, ticket in sorted(blocked, key=lambda item: item[0]))
+        return {ticket: position for position, ticket in enumerate(order, start=1)}
+
+    def _finish(self, ticket: SchedulerTicket) -> None:
+        if ticket.granted:
+            self._active -= 1
+            self._users[ticket.user_key].active -= 1
+        else:
+            queue_key = (_PRIORITY_RANK[ticket.priority], ticket.user_key)
+            queue = self._queues.get(queue_key)
+            if queue is not None and ticket in queue:
+                queue.remove(ticket)
+                if not queue:
+                    del self._queues[queue_key]
+                self._waiting -= 1
+        self._positions = None
+        self._dispatch()
+        self._prune_idle_users()
+
+    def _prune_idle_users(self) -> None:
+        if not self._queues:
+            # Nothing is backlogged, so as in start-time fair queuing the clock jumps
+            # to the largest finish tag and every user starts level again.
+            self._virtual_clock = max(
+                [self._virtual_clock, *(share.finish_tag for share in self._users.values())]
+            )
+        # An idle user whose finish tag the virtual clock has passed would restart at
+        # the clock anyway, so dropping its share loses no fairness state.
+        queued_users = {user_key for _, user_key in self._queues}
+        idle = [
+            user_key
+            for user_key, share in self._users.items()
+            if not share.active
+            and share.finish_tag <= self._virtual_clock
+            and user_key not in queued_users
+        ]
+        for user_key in idle:
+            del self._users[user_key]
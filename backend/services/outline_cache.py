@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.db import Report, ReportStatus, session_scope
+from backend.schemas import Outline, OutlineRequest
+from backend.utils.cache import TTLCache
+from backend.utils.topic_keys import normalize_topic_title
+
+DEFAULT_OUTLINE_CACHE_ENTRIES = 512
+DEFAULT_OUTLINE_CACHE_TTL_SECONDS = 24 * 60 * 60.0
+
+
+def outline_cache_key(outline_request: OutlineRequest) -> str:
+    """Fingerprint the inputs that shape an outline: topic, filters, size and model."""
+
+    fingerprint = {
+        "topic": normalize_topic_title(outline_request.topic),
+        "section_count": outline_request.section_count,
+        "include": sorted(subject.casefold() for subject in outline_request.subject_inclusions),
+        "exclude": sorted(subject.casefold() for subject in outline_request.subject_exclusions),
+        "model": outline_request.model.model,
+        "reasoning_effort": outline_request.model.reasoning_effort,
+    }
+    encoded = json.dumps(fingerprint, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class OutlineCache:
+    """Reuse generated outlines for equivalent outline requests.
+
+    Hits are served from an in-memory LRU first, then from the outline
+    snapshot of the latest completed report stored under the same key.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[sessionmaker[Session]] = None,
+        *,
+        max_entries: int = DEFAULT_OUTLINE_CACHE_ENTRIES,
+        ttl: float = DEFAULT_OUTLINE_CACHE_TTL_SECONDS,
+    ) -> None:
+        self.session_factory = session_factory
+        self._memory: TTLCache[Outline] = TTLCache(max_entries=max_entries, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[Outline]:
+        cached = self._memory.get(key)
+        if cached is not None:
+            return cached[0].model_copy(deep=True)
+        # The stored-report fallback is a blocking DB query, so keep it off the event loop.
+        stored = await asyncio.to_thread(self._load_stored_outline, key)
+        if stored is not None:
+            self._memory.set(key, stored)
+            return stored.model_copy(deep=True)
+        return None
+
+    def put(self, key: str, outline: Outline) -> None:
+        self._memory.set(key, outline.model_copy(deep=True))
+
+    def _load_stored_outline(self, key: str) -> Optional[Outline]:
+        if self.session_factory is None:
+            return None
+        try:
+            with session_scope(self.session_factory) as session:
+                snapshot = session.scalar(
+                    select(Report.outline_snapshot)
+                    .where(
+                        Report.outline_cache_key == key,
+                        Report.status == ReportStatus.COMPLETE,
+                        Report.is_deleted.is_(False),
+                    )
+                    .order_by(Report.generated_completed_at.desc())
+                    .limit(1)
+                )
+            return Outline.model_validate(snapshot) if snapshot else None
+        except Exception:
+            return None
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from backend.utils.formatting import parse_outline_json
 from backend.schemas import (
@@ -67,7 +67,23 @@ class OutlineService:
         text = await self._request_outline_text(outline_request)
         return self._parse_outline(text)
 
+    async def stream_outline_text(self, outline_request: OutlineRequest) -> AsyncIterator[str]:
+        """Yield the outline response incrementally when the text client can stream."""
+
+        system, prompt = self._outline_prompts(outline_request)
+        stream_text = getattr(self._text_client, "stream_text_async", None)
+        if stream_text is None:
+            yield await self._text_client.call_text_async(outline_request.model, system, prompt)
+            return
+        async for chunk in stream_text(outline_request.model, system, prompt):
+            yield chunk
+
     async def _request_outline_text(self, outline_request: OutlineRequest) -> str:
+        system, prompt = self._outline_prompts(outline_request)
+        return await self._text_client.call_text_async(outline_request.model, system, prompt)
+
+    @staticmethod
+    def _outline_prompts(outline_request: OutlineRequest) -> Tuple[str, str]:
         system = "You generate structured outlines."
         prompt = (
             build_outline_prompt_json(
@@ -84,7 +100,7 @@ class OutlineService:
                 outline_request.subject_exclusions,
             )
         )
-        return await self._text_client.call_text_async(outline_request.model, system, prompt)
+        return system, prompt
 
     @staticmethod
     def _parse_outline(text: str) -> Outline:
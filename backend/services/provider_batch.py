@@ -0,0 +1,403 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+)
+
+from backend.schemas import GenerateRequest, ModelSpec
+from backend.storage import DatabaseReportStore, FilesystemReportStore
+from backend.utils.openai_client import build_chat_request_body
+from backend.utils.pricing import BATCH_PRICE_MULTIPLIER
+from backend.utils.usage import UsageRecorder, record_token_usage, recording_usage
+
+from .outline_service import OutlineService
+from .report_service import ReportGeneratorService
+
+_CHAT_COMPLETIONS_URL = "/v1/chat/completions"
+DEFAULT_POLL_INTERVAL_SECONDS = 30.0
+DEFAULT_IDLE_FLUSH_SECONDS = 1.0
+
+
+class BatchJobError(RuntimeError):
+    """Raised when a provider batch job fails, expires, or returns a bad line."""
+
+
+class BatchBackend(Protocol):
+    async def submit(self, input_path: Path) -> str:
+        ...
+
+    async def poll(self, batch_id: str, output_path: Path) -> bool:
+        """Write results to ``output_path`` and return True once the job finished."""
+        ...
+
+
+class OpenAIBatchBackend:
+    """Submit JSONL request files to the OpenAI Batch API."""
+
+    def __init__(self, async_client: Any = None, *, completion_window: str = "24h") -> None:
+        if async_client is None:
+            from backend.utils.openai_client import OpenAITextClient
+
+            async_client = OpenAITextClient._make_async_client()
+        self._client = async_client
+        self._completion_window = completion_window
+
+    async def submit(self, input_path: Path) -> str:
+        with input_path.open("rb") as handle:
+            uploaded = await self._client.files.create(file=handle, purpose="batch")
+        batch = await self._client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=_CHAT_COMPLETIONS_URL,
+            completion_window=self._completion_window,
+        )
+        return batch.id
+
+    async def poll(self, batch_id: str, output_path: Path) -> bool:
+        batch = await self._client.batches.retrieve(batch_id)
+        if batch.status in {"failed", "expired", "cancelled"}:
+            raise BatchJobError(f"Batch {batch_id} ended with status '{batch.status}'.")
+        if batch.status != "completed":
+            return False
+        lines: List[str] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await self._client.files.content(file_id)
+                lines.append(content.text.strip())
+        output_path.write_text("\n".join(line for line in lines if line) + "\n", encoding="utf-8")
+        return True
+
+
+class LocalBatchBackend:
+    """Stand-in batch endpoint that answers request files with a local text client.
+
+    Accepts the same JSONL format as the provider so the offline flow can run
+    without network access (tests, dry runs, or a simulated text backend).
+    """
+
+    def __init__(self, text_client: Any, *, polls_until_complete: int = 0) -> None:
+        self._text_client = text_client
+        self._polls_until_complete = polls_until_complete
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self.submitted: List[Path] = []
+
+    async def submit(self, input_path: Path) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex}"
+        self.submitted.append(input_path)
+        self._jobs[batch_id] = {
+            "input_path": input_path,
+            "remaining_polls": self._polls_until_complete,
+        }
+        return batch_id
+
+    async def poll(self, batch_id: str, output_path: Path) -> bool:
+        job = self._jobs[batch_id]
+        if job["remaining_polls"] > 0:
+            job["remaining_polls"] -= 1
+            return False
+        requests = [
+            json.loads(line)
+            for line in job["input_path"].read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+        results = await asyncio.gather(*(self._answer(request) for request in requests))
+        output_path.write_text(
+            "".join(json.dumps(result) + "\n" for result in results), encoding="utf-8"
+        )
+        del self._jobs[batch_id]
+        return True
+
+    async def _answer(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        body = request["body"]
+        messages = body["messages"]
+        system_messages = [m["content"] for m in messages if m["role"] == "system"]
+        user_prompt = next(m["content"] for m in messages if m["role"] == "user")
+        style_hint = system_messages[0] if len(system_messages) > 1 else None
+        model_spec = ModelSpec(model=body["model"])
+        # Capture what the local client reports so results carry a provider-style usage block.
+        recorder = UsageRecorder()
+        try:
+            with recording_usage(recorder, "batch"):
+                text = await self._text_client.call_text_async(
+                    model_spec, system_messages[-1], user_prompt, style_hint
+                )
+        except Exception as exception:
+            return {
+                "custom_id": request["custom_id"],
+                "response": None,
+                "error": {"message": str(exception)},
+            }
+        return {
+            "custom_id": request["custom_id"],
+            "response": {
+                "status_code": 200,
+                "body": {
+                    "choices": [{"message": {"role": "assistant", "content": text}}],
+                    "usage": {
+                        "prompt_tokens": recorder.total.prompt_tokens,
+                        "completion_tokens": recorder.total.completion_tokens,
+                        "total_tokens": recorder.total.total_tokens,
+                    },
+                },
+            },
+            "error": None,
+        }
+
+
+@dataclass
+class _PendingCall:
+    custom_id: str
+    body: Dict[str, Any]
+    future: "asyncio.Future[Dict[str, Any]]"
+
+
+class BatchTextClient:
+    """Text client that defers calls into provider batch jobs.
+
+    Each concurrent report run blocks on at most one call at a time, so once every
+    active run is waiting the pending calls are written to one JSONL file,
+    submitted, polled, and resolved together. Runs then advance to their next
+    stage, giving one batch per pipeline step across all reports.
+    """
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        workdir: Path | str,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        idle_flush_seconds: float = DEFAULT_IDLE_FLUSH_SECONDS,
+    ) -> None:
+        self._backend = backend
+        self.workdir = Path(workdir).expanduser().resolve()
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        self._poll_interval = poll_interval
+        self._idle_flush_seconds = idle_flush_seconds
+        self._pending: List[_PendingCall] = []
+        self._active_runs = 0
+        self._changed = asyncio.Event()
+        self._ids = itertools.count(1)
+        self._batch_numbers = itertools.count(1)
+        self.batch_ids: List[str] = []
+
+    async def call_text_async(
+        self,
+        model_spec: ModelSpec,
+        system_prompt: str,
+        user_prompt: str,
+        style_hint: Optional[str] = None,
+    ) -> str:
+        future: asyncio.Future[Dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._pending.append(
+            _PendingCall(
+                custom_id=f"call-{next(self._ids)}",
+                body=build_chat_request_body(model_spec, system_prompt, user_prompt, style_hint),
+                future=future,
+            )
+        )
+        self._changed.set()
+        body = await future
+        usage = body.get("usage")
+        if usage:
+            # Recorded here, in the caller's task, so it lands on the owning run's recorder.
+            record_token_usage(
+                model_spec.model,
+                int(usage.get("prompt_tokens") or 0),
+                int(usage.get("completion_tokens") or 0),
+                price_multiplier=BATCH_PRICE_MULTIPLIER,
+            )
+        return _extract_batch_text(body)
+
+    @asynccontextmanager
+    async def run_scope(self) -> AsyncIterator[None]:
+        """Track one report run so the flusher knows when every run is blocked."""
+
+        self._active_runs += 1
+        try:
+            yield
+        finally:
+            self._active_runs -= 1
+            self._changed.set()
+
+    async def serve(self) -> None:
+        """Flush pending calls into batch jobs until cancelled."""
+
+        while True:
+            await self._wait_for_flush()
+            batch = self._pending
+            self._pending = []
+            await self._run_batch(batch)
+
+    async def _wait_for_flush(self) -> None:
+        while True:
+            self._changed.clear()
+            if self._pending and len(self._pending) >= self._active_runs:
+                return
+            # asyncio.wait (unlike wait_for) never swallows a cancellation that races
+            # with the event being set, so the flusher always stops when cancelled.
+            waiter = asyncio.ensure_future(self._changed.wait())
+            try:
+                done, _ = await asyncio.wait({waiter}, timeout=self._idle_flush_seconds)
+            finally:
+                waiter.cancel()
+            if not done and self._pending:
+                return
+
+    async def _run_batch(self, batch: List[_PendingCall]) -> None:
+        batch_number = next(self._batch_numbers)
+        input_path = self.workdir / f"batch-{batch_number:04d}-input.jsonl"
+        output_path = self.workdir / f"batch-{batch_number:04d}-output.jsonl"
+        input_path.write_text(
+            "".join(
+                json.dumps(
+                    {
+                        "custom_id": call.custom_id,
+                        "method": "POST",
+                        "url": _CHAT_COMPLETIONS_URL,
+                        "body": call.body,
+                    }
+                )
+                + "\n"
+                for call in batch
+            ),
+            encoding="utf-8",
+        )
+        try:
+            batch_id = await self._backend.submit(input_path)
+            self.batch_ids.append(batch_id)
+            while not await self._backend.poll(batch_id, output_path):
+                await asyncio.sleep(self._poll_interval)
+            results = _read_batch_results(output_path)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exception:
+            for call in batch:
+                if not call.future.done():
+                    call.future.set_exception(exception)
+            return
+        for call in batch:
+            if call.future.done():
+                continue
+            result = results.get(call.custom_id)
+            if result is None:
+                call.future.set_exception(
+                    BatchJobError(f"Batch output is missing a result for {call.custom_id}.")
+                )
+            elif isinstance(result, Exception):
+                call.future.set_exception(result)
+            else:
+                call.future.set_result(result)
+
+
+def _read_batch_results(output_path: Path) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for line in output_path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        custom_id = entry.get("custom_id")
+        error = entry.get("error")
+        response = entry.get("response") or {}
+        if error or response.get("status_code", 200) >= 400:
+            message = (error or {}).get("message") or json.dumps(response.get("body"))
+            results[custom_id] = BatchJobError(message)
+            continue
+        results[custom_id] = response.get("body") or {}
+    return results
+
+
+def _extract_batch_text(body: Dict[str, Any]) -> str:
+    choices = body.get("choices") or []
+    if not choices:
+        return ""
+    content = (choices[0].get("message") or {}).get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(part.get("text") or "" for part in content if isinstance(part, dict))
+    return ""
+
+
+EventCallback = Callable[[int, Dict[str, Any]], Optional[Awaitable[None]]]
+
+
+class OfflineBatchGenerator:
+    """Generate many reports through provider batch jobs instead of live calls."""
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        *,
+        workdir: Path | str,
+        report_store: Optional[DatabaseReportStore | FilesystemReportStore] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        idle_flush_seconds: float = DEFAULT_IDLE_FLUSH_SECONDS,
+    ) -> None:
+        self.text_client = BatchTextClient(
+            backend,
+            workdir,
+            poll_interval=poll_interval,
+            idle_flush_seconds=idle_flush_seconds,
+        )
+        self.report_service = ReportGeneratorService(
+            outline_service=OutlineService(text_client=self.text_client),
+            text_client=self.text_client,
+            report_store=report_store,
+        )
+        self.elapsed_seconds = 0.0
+
+    async def generate(
+        self,
+        requests: Sequence[GenerateRequest],
+        on_event: Optional[EventCallback] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run every request and return each run's final event, in input order."""
+
+        started_at = time.monotonic()
+        flusher = asyncio.create_task(self.text_client.serve())
+        try:
+            finals = await asyncio.gather(
+                *(self._run_one(index, request, on_event) for index, request in enumerate(requests))
+            )
+        finally:
+            flusher.cancel()
+            await asyncio.gather(flusher, return_exceptions=True)
+        self.elapsed_seconds = time.monotonic() - started_at
+        return list(finals)
+
+    async def _run_one(
+        self,
+        index: int,
+        request: GenerateRequest,
+        on_event: Optional[EventCallback],
+    ) -> Dict[str, Any]:
+        final_event: Dict[str, Any] = {"status": "error", "detail": "No events produced."}
+        batch_request = request.model_copy(update={"priority": "batch"})
+        async with self.text_client.run_scope():
+            try:
+                async for event in self.report_service.stream_report(batch_request):
+                    final_event = event
+                    if on_event is not None:
+                        outcome = on_event(index, event)
+                        if outcome is not None:
+                            await outcome
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                final_event = {"status": "error", "detail": str(exception)}
+        return final_event
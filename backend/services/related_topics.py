@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.db import Report, ReportHeading, ReportStatus, SavedTopic, User, session_scope
+from backend.utils.cache import TTLCache
+from backend.utils.embeddings import EmbeddingBackend, EmbeddingIndex, normalize_rows
+from backend.utils.topic_keys import normalize_topic_title
+
+
+DEFAULT_REUSE_THRESHOLD = 0.9
+DEFAULT_INDEX_CACHE_ENTRIES = 128
+DEFAULT_INDEX_CACHE_TTL_SECONDS = 15 * 60.0
+
+# Nearest embedding neighbours checked for matching generation settings.
+_EMBEDDING_CANDIDATES = 10
+
+
+@dataclass(frozen=True)
+class RelatedReport:
+    report_id: uuid.UUID
+    title: str
+    score: float
+
+
+@dataclass
+class _UserIndex:
+    version: Tuple[int, object]
+    titles: Dict[uuid.UUID, str]
+    reports: EmbeddingIndex
+    headings: EmbeddingIndex
+
+
+class RelatedTopicFinder:
+    """Nearest-neighbour lookup over a user's embedded reports and headings.
+
+    Vectors are loaded once per user and model into NumPy indexes and reused
+    until a report is added or re-embedded, so lookups cost one small version
+    query plus a matrix product. Only the most recently used users' indexes
+    are kept, and each expires after ``index_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        embedding_backend: EmbeddingBackend,
+        *,
+        max_indexes: int = DEFAULT_INDEX_CACHE_ENTRIES,
+        index_ttl: float = DEFAULT_INDEX_CACHE_TTL_SECONDS,
+    ) -> None:
+        self.session_factory = session_factory
+        self.embedding_backend = embedding_backend
+        self._indexes: TTLCache[_UserIndex] = TTLCache(max_entries=max_indexes, ttl=index_ttl)
+        # Lookups run in worker threads; TTLCache itself is not thread-safe.
+        self._indexes_lock = threading.Lock()
+
+    def find(
+        self,
+        user_email: str,
+        queries: Sequence[str],
+        *,
+        limit: int = 10,
+        min_score: float = 0.0,
+        include_headings: bool = True,
+    ) -> List[RelatedReport]:
+        """Rank the user's complete reports by similarity to the mean query vector."""
+
+        if not queries or limit <= 0:
+            return []
+        index = self._user_index(user_email)
+        if not len(index.reports):
+            return []
+        query = normalize_rows(
+            self.embedding_backend.embed(list(queries)).mean(axis=0, keepdims=True)
+        )[0]
+
+        best: Dict[uuid.UUID, float] = {}
+        sources = [index.reports, index.headings] if include_headings else [index.reports]
+        for source in sources:
+            for report_id, score in source.search(query, limit=len(source), min_score=min_score):
+                if score > best.get(report_id, -np.inf):
+                    best[report_id] = score
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        return [
+            RelatedReport(report_id=report_id, title=index.titles[report_id], score=score)
+            for report_id, score in ranked[:limit]
+        ]
+
+    def _user_index(self, user_email: str) -> _UserIndex:
+        model_name = self.embedding_backend.model_name
+        with session_scope(self.session_factory) as session:
+            filters = (
+                User.email == user_email,
+                Report.status == ReportStatus.COMPLETE,
+                Report.is_deleted.is_(False),
+                Report.embedding_model == model_name,
+            )
+            count, latest = session.execute(
+                select(func.count(Report.id), func.max(Report.generated_completed_at))
+                .join(User, Report.owner_user_id == User.id)
+                .where(*filters)
+            ).one()
+            version = (count, latest)
+            with self._indexes_lock:
+                cached = self._indexes.get(user_email)
+            if cached is not None and cached[0].version == version:
+                return cached[0]
+
+            report_rows = session.execute(
+                select(Report.id, SavedTopic.title, Report.embedding)
+                .join(User, Report.owner_user_id == User.id)
+                .join(SavedTopic, Report.saved_topic_id == SavedTopic.id)
+                .where(*filters)
+            ).all()
+            heading_rows = session.execute(
+                select(ReportHeading.report_id, ReportHeading.embedding)
+                .join(Report, ReportHeading.report_id == Report.id)
+                .join(User, Report.owner_user_id == User.id)
+                .where(*filters, ReportHeading.embedding != None)  # noqa: E711
+            ).all()
+
+        index = _UserIndex(
+            version=version,
+            titles={report_id: title for report_id, title, _ in report_rows},
+            reports=EmbeddingIndex(
+                [row.id for row in report_rows], [row.embedding for row in report_rows]
+            ),
+            headings=EmbeddingIndex(
+                [row.report_id for row in heading_rows],
+                [row.embedding for row in heading_rows],
+            ),
+        )
+        with self._indexes_lock:
+            self._indexes.set(user_email, index)
+        return index
+
+
+@dataclass(frozen=True)
+class ReportMatch:
+    report_id: uuid.UUID
+    topic: str
+    report_title: str
+    match: Literal["title", "embedding"]
+    similarity: float
+    outline: Dict[str, Any] = field(default_factory=dict)
+    content_path: Optional[Path] = None
+
+    def load_content(self) -> Optional[str]:
+        if self.content_path is None:
+            return None
+        try:
+            return self.content_path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+
+class ExistingReportMatcher:
+    """Find a user's completed report for an equivalent topic before generating a new one.
+
+    Topics match when their normalized titles are equal (case, punctuation
+    and spacing ignored, word order kept) or when their embeddings are at
+    least ``threshold`` cosine-similar. Only reports generated with the same
+    settings (see :func:`backend.utils.topic_keys.generation_settings_key`)
+    are candidates.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        *,
+        base_dir: Path | str,
+        embedding_backend: Optional[EmbeddingBackend] = None,
+        threshold: float = DEFAULT_REUSE_THRESHOLD,
+    ) -> None:
+        self.session_factory = session_factory
+        self.base_dir = Path(base_dir).expanduser().resolve()
+        self.threshold = threshold
+        self.related_topics = (
+            RelatedTopicFinder(session_factory, embedding_backend)
+            if embedding_backend is not None
+            else None
+        )
+
+    def match(self, user_email: str, topic: str, settings_key: str) -> Optional[ReportMatch]:
+        topic_key = normalize_topic_title(topic)
+        if not topic_key:
+            return None
+        with session_scope(self.session_factory) as session:
+            report_id = session.scalar(
+                select(Report.id)
+                .join(User, Report.owner_user_id == User.id)
+                .where(
+                    User.email == user_email,
+                    Report.topic_key == topic_key,
+                    Report.settings_key == settings_key,
+                    Report.status == ReportStatus.COMPLETE,
+                    Report.is_deleted.is_(False),
+                )
+                .order_by(Report.generated_completed_at.desc())
+                .limit(1)
+            )
+        if report_id is not None:
+            return self._build_match(report_id, "title", 1.0)
+
+        if self.related_topics is None:
+            return None
+        nearest = self.related_topics.find(
+            user_email,
+            [topic],
+            limit=_EMBEDDING_CANDIDATES,
+            min_score=self.threshold,
+            include_headings=False,
+        )
+        if not nearest:
+            return None
+        with session_scope(self.session_factory) as session:
+            same_settings = set(
+                session.scalars(
+                    select(Report.id).where(
+                        Report.id.in_([candidate.report_id for candidate in nearest]),
+                        Report.settings_key == settings_key,
+                    )
+                )
+            )
+        for candidate in nearest:
+            if candidate.report_id in same_settings:
+                return self._build_match(candidate.report_id, "embedding", candidate.score)
+        return None
+
+    def _build_match(
+        self, report_id: uuid.UUID, match: Literal["title", "embedding"], similarity: float
+    ) -> Optional[ReportMatch]:
+        with session_scope(self.session_factory) as session:
+            report = session.get(Report, report_id)
+            if report is None:
+                return None
+            outline = dict(report.outline_snapshot or {})
+            content_path = None
+            if report.content_uri:
+                content_path = Path(report.content_uri)
+                if not content_path.is_absolute():
+                    content_path = self.base_dir / content_path
+            return ReportMatch(
+                report_id=report.id,
+                topic=report.saved_topic.title,
+                report_title=outline.get("report_title") or report.saved_topic.title,
+                match=match,
+                similarity=similarity,
+                outline=outline,
+                content_path=content_path,
+            )
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Literal, Optional, Sequence, Tuple, Union
+
+from backend.utils.summary import extractive_summary
+
+from .report_state import ReportSegments, WrittenSection
+
+ContextStrategy = Literal["full", "rolling_summary", "token_budget"]
+
+DEFAULT_CONTEXT_TOKEN_BUDGET = 2000
+_CHARS_PER_TOKEN = 4
+_TRUNCATION_MARKER = " …"
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Cheap token estimate (~4 characters per token) for sizing prompts."""
+
+    if not text:
+        return 0
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+@dataclass
+class ReportContext:
+    strategy: ContextStrategy
+    text: Optional[str]
+    full_tokens: int
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    def status_fields(self) -> Dict[str, Any]:
+        return {
+            "context_strategy": self.strategy,
+            "context_tokens": self.tokens,
+            "full_context_tokens": self.full_tokens,
+        }
+
+
+def build_report_context(
+    strategy: ContextStrategy,
+    written_sections: Union[ReportSegments, Sequence[WrittenSection]],
+    *,
+    token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET,
+) -> ReportContext:
+    """Render earlier sections for a summary-style section's writer prompt.
+
+    ``full`` passes every body verbatim, ``rolling_summary`` passes the
+    per-section summaries captured while editing, and ``token_budget`` trims
+    each body to an equal share of ``token_budget``. The full size comes from
+    the segments' tracked length, so only ``full`` joins every body.
+    """
+
+    segments = (
+        written_sections
+        if isinstance(written_sections, ReportSegments)
+        else ReportSegments(sections=written_sections)
+    )
+    sections = segments.sections
+    full_tokens = math.ceil(segments.sections_length / _CHARS_PER_TOKEN)
+    if strategy == "rolling_summary":
+        text = _render(
+            (section.title, section.summary or extractive_summary(section.body))
+            for section in sections
+        )
+    elif strategy == "token_budget" and full_tokens > token_budget:
+        text = _render_within_budget(sections, token_budget)
+    else:
+        text = segments.sections_text()
+    return ReportContext(strategy=strategy, text=text, full_tokens=full_tokens)
+
+
+def _render(entries: Iterable[Tuple[str, str]]) -> Optional[str]:
+    blocks = [f"{title}\n\n{body}" for title, body in entries]
+    return "\n\n".join(blocks) if blocks else None
+
+
+def _render_within_budget(
+    written_sections: Sequence[WrittenSection], token_budget: int
+) -> Optional[str]:
+    heading_chars = sum(len(section.title) + 2 for section in written_sections)
+    body_chars = max(token_budget * _CHARS_PER_TOKEN - heading_chars, 0)
+    share = body_chars // max(len(written_sections), 1)
+    return _render(
+        (section.title, _truncate(section.body, share)) for section in written_sections
+    )
+
+
+def _truncate(body: str, limit: int) -> str:
+    if len(body) <= limit:
+        return body
+    if limit <= len(_TRUNCATION_MARKER):
+        return _TRUNCATION_MARKER.strip()
+    clipped = body[: limit - len(_TRUNCATION_MARKER)]
+    if " " in clipped:
+        clipped = clipped.rsplit(" ", 1)[0]
+    return clipped.rstrip() + _TRUNCATION_MARKER
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, AsyncGenerator, AsyncIterable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_MAX_EVENTS_PER_STREAM = 1024
+DEFAULT_MAX_STREAMS = 256
+DEFAULT_MAX_LIVE_STREAMS = 256
+JSON_CHUNK_CHARS = 64 * 1024
+
+# Outline payloads are the largest events and are needed to rebuild client state,
+# so they stay replayable even after the bounded log has evicted them.
+_PINNED_STATUSES = frozenset({"outline_ready", "using_provided_outline"})
+
+
+class ReportStreamLimitError(RuntimeError):
+    """Raised when starting a stream would exceed the registry's live-stream cap."""
+
+
+class ReportEventLog:
+    """Bounded, replayable record of the status events emitted by one report stream.
+
+    Followers that fall behind the bounded window get a ``replay_gap`` event
+    naming the evicted ids instead of silently skipping them.
+    """
+
+    def __init__(
+        self,
+        stream_id: str,
+        *,
+        max_events: int = DEFAULT_MAX_EVENTS_PER_STREAM,
+    ) -> None:
+        self.stream_id = stream_id
+        self._events: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=max_events)
+        self._pinned: Dict[int, Dict[str, Any]] = {}
+        self._last_event_id = 0
+        self._evicted_through = 0
+        self._closed = False
+        self._waiter = asyncio.Event()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def last_event_id(self) -> int:
+        return self._last_event_id
+
+    def append(self, event: Dict[str, Any]) -> int:
+        event_id = event.get("event_id")
+        if not isinstance(event_id, int) or event_id <= self._last_event_id:
+            event_id = self._last_event_id + 1
+        self._last_event_id = event_id
+        if len(self._events) == self._events.maxlen:
+            self._evicted_through = self._events[0][0]
+        self._events.append((event_id, event))
+        if event.get("status") in _PINNED_STATUSES:
+            self._pinned[event_id] = event
+        self._notify()
+        return event_id
+
+    def close(self) -> None:
+        self._closed = True
+        self._notify()
+
+    def events_after(self, last_event_id: int) -> List[Tuple[int, Dict[str, Any]]]:
+        replay = {
+            event_id: event
+            for event_id, event in self._pinned.items()
+            if event_id > last_event_id
+        }
+        for event_id, event in self._events:
+            if event_id > last_event_id:
+                replay[event_id] = event
+        return sorted(replay.items())
+
+    async def follow(
+        self, last_event_id: int = 0
+    ) -> AsyncGenerator[Tuple[int, Dict[str, Any]], None]:
+        cursor = last_event_id
+        reported_gap_through = 0
+        while True:
+            waiter = self._waiter
+            if cursor < self._evicted_through and self._evicted_through > reported_gap_through:
+                reported_gap_through = self._evicted_through
+                # Keep the client's own id so a reconnect resumes from the same place.
+                yield cursor, self._gap_event(cursor + 1, self._evicted_through)
+            for event_id, event in self.events_after(cursor):
+                cursor = event_id
+                yield event_id, event
+            if self._closed and cursor >= self._last_event_id:
+                return
+            if cursor >= self._last_event_id:
+                await waiter.wait()
+
+    @staticmethod
+    def _gap_event(first_missed: int, last_missed: int) -> Dict[str, Any]:
+        return {
+            "status": "replay_gap",
+            "first_missed_event_id": first_missed,
+            "last_missed_event_id": last_missed,
+            "detail": "Earlier events were dropped from the replay window; outline events are kept.",
+        }
+
+    def _notify(self) -> None:
+        self._waiter.set()
+        self._waiter = asyncio.Event()
+
+
+class ReportEventLogRegistry:
+    """Runs report streams detached from any one connection so clients can resume them."""
+
+    def __init__(
+        self,
+        *,
+        max_streams: int = DEFAULT_MAX_STREAMS,
+        max_live_streams: int = DEFAULT_MAX_LIVE_STREAMS,
+        max_events_per_stream: int = DEFAULT_MAX_EVENTS_PER_STREAM,
+    ) -> None:
+        self._max_streams = max_streams
+        self._max_live_streams = max_live_streams
+        self._max_events_per_stream = max_events_per_stream
+        self._logs: "OrderedDict[str, ReportEventLog]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def start(self, events: AsyncIterable[Dict[str, Any]]) -> ReportEventLog:
+        # Detached streams keep running without a client, so they need a cap of their own.
+        if len(self._tasks) >= self._max_live_streams:
+            raise ReportStreamLimitError(
+                f"{len(self._tasks)} report streams are already running; try again later."
+            )
+        log = ReportEventLog(uuid.uuid4().hex, max_events=self._max_events_per_stream)
+        self._logs[log.stream_id] = log
+        self._evict_closed_streams()
+        task = asyncio.create_task(self._pump(log, events))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return log
+
+    def get(self, stream_id: str) -> Optional[ReportEventLog]:
+        log = self._logs.get(stream_id)
+        if log is not None:
+            self._logs.move_to_end(stream_id)
+        return log
+
+    async def _pump(
+        self, log: ReportEventLog, events: AsyncIterable[Dict[str, Any]]
+    ) -> None:
+        try:
+            async for event in events:
+                log.append(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exception:
+            log.append({"status": "error", "detail": str(exception)})
+        finally:
+            log.close()
+
+    def _evict_closed_streams(self) -> None:
+        overflow = len(self._logs) - self._max_streams
+        if overflow <= 0:
+            return
+        for stream_id in [key for key, log in self._logs.items() if log.closed][:overflow]:
+            del self._logs[stream_id]
+
+
+def format_event_id(stream_id: str, event_id: int) -> str:
+    return f"{stream_id}:{event_id}"
+
+
+def parse_event_id(value: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Split an SSE ``Last-Event-ID`` value into ``(stream_id, event_id)``."""
+
+    stream_id, separator, raw_event_id = (value or "").strip().rpartition(":")
+    if not separator or not stream_id:
+        return None
+    try:
+        event_id = int(raw_event_id)
+    except ValueError:
+        return None
+    if event_id < 0:
+        return None
+    return stream_id, event_id
+
+
+def format_sse_event(stream_id: str, event_id: int, event: Dict[str, Any]) -> str:
+    return "".join(iter_sse_event(stream_id, event_id, event))
+
+
+def iter_sse_event(stream_id: str, event_id: int, event: Dict[str, Any]) -> Iterator[str]:
+    yield f"id: {format_event_id(stream_id, event_id)}\ndata: "
+    yield from iter_json(event)
+    yield "\n\n"
+
+
+def iter_ndjson_event(event: Dict[str, Any]) -> Iterator[str]:
+    yield from iter_json(event)
+    yield "\n"
+
+
+def iter_json(event: Dict[str, Any], *, chunk_chars: int = JSON_CHUNK_CHARS) -> Iterator[str]:
+    """Encode ``event`` exactly as ``json.dumps`` would, in pieces.
+
+    String fields longer than ``chunk_chars`` (the assembled report) are
+    escaped a slice at a time, so a multi-megabyte report is never copied
+    into one escaped string before it reaches the socket.
+    """
+
+    if not any(isinstance(value, str) and len(value) > chunk_chars for value in event.values()):
+        yield json.dumps(event)
+        return
+    separator = "{"
+    for key, value in event.items():
+        yield f"{separator}{json.dumps(key)}: "
+        separator = ", "
+        if isinstance(value, str) and len(value) > chunk_chars:
+            yield '"'
+            for start in range(0, len(value), chunk_chars):
+                yield json.dumps(value[start : start + chunk_chars])[1:-1]
+            yield '"'
+        else:
+            yield json.dumps(value)
+    yield "}"
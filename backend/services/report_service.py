@@ -1,30 +1,64 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, AsyncGenerator, Dict, List, Optional
+import os
+import uuid
+from contextlib import contextmanager
+from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional
+
+from json import JSONDecodeError
 
 from backend.utils.formatting import (
+    IncrementalOutlineParser,
+    SubsectionHeadingNormalizer,
     ensure_section_numbering,
     ensure_subsection_numbering,
-    enforce_subsection_headings,
 )
 from backend.schemas import (
     DEFAULT_TEXT_MODEL,
     GenerateRequest,
     ModelSpec,
     Outline,
+    OutlineRequest,
     Section,
 )
 from backend.utils.model_utils import maybe_add_reasoning
 from backend.utils.openai_client import OpenAITextClient, get_default_text_client
+from .generation_scheduler import GenerationScheduler, SchedulerTicket
+from .outline_cache import OutlineCache, outline_cache_key
 from .outline_service import OutlineParsingError, OutlineService
+from .related_topics import ExistingReportMatcher, ReportMatch
+from .report_context import ReportContext, build_report_context
 from backend.utils.prompts import (
     build_section_editor_prompt,
     build_section_writer_prompt,
 )
-from .report_state import NumberedSection, WrittenSection, WriterState
+from .report_state import (
+    NumberedSection,
+    ReportSegments,
+    ReportTimings,
+    SectionTiming,
+    WrittenSection,
+    WriterState,
+)
 from backend.storage import DatabaseReportStore, FilesystemReportStore, StoredReportHandle
-from backend.utils.summary import should_elevate_context
+from backend.utils.summary import should_elevate_context, split_section_summary
+from backend.utils.metrics import (
+    ACTIVE_REPORT_STREAMS,
+    LLM_CALL_DURATION,
+    LLM_CALLS,
+    STAGE_DURATION,
+    STORAGE_ERRORS,
+    WRITER_FALLBACKS,
+)
+from backend.utils.timing import Stopwatch
+from backend.utils.topic_keys import generation_settings_key
+from backend.utils.tracing import NOOP_SPAN, AnySpan, SpanContext, get_tracer
+from backend.utils.usage import TokenUsage, UsageRecorder, recording_usage
+
+_QUEUE_POLL_SECONDS = 0.5
+_DEFAULT_USER_EMAIL_ENV = "EXPLORER_DEFAULT_USER_EMAIL"
+_SYSTEM_USER_EMAIL = "system@explorer.local"
 
 
 class ReportGeneratorService:
@@ -33,6 +67,9 @@ class ReportGeneratorService:
         outline_service: Optional[OutlineService] = None,
         text_client: Optional[OpenAITextClient] = None,
         report_store: Optional[DatabaseReportStore | FilesystemReportStore] = None,
+        scheduler: Optional[GenerationScheduler] = None,
+        report_matcher: Optional[ExistingReportMatcher] = None,
+        outline_cache: Optional[OutlineCache] = None,
     ) -> None:
         self.text_client = text_client or get_default_text_client()
         self.outline_service = outline_service or OutlineService(
@@ -40,29 +77,42 @@ class ReportGeneratorService:
         )
         # Respect explicit None to allow storage to be disabled via dependency wiring.
         self.report_store = report_store
+        self.scheduler = scheduler
+        self.report_matcher = report_matcher
+        self.outline_cache = outline_cache
 
     async def stream_report(
-        self, generate_request: GenerateRequest
+        self,
+        generate_request: GenerateRequest,
+        *,
+        trace_parent: Optional[SpanContext] = None,
+        client_id: Optional[str] = None,
     ) -> AsyncGenerator[Dict[str, Any], None]:
-        runner = _ReportStreamRunner(self, generate_request)
-        async for event in runner.run():
-            yield event
+        runner = _ReportStreamRunner(
+            self, generate_request, trace_parent=trace_parent, client_id=client_id
+        )
+        ACTIVE_REPORT_STREAMS.labels().inc()
+        try:
+            async for event in runner.run():
+                yield event
+        finally:
+            ACTIVE_REPORT_STREAMS.labels().dec()
 
     @staticmethod
     def _build_numbered_sections(outline: Outline) -> List[NumberedSection]:
-        numbered_sections: List[NumberedSection] = []
-        for section_index, section in enumerate(outline.sections, start=1):
-            section_title = ensure_section_numbering(section.title, section_index)
-            subsection_titles = [
-                ensure_subsection_numbering(subsection, section_index, subsection_index)
-                for subsection_index, subsection in enumerate(
-                    section.subsections, start=1
-                )
-            ]
-            numbered_sections.append(
-                NumberedSection(title=section_title, subsections=subsection_titles)
-            )
-        return numbered_sections
+        return [
+            ReportGeneratorService._number_section(section, section_index)
+            for section_index, section in enumerate(outline.sections, start=1)
+        ]
+
+    @staticmethod
+    def _number_section(section: Section, section_index: int) -> NumberedSection:
+        section_title = ensure_section_numbering(section.title, section_index)
+        subsection_titles = [
+            ensure_subsection_numbering(subsection, section_index, subsection_index)
+            for subsection_index, subsection in enumerate(section.subsections, start=1)
+        ]
+        return NumberedSection(title=section_title, subsections=subsection_titles)
 
 
 
@@ -71,10 +121,19 @@ class _ReportStreamRunner:
     request: GenerateRequest
 
     def __init__(
-        self, service: ReportGeneratorService, request: GenerateRequest
+        self,
+        service: ReportGeneratorService,
+        request: GenerateRequest,
+        *,
+        trace_parent: Optional[SpanContext] = None,
+        client_id: Optional[str] = None,
     ) -> None:
         self.service = service
         self.request = request
+        self._tracer = get_tracer()
+        self._trace_parent = trace_parent
+        self._report_span: AnySpan = NOOP_SPAN
+        self._section_span: AnySpan = NOOP_SPAN
         self.report_store = service.report_store
         models = self.request.models
         self.outline_spec = models.get("outline", ModelSpec(model=DEFAULT_TEXT_MODEL))
@@ -93,60 +152,157 @@ class _ReportStreamRunner:
             ),
         )
         self._encountered_error = False
-        self._assembled_report: Optional[str] = None
+        self._segments = ReportSegments()
         self._storage_handle: Optional[StoredReportHandle] = None
-        self._written_sections: List[WrittenSection] = []
+        self._stored_report_id: Optional[uuid.UUID] = None
         self._resolved_outline: Optional[Outline] = None
+        self._event_sequence = 0
+        # Anonymous requests get their own per-user cap per client, not one shared key.
+        self._scheduler_key = (
+            (self.request.user_email or "").casefold()
+            or (f"client:{client_id}" if client_id else "")
+            or os.environ.get(_DEFAULT_USER_EMAIL_ENV, _SYSTEM_USER_EMAIL).casefold()
+        )
+        self._generation_slot: Optional[SchedulerTicket] = None
+        self._llm_calls: Dict[str, int] = {}
+        self._token_usage = UsageRecorder()
+        self._timings = ReportTimings()
+        self._run_stopwatch = Stopwatch()
+        self._outline_cache_key: Optional[str] = None
+        self._sections_written = False
+        self._collect_summaries = self.request.context_strategy == "rolling_summary"
 
     async def _status_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self._event_sequence += 1
+        payload["event_id"] = self._event_sequence
         return payload
 
     async def run(self) -> AsyncGenerator[Dict[str, Any], None]:
+        self._report_span = self._tracer.start_span(
+            "report",
+            parent=self._trace_parent,
+            attributes={"topic": self.request.topic, "priority": self.request.priority},
+        )
         try:
-            yield await self._status_payload({"status": "started"})
-
-            async for status in self._outline_phase():
+            started_status: Dict[str, Any] = {"status": "started"}
+            if self._report_span.context is not None:
+                started_status["trace_id"] = self._report_span.context.trace_id
+            yield await self._status_payload(started_status)
+
+            # The lookup queries the database and may call an embedding API.
+            match = await asyncio.to_thread(self._find_existing_report)
+            if match is not None:
+                reuse_status = await asyncio.to_thread(self._build_reuse_status, match)
+                if reuse_status["status"] == "complete":
+                    async for status in self._deliver_final_payload(
+                        reuse_status, match.report_id
+                    ):
+                        yield status
+                    return
+                yield await self._status_payload(reuse_status)
+
+            if self.request.stream_outline and self.request.outline is None:
+                outline_phase = self._streamed_outline_phase()
+            else:
+                outline_phase = self._outline_phase()
+            async for status in outline_phase:
                 yield status
             outline = self._resolved_outline
             if outline is None:
                 return
 
-            storage_status = self._prepare_storage(outline)
-            if storage_status:
-                yield await self._status_payload(storage_status)
+            if not self._sections_written:
+                storage_status = self._prepare_storage(outline)
+                if storage_status:
+                    yield await self._status_payload(storage_status)
 
-            numbered_sections = self.service._build_numbered_sections(outline)
-            all_section_headers = [entry.title for entry in numbered_sections]
+                numbered_sections = self.service._build_numbered_sections(outline)
+                all_section_headers = [entry.title for entry in numbered_sections]
 
-            begin_status = self._build_begin_sections_status(outline)
-            yield await self._status_payload(begin_status)
+                begin_status = self._build_begin_sections_status(len(outline.sections))
+                yield await self._status_payload(begin_status)
 
-            async for status in self._write_sections(
-                outline, numbered_sections, all_section_headers
-            ):
-                yield status
+                async for status in self._write_sections(
+                    outline, numbered_sections, all_section_headers
+                ):
+                    yield status
 
             if self._encountered_error:
                 self._mark_storage_failed("Report generation aborted before completion.")
                 return
 
-            assembled_report = self._assembled_report or ""
+            # One join, shared by persistence and the final event.
+            assembled_report = self._segments.text()
 
-            finalize_error = self._finalize_report_persistence(assembled_report)
+            finalize_error = await self._finalize_report_persistence(assembled_report)
             if finalize_error:
                 yield await self._status_payload(finalize_error)
                 return
 
             final_payload = self._build_final_payload(outline, assembled_report)
 
-            yield await self._status_payload(final_payload)
+            async for status in self._deliver_final_payload(
+                final_payload, self._stored_report_id, sections_streamed=True
+            ):
+                yield status
         except asyncio.CancelledError:
             self._mark_storage_failed("Report generation cancelled")
+            self._report_span.record_error("cancelled")
             raise
+        finally:
+            if self._encountered_error:
+                self._report_span.record_error("report generation failed")
+            self._report_span.end()
+
+    def _find_existing_report(self) -> Optional[ReportMatch]:
+        matcher = self.service.report_matcher
+        if matcher is None or self.request.reuse == "off" or self.request.outline is not None:
+            return None
+        user_email = self.request.user_email or os.environ.get(
+            _DEFAULT_USER_EMAIL_ENV, _SYSTEM_USER_EMAIL
+        )
+        try:
+            return matcher.match(
+                user_email, self.request.topic or "", generation_settings_key(self.request)
+            )
+        except Exception:
+            # Reuse is an optimization; a failed lookup just means generating as usual.
+            return None
+
+    def _build_reuse_status(self, match: ReportMatch) -> Dict[str, Any]:
+        details = {
+            "report_id": str(match.report_id),
+            "topic": match.topic,
+            "match": match.match,
+            "similarity": round(match.similarity, 4),
+        }
+        content = match.load_content() if self.request.reuse == "return" else None
+        if content is None:
+            return {"status": "existing_report", "report_title": match.report_title, **details}
+        payload: Dict[str, Any] = {
+            "status": "complete",
+            "report_title": match.report_title,
+            "report": content.strip(),
+            "reused_report": details,
+        }
+        if self.request.return_ == "report_with_outline":
+            payload["outline_used"] = match.outline
+        return payload
 
     async def _outline_phase(self) -> AsyncGenerator[Dict[str, Any], None]:
         provided_outline = self.request.outline
         if provided_outline is None:
+            outline_request = self._build_outline_request()
+            stopwatch = Stopwatch()
+            cached_outline = await self._cached_outline(outline_request)
+            if cached_outline is not None:
+                self._timings.outline_ms = self._observe("outline_cache", stopwatch)
+                yield await self._status_payload(
+                    self._outline_ready_status(cached_outline, cached=True)
+                )
+                self._resolved_outline = cached_outline
+                return
+
             outline_status: Dict[str, Any] = {
                 "status": "generating_outline",
                 "model": self.outline_spec.model,
@@ -154,18 +310,16 @@ class _ReportStreamRunner:
             maybe_add_reasoning(outline_status, "reasoning_effort", self.outline_spec)
             yield await self._status_payload(outline_status)
 
-            outline_request = self.service.outline_service.build_outline_request(
-                self.request.topic,
-                "json",
-                model_spec=self.outline_spec,
-                section_count=self.request.section_count,
-                subject_inclusions=self.request.subject_inclusions,
-                subject_exclusions=self.request.subject_exclusions,
-            )
+            async for queued_status in self._acquire_generation_slot("outline"):
+                yield await self._status_payload(queued_status)
+            stopwatch = Stopwatch()
             try:
-                outline = await self.service.outline_service.generate_outline(
-                    outline_request
-                )
+                with self._tracer.span("report.outline", parent=self._report_span), self._llm_call(
+                    "outline", self.outline_spec
+                ):
+                    outline = await self.service.outline_service.generate_outline(
+                        outline_request
+                    )
             except OutlineParsingError as exception:
                 error_status = {
                     "status": "error",
@@ -174,17 +328,12 @@ class _ReportStreamRunner:
                 }
                 yield await self._status_payload(error_status)
                 return
+            finally:
+                self._release_generation_slot()
+                self._timings.outline_ms = self._observe("outline", stopwatch)
 
-            outline_ready_status: Dict[str, Any] = {
-                "status": "outline_ready",
-                "model": self.outline_spec.model,
-                "sections": len(outline.sections),
-                "outline": outline.model_dump(),
-            }
-            maybe_add_reasoning(
-                outline_ready_status, "reasoning_effort", self.outline_spec
-            )
-            yield await self._status_payload(outline_ready_status)
+            self._remember_outline(outline)
+            yield await self._status_payload(self._outline_ready_status(outline))
             self._resolved_outline = outline
             return
 
@@ -198,93 +347,328 @@ class _ReportStreamRunner:
         self._resolved_outline = provided_outline
         return
 
+    def _build_outline_request(self) -> OutlineRequest:
+        return self.service.outline_service.build_outline_request(
+            self.request.topic,
+            "json",
+            model_spec=self.outline_spec,
+            section_count=self.request.section_count,
+            subject_inclusions=self.request.subject_inclusions,
+            subject_exclusions=self.request.subject_exclusions,
+        )
+
+    async def _cached_outline(self, outline_request: OutlineRequest) -> Optional[Outline]:
+        outline_cache = self.service.outline_cache
+        if outline_cache is None:
+            return None
+        self._outline_cache_key = outline_cache_key(outline_request)
+        if self.request.fresh_outline:
+            return None
+        return await outline_cache.get(self._outline_cache_key)
+
+    def _remember_outline(self, outline: Outline) -> None:
+        outline_cache = self.service.outline_cache
+        if outline_cache is not None and self._outline_cache_key is not None:
+            outline_cache.put(self._outline_cache_key, outline)
+
+    async def _streamed_outline_phase(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """Write sections as soon as the streamed outline closes each one.
+
+        Section prompts only list the headers parsed so far, trading some
+        global context for starting the first section before the outline ends.
+        """
+
+        outline_request = self._build_outline_request()
+        stopwatch = Stopwatch()
+        cached_outline = await self._cached_outline(outline_request)
+        if cached_outline is not None:
+            self._timings.outline_ms = self._observe("outline_cache", stopwatch)
+            yield await self._status_payload(
+                self._outline_ready_status(cached_outline, cached=True)
+            )
+            self._resolved_outline = cached_outline
+            return
+
+        outline_status: Dict[str, Any] = {
+            "status": "generating_outline",
+            "model": self.outline_spec.model,
+            "streaming": True,
+        }
+        maybe_add_reasoning(outline_status, "reasoning_effort", self.outline_spec)
+        yield await self._status_payload(outline_status)
+
+        async for queued_status in self._acquire_generation_slot("outline"):
+            yield await self._status_payload(queued_status)
+        # Section writers take their own slots while the outline streams, so the
+        # producer task owns the outline slot from here on.
+        outline_slot, self._generation_slot = self._generation_slot, None
+
+        self._sections_written = True
+        parser = IncrementalOutlineParser()
+        ready_sections: asyncio.Queue[Optional[Section]] = asyncio.Queue()
+        outcome: Dict[str, Any] = {}
+
+        async def produce_outline() -> None:
+            try:
+                outline_stopwatch = Stopwatch()
+                with self._tracer.span(
+                    "report.outline", parent=self._report_span, attributes={"streaming": True}
+                ), self._llm_call("outline", self.outline_spec):
+                    async for chunk in self.service.outline_service.stream_outline_text(
+                        outline_request
+                    ):
+                        for section in parser.feed(chunk):
+                            ready_sections.put_nowait(section)
+                outline = parser.finish()
+                self._timings.outline_ms = self._observe("outline", outline_stopwatch)
+                # Anything the incremental pass could not isolate still gets written.
+                for section in outline.sections[len(parser.sections) :]:
+                    ready_sections.put_nowait(section)
+                outcome["outline"] = outline
+            except Exception as exception:
+                outcome["error"] = exception
+            finally:
+                if outline_slot is not None:
+                    outline_slot.release()
+                ready_sections.put_nowait(None)
+
+        producer = asyncio.create_task(produce_outline())
+        started_sections: List[Section] = []
+        numbered_sections: List[NumberedSection] = []
+        all_section_headers: List[str] = []
+        self._segments = ReportSegments()
+        try:
+            outline_finished = False
+            while not outline_finished and not self._encountered_error:
+                pending = [await ready_sections.get()]
+                while not ready_sections.empty():
+                    pending.append(ready_sections.get_nowait())
+                if pending[-1] is None:
+                    outline_finished = True
+                    pending.pop()
+                new_sections: List[NumberedSection] = []
+                for section in pending:
+                    started_sections.append(section)
+                    numbered = self.service._number_section(section, len(numbered_sections) + 1)
+                    numbered_sections.append(numbered)
+                    all_section_headers.append(numbered.title)
+                    new_sections.append(numbered)
+                    yield await self._status_payload(
+                        {
+                            "status": "outline_section_ready",
+                            "index": len(numbered_sections),
+                            "section": numbered.title,
+                            "subsections": numbered.subsections,
+                        }
+                    )
+                if new_sections and len(numbered_sections) == len(new_sections):
+                    begin_status = self._build_begin_sections_status(
+                        self.request.section_count or len(new_sections)
+                    )
+                    begin_status["streaming"] = True
+                    yield await self._status_payload(begin_status)
+                for numbered in new_sections:
+                    report_title = parser.report_title or self.request.topic or ""
+                    async for status in self._process_section(
+                        report_title, numbered, all_section_headers
+                    ):
+                        yield status
+                    if self._encountered_error:
+                        break
+        finally:
+            if not producer.done():
+                producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            # A producer cancelled before it ran never reached its own release.
+            if outline_slot is not None:
+                outline_slot.release()
+
+        if self._encountered_error:
+            return
+        error = outcome.get("error")
+        if error is not None:
+            self._encountered_error = True
+            raw_outline = parser.text
+            detail = f"Failed to parse outline JSON: {error}"
+            if not isinstance(error, (JSONDecodeError, ValueError)):
+                detail = f"Failed to generate outline: {error}"
+            yield await self._status_payload(
+                {"status": "error", "detail": detail, "raw_outline": raw_outline}
+            )
+            return
+
+        outline: Outline = outcome["outline"]
+        if started_sections != outline.sections:
+            # The final parse renamed or dropped sections that were already written. Keep
+            # the stored outline consistent with the written report and surface the final one.
+            yield await self._status_payload(
+                {
+                    "status": "outline_mismatch",
+                    "detail": "The final outline differs from the sections already written.",
+                    "written_sections": [section.title for section in started_sections],
+                    "final_outline": outline.model_dump(),
+                }
+            )
+            outline = Outline(report_title=outline.report_title, sections=started_sections)
+        else:
+            self._remember_outline(outline)
+        yield await self._status_payload(self._outline_ready_status(outline))
+        self._resolved_outline = outline
+        self._segments.set_title(outline.report_title)
+
+        storage_status = self._prepare_storage(outline)
+        if storage_status:
+            yield await self._status_payload(storage_status)
+
+    def _outline_ready_status(self, outline: Outline, *, cached: bool = False) -> Dict[str, Any]:
+        outline_ready_status: Dict[str, Any] = {
+            "status": "outline_ready",
+            "model": self.outline_spec.model,
+            "sections": len(outline.sections),
+            "outline": outline.model_dump(),
+        }
+        if self._timings.outline_ms is not None:
+            outline_ready_status["duration_ms"] = self._timings.outline_ms
+        maybe_add_reasoning(outline_ready_status, "reasoning_effort", self.outline_spec)
+        if cached:
+            outline_ready_status["cached"] = True
+        return outline_ready_status
+
     async def _write_sections(
         self,
         outline: Outline,
         numbered_sections: List[NumberedSection],
         all_section_headers: List[str],
     ) -> AsyncGenerator[Dict[str, Any], None]:
-        self._written_sections = []
-        assembled_blocks: List[str] = [outline.report_title]
+        self._segments = ReportSegments(outline.report_title)
 
         for section in numbered_sections:
             async for status in self._process_section(
-                outline,
+                outline.report_title,
                 section,
                 all_section_headers,
-                assembled_blocks,
             ):
                 yield status
             if self._encountered_error:
                 break
 
-        self._assembled_report = "\n\n".join(assembled_blocks)
-        return
-
     async def _process_section(
         self,
-        outline: Outline,
+        report_title: str,
+        section: NumberedSection,
+        all_section_headers: List[str],
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        self._section_span = self._tracer.start_span(
+            "report.section", parent=self._report_span, attributes={"section": section.title}
+        )
+        try:
+            async for status in self._run_section_stages(
+                report_title, section, all_section_headers
+            ):
+                yield status
+        finally:
+            if self._encountered_error:
+                self._section_span.record_error("section failed")
+            self._section_span.end()
+            self._section_span = NOOP_SPAN
+
+    async def _run_section_stages(
+        self,
+        report_title: str,
         section: NumberedSection,
         all_section_headers: List[str],
-        assembled_blocks: List[str],
     ) -> AsyncGenerator[Dict[str, Any], None]:
         section_title = section.title
         subsection_titles = section.subsections
 
-        yield await self._status_payload(
-            {"status": "writing_section", "section": section_title}
-        )
+        report_context = self._build_report_context(section_title, subsection_titles)
+        writing_status: Dict[str, Any] = {"status": "writing_section", "section": section_title}
+        if report_context is not None:
+            writing_status.update(report_context.status_fields())
+        yield await self._status_payload(writing_status)
 
         writer_system = "You write high-quality, well-structured prose that continues a report seamlessly."
-        report_context = self._build_report_context(
-            self._written_sections, section_title, subsection_titles
-        )
         writer_prompt = build_section_writer_prompt(
-            outline.report_title,
+            report_title,
             all_section_headers,
             section_title,
             subsection_titles,
-            full_report_context=report_context,
+            full_report_context=report_context.text if report_context else None,
         )
 
-        section_text, writer_events = await self._write_section_text(
-            section_title,
-            writer_system,
-            writer_prompt,
-        )
+        section_timing = SectionTiming(section=section_title)
+        self._timings.sections.append(section_timing)
+        async for queued_status in self._acquire_generation_slot("writer", section_title):
+            yield await self._status_payload(queued_status)
+        stopwatch = Stopwatch()
+        try:
+            with self._tracer.span("stage.writer", parent=self._section_span) as stage_span:
+                section_text, writer_events = await self._write_section_text(
+                    section_title,
+                    writer_system,
+                    writer_prompt,
+                )
+                if section_text is None:
+                    stage_span.record_error("writer failed")
+        finally:
+            self._release_generation_slot()
+            section_timing.writer_ms = self._observe("writer", stopwatch)
         for writer_event in writer_events:
             yield await self._status_payload(writer_event)
         if section_text is None:
             return
 
-        section_text = enforce_subsection_headings(section_text, subsection_titles)
+        heading_normalizer = SubsectionHeadingNormalizer(subsection_titles)
+        section_text = heading_normalizer.normalize(section_text)
 
         yield await self._status_payload(
-            {"status": "editing_section", "section": section_title}
-        )
-        edited_section_text, edit_error = await self._edit_section_body(
-            outline.report_title,
-            section_title,
-            section_text,
+            {
+                "status": "editing_section",
+                "section": section_title,
+                "writer_duration_ms": section_timing.writer_ms,
+            }
         )
+        async for queued_status in self._acquire_generation_slot("editor", section_title):
+            yield await self._status_payload(queued_status)
+        stopwatch = Stopwatch()
+        try:
+            with self._tracer.span("stage.editor", parent=self._section_span) as stage_span:
+                edited_section_text, edit_error = await self._edit_section_body(
+                    report_title,
+                    section_title,
+                    section_text,
+                )
+                if edit_error:
+                    stage_span.record_error(edit_error["detail"])
+        finally:
+            self._release_generation_slot()
+            section_timing.editor_ms = self._observe("editor", stopwatch)
         if edit_error:
             yield await self._status_payload(edit_error)
             return
 
+        section_summary = None
+        if self._collect_summaries:
+            edited_section_text, section_summary = split_section_summary(edited_section_text)
         cleaned_section_text = self._finalize_section_body(
-            edited_section_text, subsection_titles
+            edited_section_text, heading_normalizer
         )
         written_section = WrittenSection(
             title=section_title,
             body=cleaned_section_text,
+            summary=section_summary,
         )
-        self._written_sections.append(written_section)
+        self._segments.append(written_section)
 
-        assembled_blocks.append(f"{section_title}\n\n{cleaned_section_text}")
-
-        yield await self._status_payload(
-            {"status": "section_complete", "section": section_title}
-        )
+        section_status: Dict[str, Any] = {
+            "status": "section_complete",
+            "section": section_title,
+            "editor_duration_ms": section_timing.editor_ms,
+            "duration_ms": round(section_timing.writer_ms + section_timing.editor_ms, 3),
+        }
+        if self.request.stream_sections:
+            section_status["body"] = cleaned_section_text
+        yield await self._status_payload(section_status)
 
     async def _write_section_text(
         self,
@@ -295,11 +679,12 @@ class _ReportStreamRunner:
         status_events: List[Dict[str, Any]] = []
         while True:
             try:
-                text = await self.service.text_client.call_text_async(
-                    self.writer_state.active,
-                    writer_system,
-                    writer_prompt,
-                )
+                with self._llm_call("writer", self.writer_state.active):
+                    text = await self.service.text_client.call_text_async(
+                        self.writer_state.active,
+                        writer_system,
+                        writer_prompt,
+                    )
                 return text, status_events
             except BaseException as exception:
                 if isinstance(exception, asyncio.CancelledError) or not isinstance(
@@ -338,20 +723,101 @@ class _ReportStreamRunner:
 
     def _build_report_context(
         self,
-        written_sections: List[WrittenSection],
         section_title: str,
         subsection_titles: List[str],
-    ) -> Optional[str]:
-        if not written_sections:
+    ) -> Optional[ReportContext]:
+        if not self._segments.sections:
             return None
         if not should_elevate_context(section_title, subsection_titles):
             return None
-        return "\n\n".join(f"{item.title}\n\n{item.body}" for item in written_sections)
+        return build_report_context(
+            self.request.context_strategy,
+            self._segments,
+            token_budget=self.request.context_token_budget,
+        )
+
+    async def _acquire_generation_slot(
+        self, stage: str, section_title: Optional[str] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        scheduler = self.service.scheduler
+        if scheduler is None:
+            return
+        ticket = scheduler.submit(self._scheduler_key, self.request.priority)
+        self._generation_slot = ticket
+        try:
+            last_position = 0
+            while not ticket.granted:
+                position = ticket.position
+                if position and position != last_position:
+                    queued_status: Dict[str, Any] = {
+                        "status": "queued",
+                        "stage": stage,
+                        "position": position,
+                        "priority": self.request.priority,
+                    }
+                    if section_title:
+                        queued_status["section"] = section_title
+                    yield queued_status
+                    last_position = position
+                await ticket.wait(_QUEUE_POLL_SECONDS)
+        except BaseException:
+            self._release_generation_slot()
+            raise
+
+    def _release_generation_slot(self) -> None:
+        if self._generation_slot is None:
+            return
+        self._generation_slot.release()
+        self._generation_slot = None
+
+    @staticmethod
+    def _observe(stage: str, stopwatch: Stopwatch) -> float:
+        elapsed_ms = stopwatch.elapsed_ms()
+        STAGE_DURATION.labels(stage=stage).observe(elapsed_ms / 1000)
+        return elapsed_ms
+
+    @contextmanager
+    def _llm_call(self, stage: str, model_spec: ModelSpec) -> Iterator[None]:
+        self._count_llm_call(stage)
+        stopwatch = Stopwatch()
+        outcome = "error"
+        usage_before = self._token_usage.stages.get(stage, TokenUsage()).total_tokens
+        try:
+            with self._tracer.span(
+                "llm.call", attributes={"stage": stage, "model": model_spec.model}
+            ) as span, recording_usage(self._token_usage, stage):
+                yield
+                span.set_attribute(
+                    "total_tokens",
+                    self._token_usage.stages.get(stage, TokenUsage()).total_tokens - usage_before,
+                )
+            outcome = "success"
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            LLM_CALLS.labels(model=model_spec.model, stage=stage, outcome=outcome).inc()
+            LLM_CALL_DURATION.labels(model=model_spec.model, stage=stage).observe(
+                stopwatch.elapsed_ms() / 1000
+            )
+
+    def _count_llm_call(self, stage: str) -> None:
+        self._llm_calls[stage] = self._llm_calls.get(stage, 0) + 1
+
+    def _usage_counters(self) -> Dict[str, int]:
+        usage = {"reports": 1, "llm_calls": sum(self._llm_calls.values())}
+        for stage, calls in self._llm_calls.items():
+            usage[f"{stage}_calls"] = calls
+        total = self._token_usage.total
+        if total.total_tokens:
+            usage["prompt_tokens"] = total.prompt_tokens
+            usage["completion_tokens"] = total.completion_tokens
+        return usage
 
-    def _build_begin_sections_status(self, outline: Outline) -> Dict[str, Any]:
+    def _build_begin_sections_status(self, section_count: int) -> Dict[str, Any]:
         begin_status: Dict[str, Any] = {
             "status": "begin_sections",
-            "count": len(outline.sections),
+            "count": section_count,
             "writer_model": self.writer_spec.model,
             "editor_model": self.editor_spec.model,
         }
@@ -366,32 +832,49 @@ class _ReportStreamRunner:
     def _prepare_storage(self, outline: Outline) -> Optional[Dict[str, Any]]:
         if not self.report_store:
             return None
+        stopwatch = Stopwatch()
         try:
-            self._storage_handle = self.report_store.prepare_report(
-                self.request, outline
-            )
+            with self._tracer.span("storage.prepare", parent=self._report_span):
+                self._storage_handle = self.report_store.prepare_report(
+                    self.request, outline, outline_cache_key=self._outline_cache_key
+                )
         except Exception as exception:
             self._storage_handle = None
+            STORAGE_ERRORS.labels(operation="prepare").inc()
             return {
                 "status": "warning",
                 "detail": f"Persistence disabled for this run: {exception}",
             }
-        return {"status": "persistence_ready"}
+        finally:
+            self._timings.storage_prepare_ms = self._observe("storage_prepare", stopwatch)
+        return {"status": "persistence_ready", "duration_ms": self._timings.storage_prepare_ms}
 
-    def _finalize_report_persistence(
+    async def _finalize_report_persistence(
         self, assembled_report: str
     ) -> Optional[Dict[str, Any]]:
         if not self.report_store or not self._storage_handle:
             return None
+        stopwatch = Stopwatch()
         try:
             section_payload = [
                 {"title": section.title, "body": section.body}
-                for section in self._written_sections
+                for section in self._segments.sections
             ]
-            self.report_store.finalize_report(
-                self._storage_handle, assembled_report, section_payload
-            )
+            with self._tracer.span("storage.finalize", parent=self._report_span):
+                # File writes, DB updates and embedding calls all block; keep them off the loop.
+                await asyncio.to_thread(
+                    self.report_store.finalize_report,
+                    self._storage_handle,
+                    assembled_report,
+                    section_payload,
+                    usage=self._usage_counters(),
+                    token_usage=self._token_usage.summary(),
+                )
+            if isinstance(self.report_store, DatabaseReportStore):
+                # Only database-backed reports can be fetched back through /reports/{id}.
+                self._stored_report_id = self._storage_handle.report_id
         except Exception as exception:
+            STORAGE_ERRORS.labels(operation="finalize").inc()
             self._mark_storage_failed(f"Failed to persist report artifacts: {exception}")
             return {
                 "status": "error",
@@ -399,13 +882,14 @@ class _ReportStreamRunner:
             }
         finally:
             self._storage_handle = None
+            self._timings.storage_finalize_ms = self._observe("storage_finalize", stopwatch)
         return None
 
     @staticmethod
     def _finalize_section_body(
-        section_text: str, subsection_titles: List[str]
+        section_text: str, heading_normalizer: SubsectionHeadingNormalizer
     ) -> str:
-        return enforce_subsection_headings(section_text, subsection_titles).strip()
+        return heading_normalizer.normalize(section_text).strip()
 
     def _build_final_payload(
         self, outline: Outline, assembled_report: str
@@ -414,11 +898,54 @@ class _ReportStreamRunner:
             "status": "complete",
             "report_title": outline.report_title,
             "report": assembled_report,
+            "usage": self._token_usage.summary(),
         }
         if self.request.return_ == "report_with_outline":
             payload["outline_used"] = outline.model_dump()
+        if self.request.include_timings:
+            payload["timings"] = self._timings.as_dict(self._run_stopwatch.elapsed_ms())
         return payload
 
+    async def _deliver_final_payload(
+        self,
+        payload: Dict[str, Any],
+        report_id: Optional[uuid.UUID],
+        *,
+        sections_streamed: bool = False,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Emit the complete event, moving the report out of it unless delivery is inline."""
+
+        if self.request.stream_sections and sections_streamed:
+            delivery = "sections"
+        elif self.request.delivery == "reference" and report_id is None:
+            delivery = "chunked"
+        else:
+            delivery = self.request.delivery
+        if delivery == "inline":
+            yield await self._status_payload(payload)
+            return
+
+        report = payload.pop("report")
+        payload["delivery"] = delivery
+        payload["report_length"] = len(report)
+        if delivery == "reference":
+            payload["report_id"] = str(report_id)
+            payload["report_url"] = f"/reports/{report_id}"
+        elif delivery == "chunked":
+            chunk_chars = self.request.report_chunk_chars
+            offsets = range(0, len(report), chunk_chars)
+            for index, offset in enumerate(offsets):
+                yield await self._status_payload(
+                    {
+                        "status": "report_chunk",
+                        "index": index,
+                        "offset": offset,
+                        "text": report[offset : offset + chunk_chars],
+                    }
+                )
+            payload["report_chunks"] = len(offsets)
+        yield await self._status_payload(payload)
+
     def _mark_storage_failed(self, detail: str) -> None:
         if not self.report_store or not self._storage_handle:
             return
@@ -432,6 +959,7 @@ class _ReportStreamRunner:
     ) -> Optional[Dict[str, Any]]:
         if not self.writer_state.activate_fallback():
             return None
+        WRITER_FALLBACKS.labels(model=self.writer_state.active.model).inc()
         return {
             "status": "writer_model_fallback",
             "section": section_title,
@@ -444,7 +972,6 @@ class _ReportStreamRunner:
         self, section_title: str, action: str, exception: Exception
     ) -> Dict[str, Any]:
         self._encountered_error = True
-        self._assembled_report = None
         return {
             "status": "error",
             "section": section_title,
@@ -462,9 +989,11 @@ class _ReportStreamRunner:
             report_title,
             section_title,
             section_text,
+            include_summary=self._collect_summaries,
         )
-        return await self.service.text_client.call_text_async(
-            self.editor_spec,
-            editor_system,
-            editor_prompt,
-        )
+        with self._llm_call("editor", self.editor_spec):
+            return await self.service.text_client.call_text_async(
+                self.editor_spec,
+                editor_system,
+                editor_prompt,
+            )
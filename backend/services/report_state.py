@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from backend.schemas import ModelSpec
 
@@ -16,6 +17,103 @@ class NumberedSection:
 class WrittenSection:
     title: str
     body: str
+    summary: Optional[str] = None
+
+
+class ReportSegments:
+    """The assembled report as its title plus written sections, joined lazily.
+
+    Section bodies are held once and shared by the context builder,
+    persistence and the final event. Lengths are tracked as sections arrive,
+    so sizing never joins text; ``text()`` builds the full report in a single
+    join and caches it until the next change.
+    """
+
+    SEPARATOR = "\n\n"
+
+    def __init__(self, title: str = "", sections: Iterable[WrittenSection] = ()) -> None:
+        self.title = title
+        self.sections: List[WrittenSection] = []
+        self._sections_length = 0
+        self._text: Optional[str] = None
+        for section in sections:
+            self.append(section)
+
+    def set_title(self, title: str) -> None:
+        self.title = title
+        self._text = None
+
+    def append(self, section: WrittenSection) -> None:
+        if self.sections:
+            self._sections_length += len(self.SEPARATOR)
+        self._sections_length += len(section.title) + len(self.SEPARATOR) + len(section.body)
+        self.sections.append(section)
+        self._text = None
+
+    @property
+    def sections_length(self) -> int:
+        """Characters in the sections part of the report (what ``sections_text`` returns)."""
+
+        return self._sections_length
+
+    def __len__(self) -> int:
+        if not self.sections:
+            return len(self.title)
+        return len(self.title) + len(self.SEPARATOR) + self._sections_length
+
+    def __bool__(self) -> bool:
+        return bool(self.title) or bool(self.sections)
+
+    def pieces(self) -> Iterator[str]:
+        """Yield the report text in order without joining it."""
+
+        yield self.title
+        for section in self.sections:
+            yield self.SEPARATOR
+            yield section.title
+            yield self.SEPARATOR
+            yield section.body
+
+    def sections_text(self) -> Optional[str]:
+        """The report without its title line: what earlier-section context quotes."""
+
+        if not self.sections:
+            return None
+        return "".join(islice(self.pieces(), 2, None))
+
+    def text(self) -> str:
+        if self._text is None:
+            self._text = "".join(self.pieces())
+        return self._text
+
+
+@dataclass
+class SectionTiming:
+    section: str
+    writer_ms: float = 0.0
+    editor_ms: float = 0.0
+
+
+@dataclass
+class ReportTimings:
+    outline_ms: Optional[float] = None
+    storage_prepare_ms: Optional[float] = None
+    storage_finalize_ms: Optional[float] = None
+    sections: List[SectionTiming] = field(default_factory=list)
+
+    def as_dict(self, total_ms: float) -> Dict[str, Any]:
+        return {
+            "total_ms": total_ms,
+            "outline_ms": self.outline_ms,
+            "writer_ms": round(sum(item.writer_ms for item in self.sections), 3),
+            "editor_ms": round(sum(item.editor_ms for item in self.sections), 3),
+            "storage_prepare_ms": self.storage_prepare_ms,
+            "storage_finalize_ms": self.storage_finalize_ms,
+            "sections": [
+                {"section": item.section, "writer_ms": item.writer_ms, "editor_ms": item.editor_ms}
+                for item in self.sections
+            ],
+        }
 
 
 @dataclass
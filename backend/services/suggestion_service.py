@@ -1,22 +1,38 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Iterable, List, Optional, Sequence
+import os
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session, sessionmaker
 
-from backend.db import Report, session_scope
+from backend.db import Report, ReportHeading, ReportStatus, User, session_scope
 from backend.db.session import create_session_factory_from_env
 from backend.schemas import (
+    ModelSpec,
     SuggestionItem,
     SuggestionsRequest,
     SuggestionsResponse,
 )
+from backend.utils.cache import TTLCache
+from backend.utils.embeddings import EmbeddingBackend, get_default_embedding_backend
 from backend.utils.openai_client import OpenAITextClient, get_default_text_client
 
+from .related_topics import RelatedTopicFinder
+
 _DEFAULT_DB_ENV = "EXPLORER_DATABASE_URL"
 _DEFAULT_DB_URL = "sqlite:///data/reportgen.db"
+_DEFAULT_USER_EMAIL_ENV = "EXPLORER_DEFAULT_USER_EMAIL"
+_SYSTEM_USER_EMAIL = "system@explorer.local"
+_REPORT_HEADING_SEED_LIMIT = 60
+DEFAULT_FREE_ROAM_TIMEOUT_SECONDS = 20.0
+DEFAULT_FREE_ROAM_GRACE_SECONDS = 2.0
+DEFAULT_CACHE_TTL_SECONDS = 300.0
+DEFAULT_CACHE_STALE_SECONDS = 3600.0
+DEFAULT_CACHE_MAX_ENTRIES = 256
+_RELATED_MIN_SCORE = 0.2
 
 
 class SuggestionService:
@@ -26,20 +42,129 @@ class SuggestionService:
         text_client: Optional[OpenAITextClient] = None,
         *,
         session_factory: Optional[sessionmaker[Session]] = None,
+        free_roam_timeout: Optional[float] = DEFAULT_FREE_ROAM_TIMEOUT_SECONDS,
+        free_roam_grace: Optional[float] = DEFAULT_FREE_ROAM_GRACE_SECONDS,
+        cache_ttl: float = DEFAULT_CACHE_TTL_SECONDS,
+        cache_stale_seconds: float = DEFAULT_CACHE_STALE_SECONDS,
+        cache_max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        embedding_backend: Optional[EmbeddingBackend] = None,
     ) -> None:
         self.text_client = text_client or get_default_text_client()
         self.session_factory = session_factory or self._build_session_factory()
+        self.free_roam_timeout = free_roam_timeout
+        self.free_roam_grace = free_roam_grace
+        self.cache: Optional[TTLCache[SuggestionsResponse]] = (
+            TTLCache(
+                max_entries=cache_max_entries,
+                ttl=cache_ttl,
+                stale_ttl=cache_stale_seconds,
+            )
+            if cache_ttl > 0
+            else None
+        )
+        self._inflight: Dict[Hashable, "asyncio.Task[SuggestionsResponse]"] = {}
+        self._refreshes: Set["asyncio.Task[SuggestionsResponse]"] = set()
+        embedding_backend = embedding_backend or get_default_embedding_backend()
+        self.related_topics: Optional[RelatedTopicFinder] = (
+            RelatedTopicFinder(self.session_factory, embedding_backend)
+            if self.session_factory is not None and embedding_backend is not None
+            else None
+        )
 
     async def generate(self, request: SuggestionsRequest) -> SuggestionsResponse:
         seeds = self._collect_seeds(request)
         if not seeds:
             return SuggestionsResponse(suggestions=[])
+        if request.mode == "related":
+            # DB reads and the embedding call block, so run them in a worker thread.
+            return await asyncio.to_thread(self._related_suggestions, request, seeds)
+        if self.cache is None:
+            return await self._generate_suggestions(request, seeds)
+
+        key = self._cache_key(request, seeds)
+        cached = self.cache.get(key)
+        if cached is not None:
+            response, fresh = cached
+            if not fresh and key not in self._inflight:
+                # Serve the stale result now and refresh it for the next caller.
+                refresh = self._start_generation(key, request, seeds)
+                self._refreshes.add(refresh)
+                refresh.add_done_callback(self._refreshes.discard)
+            return response.model_copy(deep=True)
+
+        task = self._inflight.get(key) or self._start_generation(key, request, seeds)
+        response = await asyncio.shield(task)
+        return response.model_copy(deep=True)
+
+    def _start_generation(
+        self, key: Hashable, request: SuggestionsRequest, seeds: List[str]
+    ) -> "asyncio.Task[SuggestionsResponse]":
+        async def run() -> SuggestionsResponse:
+            try:
+                response = await self._generate_suggestions(request, seeds)
+            finally:
+                self._inflight.pop(key, None)
+            if response.suggestions and self.cache is not None:
+                self.cache.set(key, response)
+            return response
+
+        task = asyncio.ensure_future(run())
+        self._inflight[key] = task
+        # Retrieve background failures so they are not logged as unhandled.
+        task.add_done_callback(lambda finished: finished.cancelled() or finished.exception())
+        return task
+
+    def _related_suggestions(
+        self, request: SuggestionsRequest, seeds: List[str]
+    ) -> SuggestionsResponse:
+        if self.related_topics is None:
+            return SuggestionsResponse(suggestions=[])
+        seed_keys = {seed.casefold() for seed in seeds}
+        matches = self.related_topics.find(
+            self._user_email(request),
+            seeds,
+            limit=request.max_suggestions + len(seed_keys),
+            min_score=_RELATED_MIN_SCORE,
+        )
+        titles = self._normalize_titles(
+            match.title for match in matches if match.title.casefold() not in seed_keys
+        )
+        return SuggestionsResponse(
+            suggestions=[
+                SuggestionItem(title=title, source="related")
+                for title in titles[: request.max_suggestions]
+            ]
+        )
 
+    @staticmethod
+    def _cache_key(request: SuggestionsRequest, seeds: Sequence[str]) -> Hashable:
+        return (
+            tuple(sorted(seed.casefold() for seed in seeds)),
+            request.model.model,
+            request.model.reasoning_effort,
+            request.enable_free_roam,
+            request.max_suggestions,
+        )
+
+    async def _generate_suggestions(
+        self, request: SuggestionsRequest, seeds: List[str]
+    ) -> SuggestionsResponse:
         max_suggestions = request.max_suggestions or 10
-        prompt = self._build_prompt(seeds)
-        raw_response = await self.text_client.call_text_async(
-            request.model, self._system_prompt(), prompt
+        # Free-roam starts alongside the guided pass so it adds little latency of its own.
+        free_roam_task = (
+            asyncio.ensure_future(self._free_roam_response(request.model, seeds))
+            if request.enable_free_roam
+            else None
         )
+        try:
+            raw_response = await self.text_client.call_text_async(
+                request.model, self._system_prompt(), self._build_prompt(seeds)
+            )
+        except BaseException:
+            if free_roam_task is not None:
+                free_roam_task.cancel()
+            raise
+
         seen: set[str] = set()
         suggestions: List[SuggestionItem] = []
         guided_titles = self._parse_titles(raw_response, max_suggestions, seen)
@@ -48,61 +173,97 @@ class SuggestionService:
         )
 
         remaining = max_suggestions - len(suggestions)
-        if request.enable_free_roam and remaining > 0:
-            try:
-                free_roam_response = await self.text_client.call_text_async(
-                    request.model,
-                    self._system_prompt(),
-                    self._build_free_roam_prompt(seeds),
-                )
-                free_roam_titles = self._parse_titles(
-                    free_roam_response, remaining, seen
-                )
-                suggestions.extend(
-                    SuggestionItem(title=title, source="free_roam")
-                    for title in free_roam_titles
-                )
-            except Exception:
-                # Free-roam is additive; keep guided suggestions when this pass fails.
-                pass
+        if free_roam_task is None:
+            free_roam_response = None
+        elif remaining > 0:
+            free_roam_response = await self._await_free_roam(free_roam_task)
+        else:
+            # Guided results already fill the list; free-roam could not add anything.
+            free_roam_task.cancel()
+            free_roam_response = None
+        if free_roam_response is not None and remaining > 0:
+            free_roam_titles = self._parse_titles(free_roam_response, remaining, seen)
+            suggestions.extend(
+                SuggestionItem(title=title, source="free_roam")
+                for title in free_roam_titles
+            )
 
         return SuggestionsResponse(suggestions=suggestions)
 
+    async def _await_free_roam(
+        self, free_roam_task: "asyncio.Future[Optional[str]]"
+    ) -> Optional[str]:
+        """Wait at most the grace period, counted from guided completion, for free-roam."""
+
+        try:
+            done, _ = await asyncio.wait({free_roam_task}, timeout=self.free_roam_grace)
+        except BaseException:
+            free_roam_task.cancel()
+            raise
+        if free_roam_task not in done:
+            free_roam_task.cancel()
+            return None
+        return free_roam_task.result()
+
+    async def _free_roam_response(
+        self, model_spec: ModelSpec, seeds: Sequence[str]
+    ) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(
+                self.text_client.call_text_async(
+                    model_spec,
+                    self._system_prompt(),
+                    self._build_free_roam_prompt(seeds),
+                ),
+                self.free_roam_timeout,
+            )
+        except Exception:
+            # Free-roam is additive; keep guided suggestions when this pass fails or is slow.
+            return None
+
     def _collect_seeds(self, request: SuggestionsRequest) -> List[str]:
         seeds: List[str] = []
         if request.topic:
             seeds.append(request.topic)
         seeds.extend(request.seeds)
         if request.include_report_headings:
-            seeds.extend(self._load_report_headings(limit=30))
+            seeds.extend(
+                self._load_report_headings(
+                    self._user_email(request), limit=_REPORT_HEADING_SEED_LIMIT
+                )
+            )
         return self._normalize_titles(seeds)
 
-    def _load_report_headings(self, *, limit: int) -> List[str]:
+    @staticmethod
+    def _user_email(request: SuggestionsRequest) -> str:
+        return request.user_email or os.environ.get(_DEFAULT_USER_EMAIL_ENV, _SYSTEM_USER_EMAIL)
+
+    def _load_report_headings(self, user_email: str, *, limit: int) -> List[str]:
         if self.session_factory is None:
             return []
         try:
             with session_scope(self.session_factory) as session:
-                reports = session.scalars(
-                    select(Report)
-                    .where(Report.sections != None)  # noqa: E711
-                    .order_by(Report.created_at.desc())
-                    .limit(limit)
-                ).all()
+                return list(
+                    session.scalars(
+                        select(ReportHeading.heading)
+                        .join(User, ReportHeading.owner_user_id == User.id)
+                        .join(Report, ReportHeading.report_id == Report.id)
+                        .where(
+                            User.email == user_email,
+                            # Same filter as stored-outline reuse: only finished, visible reports.
+                            Report.status == ReportStatus.COMPLETE,
+                            Report.is_deleted.is_(False),
+                        )
+                        .order_by(
+                            ReportHeading.created_at.desc(),
+                            ReportHeading.report_id,
+                            ReportHeading.position,
+                        )
+                        .limit(limit)
+                    ).all()
+                )
         except Exception:
             return []
-        headings: List[str] = []
-        for report in reports:
-            sections_payload = (report.sections or {}).get("outline") or {}
-            sections = sections_payload.get("sections", [])
-            for section in sections:
-                title = (section.get("title") or "").strip()
-                if title:
-                    headings.append(title)
-                for subsection_title in section.get("subsections") or []:
-                    cleaned_subsection = (subsection_title or "").strip()
-                    if cleaned_subsection:
-                        headings.append(cleaned_subsection)
-        return headings
 
     def _build_prompt(self, seeds: Sequence[str]) -> str:
         seeds_block = "\n".join(f"- {entry}" for entry in seeds[:20])
@@ -1,20 +1,25 @@
 from __future__ import annotations
 
 import json
+import math
 import os
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 import shutil
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, ContextManager, Dict, Iterable, List, Optional
 
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, sessionmaker
 
-from backend.db import Report, ReportStatus, session_scope
+from backend.db import Report, ReportStatus, User, session_scope
 from backend.schemas import GenerateRequest, Outline
+from backend.utils.embeddings import EmbeddingBackend, get_default_embedding_backend
 from backend.utils.saved_topics import get_or_create_saved_topic
+from backend.utils.topic_keys import generation_settings_key, normalize_topic_title
+from backend.utils.tracing import get_tracer
 from backend.utils.user_utils import get_or_create_user
 from backend.db.session import create_session_factory_from_env
 
@@ -59,17 +64,29 @@ def build_stored_report_handle(
 
 
 def write_outline_snapshot(handle: StoredReportHandle, outline: Outline) -> None:
-    handle.outline_path.parent.mkdir(parents=True, exist_ok=True)
-    handle.outline_path.write_text(
-        json.dumps(outline.model_dump(), indent=2) + "\n",
-        encoding="utf-8",
-    )
+    with trace_file_write(handle.outline_path):
+        handle.outline_path.parent.mkdir(parents=True, exist_ok=True)
+        handle.outline_path.write_text(
+            json.dumps(outline.model_dump(), indent=2) + "\n",
+            encoding="utf-8",
+        )
 
 
 def write_report_markdown(handle: StoredReportHandle, report_markdown: str) -> None:
-    text = report_markdown.strip() + "\n"
-    handle.report_path.parent.mkdir(parents=True, exist_ok=True)
-    handle.report_path.write_text(text, encoding="utf-8")
+    # strip() returns the same object when there is nothing to trim, and two writes
+    # avoid copying a large report just to append the trailing newline.
+    text = report_markdown.strip()
+    with trace_file_write(handle.report_path):
+        handle.report_path.parent.mkdir(parents=True, exist_ok=True)
+        with handle.report_path.open("w", encoding="utf-8") as output:
+            output.write(text)
+            output.write("\n")
+
+
+def trace_file_write(path: Path) -> ContextManager[Any]:
+    return get_tracer().span(
+        "file.write", attributes={"path": str(path)}, require_parent=True, activate=False
+    )
 
 
 class DatabaseReportStore:
@@ -80,6 +97,7 @@ class DatabaseReportStore:
         *,
         base_dir: Optional[Path | str] = None,
         session_factory: Optional[sessionmaker[Session]] = None,
+        embedding_backend: Optional[EmbeddingBackend] = None,
     ) -> None:
         configured_base = base_dir or os.environ.get(_DEFAULT_STORAGE_ENV, _DEFAULT_STORAGE_DIR)
         self.base_dir = Path(configured_base).expanduser().resolve()
@@ -89,8 +107,15 @@ class DatabaseReportStore:
             _DEFAULT_USER_EMAIL_ENV,
             _SYSTEM_USER_EMAIL,
         )
+        self.embedding_backend = embedding_backend or get_default_embedding_backend()
 
-    def prepare_report(self, request: GenerateRequest, outline: Outline) -> StoredReportHandle:
+    def prepare_report(
+        self,
+        request: GenerateRequest,
+        outline: Outline,
+        *,
+        outline_cache_key: Optional[str] = None,
+    ) -> StoredReportHandle:
         """Create DB rows and disk directories prior to section streaming."""
 
         topic_title = self._topic_title(request, outline)
@@ -117,11 +142,18 @@ class DatabaseReportStore:
                         owner=user,
                         status=ReportStatus.RUNNING,
                         outline_snapshot=outline.model_dump(),
+                        outline_cache_key=outline_cache_key,
+                        topic_key=normalize_topic_title(topic_title)[:255],
+                        settings_key=generation_settings_key(request),
+                        model_versions={
+                            stage: spec.model for stage, spec in request.models.items()
+                        },
                         sections={"outline": outline.model_dump(), "written": []},
                         generated_started_at=datetime.now(timezone.utc),
                     )
                     session.add(report)
                     session.flush()
+                    report.set_headings(report.outline_snapshot)
                     handle = self._build_report_handle(report.id, user.id)
                 self._write_outline_snapshot(handle, outline)
                 break
@@ -146,6 +178,9 @@ class DatabaseReportStore:
         report_markdown: str,
         written_sections: Iterable[Dict[str, Any]],
         summary: Optional[str] = None,
+        *,
+        usage: Optional[Dict[str, int]] = None,
+        token_usage: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Persist the final report markdown and update DB metadata."""
 
@@ -159,8 +194,26 @@ class DatabaseReportStore:
             if summary:
                 report.summary = summary
             report.sections = {"outline": report.outline_snapshot, "written": sections_payload}
+            if token_usage:
+                report.sections["usage"] = token_usage
+                report.token_count = token_usage.get("total_tokens")
+                cost_cents = token_usage.get("cost_cents")
+                # Whole cents, rounded up so small reports never sum to zero.
+                report.cost_cents = None if cost_cents is None else math.ceil(cost_cents)
             report.content_uri = self._relative_uri(handle.report_path)
             report.generated_completed_at = datetime.now(timezone.utc)
+            if usage:
+                self._record_usage(session, report.owner_user_id, usage)
+            # The report vector describes the topic; headings get vectors of their own.
+            topic_lines = [
+                report.saved_topic.title,
+                (report.outline_snapshot or {}).get("report_title"),
+            ]
+            embedding_texts = [
+                "\n".join(dict.fromkeys(line for line in topic_lines if line)),
+                *(heading.heading for heading in report.headings),
+            ]
+        self._record_embeddings(handle, embedding_texts)
 
     def discard_report(self, handle: StoredReportHandle) -> None:
         """Remove the persisted report row and artifacts when generation fails."""
@@ -172,6 +225,43 @@ class DatabaseReportStore:
                 return
             session.delete(report)
 
+    def _record_embeddings(self, handle: StoredReportHandle, texts: List[str]) -> None:
+        if self.embedding_backend is None:
+            return
+        try:
+            # Embed outside the DB transaction; remote backends can take a while.
+            vectors = self.embedding_backend.embed(texts)
+        except Exception:
+            # Embeddings only power related-topic lookups; never fail a finished report.
+            return
+        with session_scope(self._session_factory) as session:
+            report = session.get(Report, handle.report_id)
+            if not report:
+                return
+            report.embedding = _vector_payload(vectors[0])
+            report.embedding_model = self.embedding_backend.model_name
+            report.embedding_dimensions = int(vectors.shape[1])
+            for heading, vector in zip(report.headings, vectors[1:]):
+                heading.embedding = _vector_payload(vector)
+
+    @staticmethod
+    def _record_usage(session: Session, user_id: uuid.UUID, usage: Dict[str, int]) -> None:
+        # Concurrent finalizes for one user must not lose each other's counts: flushing
+        # first takes SQLite's write lock, and FOR UPDATE locks the row on other databases.
+        session.flush()
+        user = session.scalar(
+            select(User)
+            .where(User.id == user_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        if not user:
+            return
+        counters = dict(user.usage_counters or {})
+        for key, value in usage.items():
+            counters[key] = int(counters.get(key, 0)) + int(value)
+        user.usage_counters = counters
+
     def _topic_title(self, request: GenerateRequest, outline: Outline) -> str:
         topic = _normalize_topic_title(request.topic)
         if topic:
@@ -228,6 +318,10 @@ def _create_default_session_factory() -> sessionmaker[Session]:
     )
 
 
+def _vector_payload(vector: Any) -> List[float]:
+    return [round(float(value), 6) for value in vector]
+
+
 def _normalize_topic_title(value: Optional[str]) -> str:
     if not isinstance(value, str):
         return ""
@@ -14,6 +14,7 @@ from backend.utils.slug_utils import slugify
 from .database_report_store import (
     StoredReportHandle,
     build_stored_report_handle,
+    trace_file_write,
     write_outline_snapshot,
     write_report_markdown,
 )
@@ -37,7 +38,13 @@ class FilesystemReportStore:
             _SYSTEM_USER_EMAIL,
         )
 
-    def prepare_report(self, request: GenerateRequest, outline: Outline) -> StoredReportHandle:
+    def prepare_report(
+        self,
+        request: GenerateRequest,
+        outline: Outline,
+        *,
+        outline_cache_key: Optional[str] = None,
+    ) -> StoredReportHandle:
         report_id = uuid.uuid4()
         user_email = (request.user_email or self._default_user_email or "").strip()
         user_key = slugify(user_email) if user_email else "default"
@@ -49,7 +56,7 @@ class FilesystemReportStore:
             owner_user_id,
         )
         write_outline_snapshot(handle, outline)
-        self._write_metadata(handle, request, outline, user_email)
+        self._write_metadata(handle, request, outline, user_email, outline_cache_key)
         return handle
 
     def finalize_report(
@@ -58,9 +65,12 @@ class FilesystemReportStore:
         report_markdown: str,
         written_sections: Iterable[Dict[str, Any]],
         summary: Optional[str] = None,
+        *,
+        usage: Optional[Dict[str, int]] = None,
+        token_usage: Optional[Dict[str, Any]] = None,
     ) -> None:
         write_report_markdown(handle, report_markdown)
-        self._update_metadata(handle, summary, list(written_sections))
+        self._update_metadata(handle, summary, list(written_sections), usage, token_usage)
 
     def discard_report(self, handle: StoredReportHandle) -> None:
         if handle.report_dir.exists():
@@ -72,6 +82,7 @@ class FilesystemReportStore:
         request: GenerateRequest,
         outline: Outline,
         user_email: str,
+        outline_cache_key: Optional[str],
     ) -> None:
         payload = {
             "report_id": str(handle.report_id),
@@ -79,6 +90,7 @@ class FilesystemReportStore:
             "username": request.username or _SYSTEM_USERNAME,
             "topic": request.topic,
             "report_title": outline.report_title,
+            "outline_cache_key": outline_cache_key,
             "created_at": datetime.now(timezone.utc).isoformat(),
             "status": "running",
         }
@@ -89,12 +101,18 @@ class FilesystemReportStore:
         handle: StoredReportHandle,
         summary: Optional[str],
         written_sections: list[Dict[str, Any]],
+        usage: Optional[Dict[str, int]] = None,
+        token_usage: Optional[Dict[str, Any]] = None,
     ) -> None:
         metadata = self._read_metadata_file(handle)
         metadata["status"] = "complete"
         metadata["completed_at"] = datetime.now(timezone.utc).isoformat()
         metadata["summary"] = summary
         metadata["sections"] = written_sections
+        if usage:
+            metadata["usage"] = usage
+        if token_usage:
+            metadata["token_usage"] = token_usage
         self._write_metadata_file(handle, metadata)
 
     def _metadata_path(self, handle: StoredReportHandle) -> Path:
@@ -111,4 +129,5 @@ class FilesystemReportStore:
 
     def _write_metadata_file(self, handle: StoredReportHandle, payload: Dict[str, Any]) -> None:
         path = self._metadata_path(handle)
-        path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        with trace_file_write(path):
+            path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
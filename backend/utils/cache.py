@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+ValueT = TypeVar("ValueT")
+
+
+@dataclass
+class _CacheEntry(Generic[ValueT]):
+    value: ValueT
+    stored_at: float
+
+
+class TTLCache(Generic[ValueT]):
+    """Size-bounded LRU cache whose entries go stale after ``ttl`` seconds.
+
+    Stale entries are still returned (flagged as not fresh) for up to
+    ``stale_ttl`` further seconds so callers can serve them while refreshing.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 256,
+        ttl: float = 300.0,
+        stale_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _CacheEntry[ValueT]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Tuple[ValueT, bool]]:
+        """Return ``(value, is_fresh)`` or None when missing or fully expired."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        age = self._clock() - entry.stored_at
+        if age >= self.ttl + self.stale_ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry.value, age < self.ttl
+
+    def set(self, key: Hashable, value: ValueT) -> None:
+        self._entries[key] = _CacheEntry(value=value, stored_at=self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from functools import lru_cache
+from typing import Any, Hashable, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+_EMBEDDING_BACKEND_ENV = "EXPLORER_EMBEDDING_BACKEND"
+_EMBEDDING_MODEL_ENV = "EXPLORER_EMBEDDING_MODEL"
+DEFAULT_OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
+DEFAULT_HASHING_DIMENSIONS = 256
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class EmbeddingBackend(Protocol):
+    model_name: str
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return one L2-normalized row per input text."""
+        ...
+
+
+class HashingEmbeddingBackend:
+    """Deterministic, offline embeddings from hashed word and character n-grams.
+
+    Good enough to rank near-duplicate and overlapping topic titles without a
+    network call; used by default and in tests.
+    """
+
+    def __init__(self, dimensions: int = DEFAULT_HASHING_DIMENSIONS) -> None:
+        if dimensions < 8:
+            raise ValueError("dimensions must be at least 8.")
+        self.dimensions = dimensions
+        self.model_name = f"local-hashing-{dimensions}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+                sign = 1.0 if digest[4] & 1 else -1.0
+                matrix[row, bucket] += sign * weight
+        return normalize_rows(matrix)
+
+    @staticmethod
+    def _features(text: str) -> List[Tuple[str, float]]:
+        tokens = _TOKEN_PATTERN.findall((text or "").casefold())
+        features: List[Tuple[str, float]] = [(f"w:{token}", 1.0) for token in tokens]
+        for token in tokens:
+            padded = f"#{token}#"
+            features.extend(
+                (f"c:{padded[index:index + 3]}", 0.5) for index in range(len(padded) - 2)
+            )
+        return features
+
+
+class OpenAIEmbeddingBackend:
+    """Embeddings from the OpenAI embeddings endpoint."""
+
+    def __init__(
+        self,
+        model: str = DEFAULT_OPENAI_EMBEDDING_MODEL,
+        client: Any = None,
+    ) -> None:
+        if client is None:
+            from backend.utils.openai_client import OpenAITextClient
+
+            client = OpenAITextClient._make_sync_client()
+        self._client = client
+        self.model_name = model
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        response = self._client.embeddings.create(model=self.model_name, input=list(texts))
+        ordered = sorted(response.data, key=lambda item: item.index)
+        return normalize_rows(np.asarray([item.embedding for item in ordered], dtype=np.float32))
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class EmbeddingIndex:
+    """In-memory cosine nearest-neighbour index over normalized vectors."""
+
+    def __init__(self, keys: Sequence[Hashable], vectors: Sequence[Sequence[float]]) -> None:
+        self.keys: List[Hashable] = list(keys)
+        if self.keys:
+            self._matrix = normalize_rows(np.asarray(vectors, dtype=np.float32))
+        else:
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def search(
+        self,
+        query: np.ndarray,
+        *,
+        limit: int = 10,
+        min_score: float = -1.0,
+    ) -> List[Tuple[Hashable, float]]:
+        """Return up to ``limit`` ``(key, cosine score)`` pairs, best first."""
+
+        if not self.keys or limit <= 0:
+            return []
+        query_vector = np.asarray(query, dtype=np.float32).reshape(-1)
+        if query_vector.shape[0] != self._matrix.shape[1]:
+            return []
+        scores = self._matrix @ query_vector
+        count = min(limit, len(self.keys))
+        top = np.argpartition(-scores, count - 1)[:count]
+        ranked = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (self.keys[position], float(scores[position]))
+            for position in ranked
+            if scores[position] >= min_score
+        ]
+
+
+def build_embedding_backend(name: Optional[str] = None) -> Optional[EmbeddingBackend]:
+    """Return the backend named by ``name`` (or the env), or None when disabled."""
+
+    selected = (name or os.environ.get(_EMBEDDING_BACKEND_ENV, "local")).strip().lower()
+    if selected in {"", "off", "none", "disabled", "0"}:
+        return None
+    if selected == "openai":
+        return OpenAIEmbeddingBackend(
+            os.environ.get(_EMBEDDING_MODEL_ENV, DEFAULT_OPENAI_EMBEDDING_MODEL)
+        )
+    if selected in {"local", "hashing"}:
+        return HashingEmbeddingBackend()
+    raise ValueError(f"Unknown embedding backend: {selected!r}")
+
+
+@lru_cache
+def _default_embedding_backend() -> Optional[EmbeddingBackend]:
+    return build_embedding_backend()
+
+
+def get_default_embedding_backend() -> Optional[EmbeddingBackend]:
+    return _default_embedding_backend()
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import json
 import re
 from json import JSONDecodeError, JSONDecoder
-from typing import List
+from typing import List, Optional, Sequence
 
-from backend.schemas import Outline
+from backend.schemas import Outline, Section
 
 _SECTION_LABEL_RE = re.compile(r"Section\s+(\d+(?:\.\d+)*)\s*[:.-]?\s*(.*)", re.IGNORECASE)
 _NUMBER_PREFIX_RE = re.compile(r"^(\d+(?:\.\d+)*)\s*[:.-]?\s*(.*)$")
-_HASH_HEADING_PATTERN = re.compile(r"^###\s*")
-_NUMBERED_HEADING_PATTERN = re.compile(r"^(?:###\s*)?\d+(?:\.\d+)*\s*[:.-]?")
+# A "### ..." or numbered ("1.2: ...") heading line, capturing the indentation to keep.
+_HEADING_LINE_PATTERN = re.compile(r"(\s*)(?:###|\d)")
+# Every boundary str.splitlines() recognizes.
+_LINE_BREAK_PATTERN = re.compile("\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
 
 
 def _ensure_numbered_title(title: str, default_number: str) -> str:
@@ -43,21 +46,139 @@ def ensure_subsection_numbering(title: str, section_index: int, subsection_index
 
 
 def enforce_subsection_headings(section_text: str, subsection_titles: List[str]) -> str:
-    lines = section_text.splitlines()
-    result = []
-    subsection_cursor = 0
-
-    for line in lines:
-        stripped = line.lstrip()
-        if subsection_cursor < len(subsection_titles):
-            if _HASH_HEADING_PATTERN.match(stripped) or _NUMBERED_HEADING_PATTERN.match(stripped):
-                prefix = line[: len(line) - len(stripped)]
-                result.append(f"{prefix}{subsection_titles[subsection_cursor]}")
-                subsection_cursor += 1
-                continue
-        result.append(line)
+    return SubsectionHeadingNormalizer(subsection_titles).normalize(section_text)
+
+
+class SubsectionHeadingNormalizer:
+    """Replaces a section's first heading-like lines with its subsection titles.
+
+    Built once per section and shared by the writer and editor passes. One
+    combined pattern is tried per line, and only until every title has been
+    placed; the remaining lines pass through untouched. ``normalize_line``
+    applies the same rewrite one complete line at a time for streamed text.
+    """
+
+    def __init__(self, subsection_titles: Sequence[str]) -> None:
+        self.subsection_titles = tuple(subsection_titles)
+        self._cursor = 0
+
+    @property
+    def placed(self) -> int:
+        return self._cursor
+
+    @property
+    def exhausted(self) -> bool:
+        return self._cursor >= len(self.subsection_titles)
+
+    def normalize(self, section_text: str) -> str:
+        lines = section_text.splitlines()
+        titles = self.subsection_titles
+        cursor = 0
+        for index, line in enumerate(lines):
+            if cursor >= len(titles):
+                break
+            match = _HEADING_LINE_PATTERN.match(line)
+            if match:
+                lines[index] = match.group(1) + titles[cursor]
+                cursor += 1
+        return "\n".join(lines)
+
+    def normalize_line(self, line: str) -> str:
+        """Rewrite one line (without its terminator), advancing the title cursor."""
+
+        if self._cursor >= len(self.subsection_titles):
+            return line
+        match = _HEADING_LINE_PATTERN.match(line)
+        if not match:
+            return line
+        title = self.subsection_titles[self._cursor]
+        self._cursor += 1
+        return match.group(1) + title
+
+    def reset(self) -> None:
+        self._cursor = 0
+
+
+_UNDECIDED, _PASS_THROUGH, _DROP = range(3)
+
+
+class StreamingHeadingNormalizer:
+    """Incremental :func:`enforce_subsection_headings` for streamed section text.
+
+    ``feed`` takes chunks split anywhere and returns the output that is final
+    so far; ``finish`` flushes the rest. The concatenated output equals the
+    batch result for the whole text. A line is released as soon as its first
+    characters show whether it is a heading, so prose is not held back until
+    its newline. State is the title cursor plus, at most, the indentation of
+    the current line.
+    """
+
+    def __init__(self, subsection_titles: Sequence[str]) -> None:
+        self._headings = SubsectionHeadingNormalizer(subsection_titles)
+        self._line_start = ""
+        self._mode = _UNDECIDED
+        self._in_line = False
+        self._owe_separator = False
+        self._pending_cr = False
 
-    return "\n".join(result)
+    def feed(self, chunk: str) -> str:
+        if self._pending_cr:
+            self._pending_cr = False
+            if chunk.startswith("\n"):
+                chunk = chunk[1:]
+        out: List[str] = []
+        position = 0
+        for match in _LINE_BREAK_PATTERN.finditer(chunk):
+            self._consume(chunk[position : match.start()], out, line_end=True)
+            # A trailing "\r" may be the first half of a "\r\n" split across chunks.
+            self._pending_cr = match.group() == "\r" and match.end() == len(chunk)
+            position = match.end()
+        if position < len(chunk):
+            self._consume(chunk[position:], out, line_end=False)
+        return "".join(out)
+
+    def finish(self) -> str:
+        out: List[str] = []
+        if self._mode == _UNDECIDED and self._line_start:
+            out.append(self._headings.normalize_line(self._line_start))
+        self._line_start = ""
+        self._mode = _UNDECIDED
+        self._in_line = False
+        self._owe_separator = False
+        self._pending_cr = False
+        return "".join(out)
+
+    def _consume(self, text: str, out: List[str], *, line_end: bool) -> None:
+        if not self._in_line:
+            if self._owe_separator:
+                out.append("\n")
+                self._owe_separator = False
+            self._in_line = True
+        if self._mode == _PASS_THROUGH:
+            out.append(text)
+        elif self._mode == _UNDECIDED:
+            self._line_start += text
+            if line_end:
+                out.append(self._headings.normalize_line(self._line_start))
+            else:
+                self._classify(out)
+        if line_end:
+            self._line_start = ""
+            self._mode = _UNDECIDED
+            self._in_line = False
+            self._owe_separator = True
+
+    def _classify(self, out: List[str]) -> None:
+        headings = self._headings
+        if not headings.exhausted:
+            stripped = self._line_start.lstrip()
+            if not stripped or (len(stripped) < 3 and "###".startswith(stripped)):
+                return
+        placed = headings.placed
+        out.append(headings.normalize_line(self._line_start))
+        # A heading line is replaced whole, so the rest of it is dropped.
+        self._mode = _DROP if headings.placed > placed else _PASS_THROUGH
+        self._line_start = ""
 
 
 def parse_outline_json(text: str) -> Outline:
@@ -84,3 +205,110 @@ def parse_outline_json(text: str) -> Outline:
             except JSONDecodeError:
                 pass
         raise
+
+
+class IncrementalOutlineParser:
+    """Parse outline JSON as it streams, surfacing each section once its object closes.
+
+    Only tracks enough JSON structure (strings, nesting, top-level keys) to
+    find ``report_title`` and the objects inside the top-level ``sections``
+    array; ``finish`` re-parses the full text with :func:`parse_outline_json`.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._position = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = -1
+        self._expect_key = False
+        self._current_key: Optional[str] = None
+        self._sections_depth: Optional[int] = None
+        self._section_start = -1
+        self.report_title: Optional[str] = None
+        self.sections: List[Section] = []
+
+    def feed(self, chunk: str) -> List[Section]:
+        """Consume ``chunk`` and return the sections completed by it."""
+
+        self._text += chunk
+        completed: List[Section] = []
+        text = self._text
+        index = self._position
+        while index < len(text):
+            char = text[index]
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._expect_key = True
+                index += 1
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close_string(text[self._string_start : index + 1])
+                index += 1
+                continue
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char in "{[":
+                if char == "{" and self._depth == self._sections_depth:
+                    self._section_start = index
+                if char == "[" and self._depth == 1 and self._current_key == "sections":
+                    self._sections_depth = self._depth + 1
+                self._depth += 1
+                self._expect_key = char == "{"
+            elif char in "}]":
+                self._depth -= 1
+                if char == "}" and self._depth == self._sections_depth and self._section_start >= 0:
+                    section = self._parse_section(text[self._section_start : index + 1])
+                    self._section_start = -1
+                    if section is not None:
+                        self.sections.append(section)
+                        completed.append(section)
+                if char == "]" and self._depth == 1:
+                    self._sections_depth = None
+            elif char == "," and self._depth == 1:
+                self._expect_key = True
+                self._current_key = None
+            elif char == ":" and self._depth == 1:
+                self._expect_key = False
+            index += 1
+        self._position = index
+        return completed
+
+    def finish(self) -> Outline:
+        """Parse the complete text; raises like :func:`parse_outline_json` on bad JSON."""
+
+        return parse_outline_json(self._text)
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def _close_string(self, literal: str) -> None:
+        if self._depth != 1:
+            return
+        try:
+            value = json.loads(literal)
+        except JSONDecodeError:
+            return
+        if self._expect_key:
+            self._current_key = value
+        elif self._current_key == "report_title" and self.report_title is None:
+            self.report_title = value
+
+    @staticmethod
+    def _parse_section(candidate: str) -> Optional[Section]:
+        try:
+            return Section(**json.loads(candidate))
+        except Exception:
+            return None
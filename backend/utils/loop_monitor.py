@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from backend.utils.metrics import EVENT_LOOP_LAG, SLOW_CALLBACKS
+
+_ENABLED_ENV = "EXPLORER_LOOP_MONITOR"
+_INTERVAL_ENV = "EXPLORER_LOOP_MONITOR_INTERVAL_MS"
+_THRESHOLD_ENV = "EXPLORER_LOOP_SLOW_CALLBACK_MS"
+DEFAULT_INTERVAL_SECONDS = 0.05
+DEFAULT_SLOW_CALLBACK_SECONDS = 0.1
+_MAX_STACK_FRAMES = 30
+_RECENT_SLOW_CALLBACKS = 10
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Samples event-loop scheduling delay and reports callbacks that block it.
+
+    A sampler task sleeps for ``interval`` and records how late it woke up. A
+    watchdog thread watches the sampler's heartbeat; when the loop has been
+    stuck for longer than ``slow_callback_threshold`` it logs the loop
+    thread's current stack once per stall, so the blocking code is named.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+        slow_callback_threshold: float = DEFAULT_SLOW_CALLBACK_SECONDS,
+        window: int = 4096,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.interval = interval
+        self.slow_callback_threshold = slow_callback_threshold
+        self._clock = clock
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._slow_callbacks: Deque[Dict[str, Any]] = deque(maxlen=_RECENT_SLOW_CALLBACKS)
+        self._slow_callback_count = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = 0.0
+        self._pending_stall: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_env(cls) -> "LoopLagMonitor":
+        return cls(
+            interval=float(os.environ.get(_INTERVAL_ENV, DEFAULT_INTERVAL_SECONDS * 1000)) / 1000,
+            slow_callback_threshold=float(
+                os.environ.get(_THRESHOLD_ENV, DEFAULT_SLOW_CALLBACK_SECONDS * 1000)
+            )
+            / 1000,
+        )
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self._loop is not None
+            and not self._loop.is_closed()
+        )
+
+    def configure(
+        self,
+        *,
+        interval: Optional[float] = None,
+        slow_callback_threshold: Optional[float] = None,
+    ) -> None:
+        if interval is not None:
+            self.interval = interval
+        if slow_callback_threshold is not None:
+            self.slow_callback_threshold = slow_callback_threshold
+
+    def start(self) -> None:
+        """Start monitoring the running event loop; a no-op when already active."""
+
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self.stop()
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = self._clock()
+        self._stop = threading.Event()
+        self._task = loop.create_task(self._sample())
+        self._watchdog = threading.Thread(
+            target=self._watch, args=(self._stop,), name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None and self._loop is not None and not self._loop.is_closed():
+            if self._loop is _running_loop():
+                self._task.cancel()
+            else:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+        self._task = None
+        self._loop = None
+        self._watchdog = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._slow_callbacks.clear()
+            self._slow_callback_count = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._samples)
+            slow_callbacks = [dict(entry) for entry in self._slow_callbacks]
+            slow_count = self._slow_callback_count
+        return {
+            "enabled": self.running,
+            "interval_ms": round(self.interval * 1000, 3),
+            "slow_callback_ms": round(self.slow_callback_threshold * 1000, 3),
+            "samples": len(samples),
+            "lag_ms": {
+                "p50": _percentile_ms(samples, 0.50),
+                "p95": _percentile_ms(samples, 0.95),
+                "p99": _percentile_ms(samples, 0.99),
+                "max": _percentile_ms(samples, 1.0),
+            },
+            "slow_callbacks": slow_count,
+            "recent_slow_callbacks": slow_callbacks,
+        }
+
+    async def _sample(self) -> None:
+        while True:
+            started = self._clock()
+            await asyncio.sleep(self.interval)
+            woke = self._clock()
+            lag = max(woke - started - self.interval, 0.0)
+            with self._lock:
+                self._heartbeat = woke
+                self._samples.append(lag)
+                stall, self._pending_stall = self._pending_stall, None
+                if stall is not None:
+                    stall["blocked_ms"] = round(lag * 1000, 3)
+            EVENT_LOOP_LAG.labels().observe(lag)
+
+    def _watch(self, stop: threading.Event) -> None:
+        while not stop.wait(max(self.slow_callback_threshold / 4, 0.005)):
+            with self._lock:
+                stalled_for = self._clock() - self._heartbeat - self.interval
+                if stalled_for < self.slow_callback_threshold or self._pending_stall is not None:
+                    continue
+                stack = self._loop_stack()
+                stall = {
+                    "blocked_ms": round(stalled_for * 1000, 3),
+                    "detected_at": time.time(),
+                    "stack": stack,
+                }
+                self._pending_stall = stall
+                self._slow_callbacks.append(stall)
+                self._slow_callback_count += 1
+            SLOW_CALLBACKS.labels().inc()
+            logger.warning(
+                "Event loop blocked for more than %.0f ms; loop thread stack:\n%s",
+                stalled_for * 1000,
+                "".join(stack),
+            )
+
+    def _loop_stack(self) -> List[str]:
+        frame = sys._current_frames().get(self._loop_thread_id or -1)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)[-_MAX_STACK_FRAMES:]
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _percentile_ms(ordered: List[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return round(ordered[rank - 1] * 1000, 3)
+
+
+def loop_monitor_enabled_by_env() -> bool:
+    return os.environ.get(_ENABLED_ENV, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+LOOP_MONITOR = LoopLagMonitor.from_env()
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import atexit
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.utils.timing import DEFAULT_LATENCY_BUCKETS_SECONDS, LatencyHistogram
+
+_METRICS_DIR_ENV = "EXPLORER_METRICS_DIR"
+_FLUSH_INTERVAL_SECONDS = 1.0
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+class _Family:
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help_text: str, labelnames: Sequence[str]) -> None:
+        self._registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels: str) -> Any:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def samples(self) -> Dict[LabelValues, Any]:
+        with self._lock:
+            return {key: child.value() for key, child in self._children.items()}
+
+
+class _Value:
+    def __init__(self, registry: "MetricsRegistry") -> None:
+        self._registry = registry
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+        self._registry._changed()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+        self._registry._changed()
+
+    def value(self) -> float:
+        return self._value
+
+
+class _HistogramChild:
+    def __init__(self, registry: "MetricsRegistry", buckets: Sequence[float]) -> None:
+        self._registry = registry
+        self._histogram = LatencyHistogram(buckets)
+
+    def observe(self, value: float) -> None:
+        self._histogram.observe(value)
+        self._registry._changed()
+
+    @property
+    def count(self) -> int:
+        return self._histogram.count
+
+    def value(self) -> Dict[str, Any]:
+        return self._histogram.snapshot()
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value(self._registry)
+
+
+class Gauge(_Family):
+    kind = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value(self._registry)
+
+
+class Histogram(_Family):
+    kind = "histogram"
+
+    def __init__(self, *args: Any, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_SECONDS, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self._registry, self.buckets)
+
+
+class MetricsRegistry:
+    """Minimal Prometheus-style metrics with text exposition.
+
+    When ``EXPLORER_METRICS_DIR`` is set (one directory shared by all uvicorn
+    workers) a background thread writes each process's samples to
+    ``metrics-<pid>-<start>.json`` at most once per flush interval, and always
+    after the last change, and a scrape of any worker merges every file.
+    Counters and histograms from exited workers are kept; gauges only count
+    live processes.
+    """
+
+    def __init__(self, multiprocess_dir: Optional[str] = None) -> None:
+        self._families: Dict[str, _Family] = {}
+        self._lock = threading.Lock()
+        self.multiprocess_dir = Path(multiprocess_dir) if multiprocess_dir else None
+        self._reset_process_state()
+        if self.multiprocess_dir is not None and hasattr(os, "register_at_fork"):
+            # Forked workers get their own file and flusher; threads do not survive fork.
+            os.register_at_fork(after_in_child=self._reset_process_state)
+
+    def _reset_process_state(self) -> None:
+        self._flush_lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        # The start time keeps a reused PID from overwriting a dead worker's file.
+        self._process_file = f"metrics-{os.getpid()}-{time.time_ns():x}.json"
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(self, name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_SECONDS,
+    ) -> Histogram:
+        return self._register(Histogram(self, name, help_text, labelnames, buckets=buckets))
+
+    def _register(self, family: Any) -> Any:
+        with self._lock:
+            existing = self._families.get(family.name)
+            if existing is not None:
+                return existing
+            self._families[family.name] = family
+            return family
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            families = list(self._families.values())
+        return {
+            family.name: {
+                "type": family.kind,
+                "help": family.help,
+                "labelnames": list(family.labelnames),
+                "samples": [[list(key), value] for key, value in family.samples().items()],
+            }
+            for family in families
+        }
+
+    def render(self) -> str:
+        if self.multiprocess_dir is None:
+            return _render_text(self.snapshot())
+        self.flush()
+        return _render_text(_merge_snapshots(self._read_process_snapshots()))
+
+    def flush(self) -> None:
+        if self.multiprocess_dir is None:
+            return
+        self.multiprocess_dir.mkdir(parents=True, exist_ok=True)
+        target = self.multiprocess_dir / self._process_file
+        # Threads flush one at a time through their own temp file, so a stale snapshot
+        # never replaces a newer one and no writer renames another's half-written file.
+        with self._flush_lock:
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=self.multiprocess_dir,
+                prefix=f"{target.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as handle:
+                handle.write(json.dumps(self.snapshot()))
+            try:
+                os.replace(handle.name, target)
+            except OSError:
+                os.unlink(handle.name)
+                raise
+
+    def _changed(self) -> None:
+        if self.multiprocess_dir is None:
+            return
+        self._dirty.set()
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(
+                        target=self._flush_loop, name="metrics-flusher", daemon=True
+                    )
+                    self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        dirty = self._dirty
+        while True:
+            dirty.wait()
+            dirty.clear()
+            try:
+                self.flush()
+            except OSError:
+                pass
+            # Changes made during the pause set the flag again and get a trailing flush.
+            time.sleep(_FLUSH_INTERVAL_SECONDS)
+
+    def _read_process_snapshots(self) -> List[Tuple[bool, Dict[str, Any]]]:
+        snapshots: List[Tuple[bool, Dict[str, Any]]] = []
+        for path in sorted(self.multiprocess_dir.glob("metrics-*.json")):
+            try:
+                pid = int(path.stem.split("-")[1])
+                snapshots.append((_process_alive(pid), json.loads(path.read_text(encoding="utf-8"))))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge_snapshots(snapshots: Iterable[Tuple[bool, Dict[str, Any]]]) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {}
+    for alive, snapshot in snapshots:
+        for name, family in snapshot.items():
+            if family["type"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(name, {**family, "samples": {}})
+            for labels, value in family["samples"]:
+                key = tuple(labels)
+                current = target["samples"].get(key)
+                target["samples"][key] = value if current is None else _add_values(current, value)
+    for family in merged.values():
+        family["samples"] = [[list(key), value] for key, value in family["samples"].items()]
+    return merged
+
+
+def _add_values(left: Any, right: Any) -> Any:
+    if isinstance(left, dict):
+        return {
+            "buckets": {
+                bucket: left["buckets"].get(bucket, 0) + right["buckets"].get(bucket, 0)
+                for bucket in left["buckets"]
+            },
+            "count": left["count"] + right["count"],
+            "sum": left["sum"] + right["sum"],
+        }
+    return left + right
+
+
+def _render_text(snapshot: Dict[str, Any]) -> str:
+    lines: List[str] = []
+    for name in sorted(snapshot):
+        family = snapshot[name]
+        lines.append(f"# HELP {name} {_escape_help(family['help'])}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        labelnames = family["labelnames"]
+        for labels, value in sorted(family["samples"], key=lambda sample: sample[0]):
+            pairs = list(zip(labelnames, labels))
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+                continue
+            for bucket, count in value["buckets"].items():
+                lines.append(
+                    f"{name}_bucket{_format_labels([*pairs, ('le', bucket)])} {_format_value(count)}"
+                )
+            lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(value['sum'])}")
+            lines.append(f"{name}_count{_format_labels(pairs)} {_format_value(value['count'])}")
+    return "\n".join(lines) + "\n"
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    rendered = ",".join(f'{key}="{_escape_label(value)}"' for key, value in pairs)
+    return "{" + rendered + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+REGISTRY = MetricsRegistry(os.environ.get(_METRICS_DIR_ENV) or None)
+atexit.register(lambda: REGISTRY.flush() if REGISTRY.multiprocess_dir else None)
+
+ACTIVE_REPORT_STREAMS = REGISTRY.gauge(
+    "explorer_active_report_streams", "Report generation streams currently running."
+)
+LLM_CALLS = REGISTRY.counter(
+    "explorer_llm_calls_total", "LLM calls by model, stage and outcome.", ["model", "stage", "outcome"]
+)
+LLM_CALL_DURATION = REGISTRY.histogram(
+    "explorer_llm_call_duration_seconds", "LLM call latency by model and stage.", ["model", "stage"]
+)
+LLM_TOKENS = REGISTRY.counter(
+    "explorer_llm_tokens_total", "Tokens reported by the LLM provider.", ["model", "stage", "kind"]
+)
+STAGE_DURATION = REGISTRY.histogram(
+    "explorer_stage_duration_seconds", "Report pipeline stage latency.", ["stage"]
+)
+WRITER_FALLBACKS = REGISTRY.counter(
+    "explorer_writer_fallbacks_total", "Writer fallback model activations.", ["model"]
+)
+DB_SESSION_DURATION = REGISTRY.histogram(
+    "explorer_db_session_duration_seconds",
+    "Duration of database session scopes.",
+    ["outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+STORAGE_ERRORS = REGISTRY.counter(
+    "explorer_storage_errors_total", "Report storage failures by operation.", ["operation"]
+)
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "explorer_event_loop_lag_seconds",
+    "Event loop scheduling delay sampled by the loop monitor.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+SLOW_CALLBACKS = REGISTRY.counter(
+    "explorer_slow_callbacks_total", "Event loop stalls longer than the slow-callback threshold."
+)
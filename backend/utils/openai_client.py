@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import os
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, Sequence, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
 
 from openai import AsyncOpenAI, OpenAI
 
 from backend.schemas import ModelSpec
 from backend.utils.model_utils import supports_reasoning
+from backend.utils.usage import record_response_usage
+
+_TEXT_BACKEND_ENV = "EXPLORER_TEXT_BACKEND"
 
 
 class OpenAITextClient:
@@ -32,6 +35,7 @@ class OpenAITextClient:
             response = self._sync_client.chat.completions.create(
                 **_build_chat_kwargs(model_spec, system_prompt, user_prompt, style_hint)
             )
+            record_response_usage(model_spec.model, response)
             return _extract_chat_text(response)
         except Exception:
             # Fall back to Responses API for models that are not yet on Chat,
@@ -39,6 +43,7 @@ class OpenAITextClient:
             response = self._sync_client.responses.create(
                 **_build_response_kwargs(model_spec, system_prompt, user_prompt, style_hint)
             )
+            record_response_usage(model_spec.model, response)
             return response.output_text
 
     async def call_text_async(
@@ -52,12 +57,59 @@ class OpenAITextClient:
             response = await self._async_client.chat.completions.create(
                 **_build_chat_kwargs(model_spec, system_prompt, user_prompt, style_hint)
             )
+            record_response_usage(model_spec.model, response)
             return _extract_chat_text(response)
         except Exception:
-            response = await self._async_client.responses.create(
-                **_build_response_kwargs(model_spec, system_prompt, user_prompt, style_hint)
+            return await self._call_responses_async(
+                model_spec, system_prompt, user_prompt, style_hint
             )
-            return response.output_text
+
+    async def _call_responses_async(
+        self,
+        model_spec: ModelSpec,
+        system_prompt: str,
+        user_prompt: str,
+        style_hint: Optional[str],
+    ) -> str:
+        response = await self._async_client.responses.create(
+            **_build_response_kwargs(model_spec, system_prompt, user_prompt, style_hint)
+        )
+        record_response_usage(model_spec.model, response)
+        return response.output_text
+
+    async def stream_text_async(
+        self,
+        model_spec: ModelSpec,
+        system_prompt: str,
+        user_prompt: str,
+        style_hint: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Yield Chat Completions text deltas as they arrive.
+
+        Models that are only served by the Responses API get the whole
+        non-streamed response as a single chunk, like ``call_text_async``.
+        """
+
+        try:
+            stream = await self._async_client.chat.completions.create(
+                stream=True,
+                stream_options={"include_usage": True},
+                **_build_chat_kwargs(model_spec, system_prompt, user_prompt, style_hint),
+            )
+        except Exception:
+            text = await self._call_responses_async(
+                model_spec, system_prompt, user_prompt, style_hint
+            )
+            if text:
+                yield text
+            return
+        async for chunk in stream:
+            # With include_usage the final chunk carries usage and no choices.
+            record_response_usage(model_spec.model, chunk)
+            for choice in getattr(chunk, "choices", None) or []:
+                delta = getattr(getattr(choice, "delta", None), "content", None)
+                if delta:
+                    yield delta
 
     @staticmethod
     def _make_sync_client() -> OpenAI:
@@ -72,13 +124,32 @@ class OpenAITextClient:
 
 @lru_cache
 def _default_text_client() -> OpenAITextClient:
+    backend = os.environ.get(_TEXT_BACKEND_ENV, "openai").strip().lower()
+    if backend == "simulated":
+        from backend.utils.simulated_client import SimulatedTextClient
+
+        return SimulatedTextClient.from_env()  # type: ignore[return-value]
+    if backend not in {"", "openai"}:
+        raise ValueError(f"Unknown text backend: {backend!r}")
     return OpenAITextClient()
 
 
 def get_default_text_client() -> OpenAITextClient:
+    """Return the shared text client; ``EXPLORER_TEXT_BACKEND=simulated`` selects the offline fake."""
+
     return _default_text_client()
 
 
+def build_chat_request_body(
+    model_spec: ModelSpec,
+    system_prompt: str,
+    user_prompt: str,
+    style_hint: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Return the Chat Completions request body used for ``model_spec``."""
+    return _build_chat_kwargs(model_spec, system_prompt, user_prompt, style_hint)
+
+
 def _build_chat_kwargs(
     model_spec: ModelSpec, system_prompt: str, user_prompt: str, style_hint: Optional[str]
 ) -> Dict[str, Any]:
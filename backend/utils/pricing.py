@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+_PRICES_ENV = "EXPLORER_MODEL_PRICES"
+
+# The OpenAI Batch API bills both input and output tokens at half the synchronous rate.
+BATCH_PRICE_MULTIPLIER = 0.5
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """USD per million input (prompt) and output (completion) tokens."""
+
+    input_per_million: float
+    output_per_million: float
+
+
+DEFAULT_MODEL_PRICES: Dict[str, ModelPrice] = {
+    "gpt-4.1": ModelPrice(2.00, 8.00),
+    "gpt-4.1-mini": ModelPrice(0.40, 1.60),
+    "gpt-4.1-nano": ModelPrice(0.10, 0.40),
+    "gpt-4o": ModelPrice(2.50, 10.00),
+    "gpt-4o-mini": ModelPrice(0.15, 0.60),
+    "gpt-5": ModelPrice(1.25, 10.00),
+    "gpt-5-mini": ModelPrice(0.25, 2.00),
+    "gpt-5-nano": ModelPrice(0.05, 0.40),
+    "o3": ModelPrice(2.00, 8.00),
+    "o4-mini": ModelPrice(1.10, 4.40),
+}
+
+
+class PriceTable:
+    """Per-model token prices; dated snapshots fall back to their base model."""
+
+    def __init__(self, prices: Mapping[str, ModelPrice]) -> None:
+        self.prices = dict(prices)
+
+    def price_for(self, model: str) -> Optional[ModelPrice]:
+        if model in self.prices:
+            return self.prices[model]
+        # "gpt-4o-mini-2024-07-18" -> longest known prefix "gpt-4o-mini".
+        candidates = [name for name in self.prices if model.startswith(f"{name}-")]
+        if not candidates:
+            return None
+        return self.prices[max(candidates, key=len)]
+
+    def cost_cents(self, model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+        price = self.price_for(model)
+        if price is None:
+            return None
+        dollars = (
+            prompt_tokens * price.input_per_million
+            + completion_tokens * price.output_per_million
+        ) / 1_000_000
+        return dollars * 100
+
+
+def load_price_table(override: Optional[str] = None) -> PriceTable:
+    """Build the price table, merging overrides from JSON text or a JSON file path.
+
+    Overrides map model names to ``{"input": <usd/1M>, "output": <usd/1M>}``.
+    """
+
+    prices = dict(DEFAULT_MODEL_PRICES)
+    raw = override if override is not None else os.environ.get(_PRICES_ENV, "")
+    raw = raw.strip()
+    if raw:
+        if not raw.startswith("{"):
+            raw = Path(raw).expanduser().read_text(encoding="utf-8")
+        for model, entry in json.loads(raw).items():
+            prices[model] = ModelPrice(float(entry["input"]), float(entry["output"]))
+    return PriceTable(prices)
+
+
+@lru_cache
+def _default_price_table() -> PriceTable:
+    return load_price_table()
+
+
+def get_price_table() -> PriceTable:
+    return _default_price_table()
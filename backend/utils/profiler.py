@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_SAMPLE_INTERVAL_SECONDS = 0.01
+_MAX_STACK_DEPTH = 128
+_TRACEMALLOC_FRAMES = 25
+
+# (file, line, function) from outermost to innermost.
+Frame = Tuple[str, int, str]
+Stack = Tuple[Frame, ...]
+
+
+@dataclass
+class StackSamples:
+    """Stacks observed per thread by :func:`sample_stacks`."""
+
+    interval: float
+    duration: float = 0.0
+    samples: int = 0
+    stacks: Dict[str, Counter] = field(default_factory=dict)
+
+    def add(self, thread_name: str, stack: Stack) -> None:
+        self.stacks.setdefault(thread_name, Counter())[stack] += 1
+
+
+def sample_stacks(
+    duration: float,
+    *,
+    interval: float = DEFAULT_SAMPLE_INTERVAL_SECONDS,
+) -> StackSamples:
+    """Sample every other thread's Python stack for ``duration`` seconds.
+
+    Statistical sampling from the calling thread: the profiled code runs
+    unmodified, so the cost is one ``sys._current_frames()`` walk per interval.
+    """
+
+    result = StackSamples(interval=interval)
+    own_thread = threading.get_ident()
+    started = time.perf_counter()
+    deadline = started + duration
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+            result.add(names.get(thread_id, f"thread-{thread_id}"), _walk(frame))
+        result.samples += 1
+        time.sleep(max(interval - (time.perf_counter() - now), 0.0))
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def _walk(frame: Optional[FrameType]) -> Stack:
+    frames: List[Frame] = []
+    while frame is not None and len(frames) < _MAX_STACK_DEPTH:
+        code = frame.f_code
+        frames.append((code.co_filename, frame.f_lineno, code.co_name))
+        frame = frame.f_back
+    frames.reverse()
+    return tuple(frames)
+
+
+def _frame_label(frame: Frame) -> str:
+    filename, line, function = frame
+    return f"{function} ({_short_path(filename)}:{line})"
+
+
+def _short_path(filename: str) -> str:
+    for prefix in sorted(set(sys.path), key=len, reverse=True):
+        if prefix and filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1 :]
+    return filename
+
+
+def to_collapsed(samples: StackSamples) -> str:
+    """Brendan Gregg's collapsed format (``thread;outer;inner count``) for flamegraph tools."""
+
+    lines = []
+    for thread_name, stacks in sorted(samples.stacks.items()):
+        for stack, count in stacks.most_common():
+            labels = [thread_name, *(_frame_label(frame).replace(";", ":") for frame in stack)]
+            lines.append(f"{';'.join(labels)} {count}")
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def to_speedscope(samples: StackSamples, *, name: str = "explorer") -> Dict[str, Any]:
+    """Render samples as a speedscope "sampled" profile, one profile per thread."""
+
+    frames: List[Dict[str, Any]] = []
+    frame_index: Dict[Frame, int] = {}
+    profiles = []
+    for thread_name, stacks in sorted(samples.stacks.items()):
+        stack_rows: List[List[int]] = []
+        weights: List[float] = []
+        for stack, count in stacks.most_common():
+            row = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    filename, line, function = frame
+                    frames.append({"name": function, "file": _short_path(filename), "line": line})
+                row.append(frame_index[frame])
+            stack_rows.append(row)
+            weights.append(round(count * samples.interval, 6))
+        profiles.append(
+            {
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": stack_rows,
+                "weights": weights,
+            }
+        )
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "explorer-profiler",
+        "activeProfileIndex": 0,
+        "shared": {"frames": frames},
+        "profiles": profiles,
+    }
+
+
+def tracemalloc_diff(
+    duration: float,
+    *,
+    top: int = 25,
+    key_type: str = "traceback",
+    include: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Diff two tracemalloc snapshots taken ``duration`` seconds apart.
+
+    Tracing is started for the window if it is not already running (and
+    stopped again afterwards), so only allocations made during the window
+    are attributed. ``include`` keeps only allocations with a frame whose
+    file path contains the given substring, e.g. ``backend/``.
+    """
+
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start(_TRACEMALLOC_FRAMES)
+    try:
+        before = _filtered_snapshot(include)
+        time.sleep(duration)
+        after = _filtered_snapshot(include)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_here:
+            tracemalloc.stop()
+    stats = after.compare_to(before, key_type)
+    return {
+        "duration_seconds": duration,
+        "key_type": key_type,
+        "traced_bytes": current,
+        "peak_traced_bytes": peak,
+        "size_diff_bytes": sum(stat.size_diff for stat in stats),
+        "top": [
+            {
+                "size_diff_bytes": stat.size_diff,
+                "size_bytes": stat.size,
+                "count_diff": stat.count_diff,
+                "count": stat.count,
+                "traceback": [
+                    f"{_short_path(frame.filename)}:{frame.lineno}" for frame in stat.traceback
+                ],
+            }
+            for stat in stats[:top]
+        ],
+    }
+
+
+def _filtered_snapshot(include: Optional[str]) -> tracemalloc.Snapshot:
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+    )
+    if include:
+        snapshot = snapshot.filter_traces(
+            [tracemalloc.Filter(True, f"*{include}*", all_frames=True)]
+        )
+    return snapshot
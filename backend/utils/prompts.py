@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import List, Optional
 
+from backend.utils.summary import SECTION_SUMMARY_MARKER
+
 
 def _build_outline_prompt_base(
     topic: str,
@@ -105,16 +107,26 @@ Instructions:
 
 
 def build_section_editor_prompt(
-    report_title: str, section_title: str, section_text: str
+    report_title: str,
+    section_title: str,
+    section_text: str,
+    *,
+    include_summary: bool = False,
 ) -> str:
     section_body = section_text.strip() or "(no body text)"
+    summary_instruction = (
+        f"\nAfter the edited section, add one final line starting with `{SECTION_SUMMARY_MARKER}` "
+        "followed by a two-sentence plain summary of the section's key points.\n"
+        if include_summary
+        else ""
+    )
     return f"""
 Edit the following section body from the report "{report_title}" into audio-friendly prose while preserving every fact.
 Keep every heading line exactly as written (they already contain numbering like `1.1: ...`); do not add Markdown `#` symbols, change the numbering, or repeat the section title "{section_title}".
 Rewrite only the paragraph text beneath those headings using a conversational tone.
 Where appropriate, enrich the prose with short, clarifying examples.
 Never add editor prefaces such as "Sure, here's the rewrite", "As an AI", "Here you go", or meta commentary; begin directly with the first heading and section text. Remove any editor prefaces, apologies, AI/system disclaimers, or meta commentary; never prepend or append anything outside the rewritten section.
-
+{summary_instruction}
 Section body to edit:
 {section_body}
 """
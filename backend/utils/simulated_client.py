@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Protocol, Tuple
+
+from backend.schemas import ModelSpec
+from backend.utils.summary import SECTION_SUMMARY_MARKER
+from backend.utils.usage import record_token_usage
+
+_SEED_ENV = "EXPLORER_SIM_SEED"
+_LATENCY_ENV = "EXPLORER_SIM_LATENCY"
+_TOKENS_PER_SECOND_ENV = "EXPLORER_SIM_TOKENS_PER_SECOND"
+_ERROR_RATE_ENV = "EXPLORER_SIM_ERROR_RATE"
+_SECTIONS_ENV = "EXPLORER_SIM_SECTIONS"
+_SUBSECTIONS_ENV = "EXPLORER_SIM_SUBSECTIONS"
+_PARAGRAPHS_ENV = "EXPLORER_SIM_PARAGRAPHS"
+_PARAGRAPH_WORDS_ENV = "EXPLORER_SIM_PARAGRAPH_WORDS"
+
+_CHARS_PER_TOKEN = 4
+_STREAM_CHUNK_TOKENS = 4
+
+_TOPIC_PATTERN = re.compile(r'report on the topic of "(?P<topic>.+?)"\.')
+_SECTION_COUNT_PATTERN = re.compile(r"Create exactly (?P<count>\d+) main sections")
+_CURRENT_SECTION_PATTERN = re.compile(r"Current section to write:\n(?P<title>.+)")
+_SUBSECTIONS_PATTERN = re.compile(
+    r"Subsections to cover inside this section:\n(?P<block>.*?)\n\s*\nInstructions:", re.DOTALL
+)
+_EDIT_BODY_MARKER = "Section body to edit:\n"
+_SEED_LINE_PATTERN = re.compile(r"^- (?P<seed>.+)$", re.MULTILINE)
+
+_WORDS = (
+    "analysis archive balance capacity catalyst context current data design detail "
+    "development evidence example factor framework growth history impact insight "
+    "landscape method model network origin pattern perspective practice principle "
+    "process research resource result scale signal source strategy structure system "
+    "technique theory tradition trend value variable"
+).split()
+_ANGLES = (
+    "Origins",
+    "Key Concepts",
+    "Historical Development",
+    "Core Mechanisms",
+    "Major Figures",
+    "Practical Applications",
+    "Economic Impact",
+    "Cultural Significance",
+    "Open Questions",
+    "Future Directions",
+    "Conclusion",
+)
+
+
+class SimulatedLLMError(RuntimeError):
+    """Injected failure from :class:`SimulatedTextClient`."""
+
+
+class LatencyDistribution(Protocol):
+    def sample(self, rng: random.Random) -> float:
+        """Return a time-to-first-token delay in seconds."""
+        ...
+
+
+@dataclass(frozen=True)
+class FixedLatency:
+    seconds: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        return self.seconds
+
+
+@dataclass(frozen=True)
+class LogNormalLatency:
+    median: float = 1.0
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+
+@dataclass(frozen=True)
+class ParetoLatency:
+    """Heavy-tailed latency: ``scale`` seconds minimum, capped at ``cap``."""
+
+    scale: float = 0.5
+    alpha: float = 1.5
+    cap: float = 120.0
+
+    def sample(self, rng: random.Random) -> float:
+        return min(self.scale * rng.paretovariate(self.alpha), self.cap)
+
+
+def parse_latency(spec: str) -> LatencyDistribution:
+    """Parse ``fixed:0.5``, ``lognormal:median=1,sigma=0.5`` or ``pareto:scale=0.5,alpha=1.5``."""
+
+    kind, _, arguments = (spec or "fixed:0").strip().partition(":")
+    kind = kind.strip().lower()
+    if kind == "fixed":
+        return FixedLatency(float(arguments or 0))
+    options: Dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in arguments.split(","))):
+        key, _, value = item.partition("=")
+        options[key.strip()] = float(value)
+    if kind == "lognormal":
+        return LogNormalLatency(**options)
+    if kind in {"pareto", "heavy_tail"}:
+        return ParetoLatency(**options)
+    raise ValueError(f"Unknown latency distribution: {spec!r}")
+
+
+class SimulatedTextClient:
+    """Offline stand-in for :class:`OpenAITextClient` used for tests and load tests.
+
+    Recognizes outline, section writer, editor and suggestion prompts and
+    returns plausible output of configurable size. Output, latency and
+    injected errors are derived from ``seed`` and the prompt, so a run is
+    reproducible regardless of how calls interleave. Token usage is
+    estimated and reported like real calls.
+    """
+
+    def __init__(
+        self,
+        *,
+        seed: int = 0,
+        latency: Optional[LatencyDistribution] = None,
+        tokens_per_second: float = 0.0,
+        error_rate: float = 0.0,
+        sections: int = 5,
+        subsections: int = 3,
+        paragraphs: int = 2,
+        paragraph_words: int = 80,
+    ) -> None:
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1.")
+        self.seed = seed
+        self.latency = latency or FixedLatency()
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.sections = sections
+        self.subsections = subsections
+        self.paragraphs = paragraphs
+        self.paragraph_words = paragraph_words
+        self.calls = 0
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SimulatedTextClient":
+        return cls(
+            seed=int(os.environ.get(_SEED_ENV, 0)),
+            latency=parse_latency(os.environ.get(_LATENCY_ENV, "fixed:0")),
+            tokens_per_second=float(os.environ.get(_TOKENS_PER_SECOND_ENV, 0)),
+            error_rate=float(os.environ.get(_ERROR_RATE_ENV, 0)),
+            sections=int(os.environ.get(_SECTIONS_ENV, 5)),
+            subsections=int(os.environ.get(_SUBSECTIONS_ENV, 3)),
+            paragraphs=int(os.environ.get(_PARAGRAPHS_ENV, 2)),
+            paragraph_words=int(os.environ.get(_PARAGRAPH_WORDS_ENV, 80)),
+        )
+
+    def call_text(
+        self,
+        model_spec: ModelSpec,
+        system_prompt: str,
+        user_prompt: str,
+        style_hint: Optional[str] = None,
+    ) -> str:
+        delay, text, error = self._plan(model_spec, system_prompt, user_prompt)
+        time.sleep(delay + self._generation_seconds(text))
+        if error is not None:
+            raise error
+        return text
+
+    async def call_text_async(
+        self,
+        model_spec: ModelSpec,
+        system_prompt: str,
+        user_prompt: str,
+        style_hint: Optional[str] = None,
+    ) -> str:
+        delay, text, error = self._plan(model_spec, system_prompt, user_prompt)
+        await asyncio.sleep(delay + self._generation_seconds(text))
+        if error is not None:
+            raise error
+        return text
+
+    async def stream_text_async(
+        self,
+        model_spec: ModelSpec,
+        system_prompt: str,
+        user_prompt: str,
+        style_hint: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        delay, text, error = self._plan(model_spec, system_prompt, user_prompt)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        chunk_chars = _STREAM_CHUNK_TOKENS * _CHARS_PER_TOKEN
+        for start in range(0, len(text), chunk_chars):
+            chunk = text[start : start + chunk_chars]
+            await asyncio.sleep(self._generation_seconds(chunk))
+            yield chunk
+
+    def _plan(
+        self, model_spec: ModelSpec, system_prompt: str, user_prompt: str
+    ) -> Tuple[float, str, Optional[SimulatedLLMError]]:
+        """Draw latency, an optional injected failure (raised after the delay) and the text."""
+
+        rng = self._call_rng(system_prompt, user_prompt)
+        delay = max(self.latency.sample(rng), 0.0)
+        if self.error_rate and rng.random() < self.error_rate:
+            return delay, "", SimulatedLLMError(f"Simulated {model_spec.model} failure")
+        text = self._respond(rng, system_prompt, user_prompt)
+        record_token_usage(
+            model_spec.model,
+            _estimate_tokens(system_prompt) + _estimate_tokens(user_prompt),
+            _estimate_tokens(text),
+        )
+        return delay, text, None
+
+    def _call_rng(self, system_prompt: str, user_prompt: str) -> random.Random:
+        digest = hashlib.sha256(f"{system_prompt}\0{user_prompt}".encode("utf-8")).hexdigest()
+        with self._lock:
+            self.calls += 1
+            attempt = self._attempts.get(digest, 0)
+            self._attempts[digest] = attempt + 1
+        # Retries of the same prompt draw fresh latency and error outcomes.
+        return random.Random(f"{self.seed}:{digest}:{attempt}")
+
+    def _generation_seconds(self, text: str) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return _estimate_tokens(text) / self.tokens_per_second
+
+    def _respond(self, rng: random.Random, system_prompt: str, user_prompt: str) -> str:
+        if _EDIT_BODY_MARKER in user_prompt:
+            return self._edited_section(rng, user_prompt)
+        if "Current section to write:" in user_prompt:
+            return self._section(rng, user_prompt)
+        topic_match = _TOPIC_PATTERN.search(user_prompt)
+        if topic_match:
+            return self._outline(rng, topic_match.group("topic"), user_prompt)
+        if '"suggestions"' in user_prompt:
+            return self._suggestions(rng, user_prompt)
+        return self._paragraph(rng, [])
+
+    def _outline(self, rng: random.Random, topic: str, user_prompt: str) -> str:
+        count_match = _SECTION_COUNT_PATTERN.search(user_prompt)
+        count = int(count_match.group("count")) if count_match else self.sections
+        angles = list(_ANGLES[:-1])
+        rng.shuffle(angles)
+        titles = [angles[index % len(angles)] for index in range(max(count - 1, 1))]
+        if count > 1:
+            titles.append(_ANGLES[-1])
+        sections = [
+            {
+                "title": f"{title} of {topic}" if title != _ANGLES[-1] else title,
+                "subsections": [
+                    f"{rng.choice(_WORDS).title()} and {rng.choice(_WORDS).title()}"
+                    for _ in range(self.subsections)
+                ],
+            }
+            for title in titles[:count]
+        ]
+        outline = {"report_title": f"Understanding {topic}", "sections": sections}
+        if "Return Markdown only." in user_prompt:
+            lines = [f"# {outline['report_title']}"]
+            for index, section in enumerate(sections, start=1):
+                lines.append(f"## {index}. {section['title']}")
+                lines.extend(
+                    f"### {index}.{sub_index} {subsection}"
+                    for sub_index, subsection in enumerate(section["subsections"], start=1)
+                )
+            return "\n".join(lines)
+        return json.dumps(outline, indent=2)
+
+    def _section(self, rng: random.Random, user_prompt: str) -> str:
+        title_match = _CURRENT_SECTION_PATTERN.search(user_prompt)
+        keywords = title_match.group("title").split() if title_match else []
+        block_match = _SUBSECTIONS_PATTERN.search(user_prompt)
+        labels = [
+            line.strip()
+            for line in (block_match.group("block") if block_match else "").splitlines()
+            if line.strip() and line.strip() != "(none)"
+        ]
+        if not labels:
+            return self._paragraphs(rng, keywords)
+        return "\n\n".join(f"{label}\n{self._paragraphs(rng, keywords)}" for label in labels)
+
+    def _edited_section(self, rng: random.Random, user_prompt: str) -> str:
+        body = user_prompt.split(_EDIT_BODY_MARKER, 1)[1].strip()
+        if SECTION_SUMMARY_MARKER in user_prompt.split(_EDIT_BODY_MARKER, 1)[0]:
+            body += f"\n{SECTION_SUMMARY_MARKER} {self._sentence(rng, [])} {self._sentence(rng, [])}"
+        return body
+
+    def _suggestions(self, rng: random.Random, user_prompt: str) -> str:
+        seeds = [match.group("seed") for match in _SEED_LINE_PATTERN.finditer(user_prompt)]
+        titles = [
+            f"{rng.choice(_WORDS).title()} {rng.choice(seeds) if seeds else rng.choice(_WORDS).title()}"
+            for _ in range(8)
+        ]
+        return json.dumps({"suggestions": [{"title": title} for title in titles]})
+
+    def _paragraphs(self, rng: random.Random, keywords: List[str]) -> str:
+        return "\n\n".join(self._paragraph(rng, keywords) for _ in range(self.paragraphs))
+
+    def _paragraph(self, rng: random.Random, keywords: List[str]) -> str:
+        sentences: List[str] = []
+        words = 0
+        while words < self.paragraph_words:
+            sentence = self._sentence(rng, keywords)
+            sentences.append(sentence)
+            words += len(sentence.split())
+        return " ".join(sentences)
+
+    @staticmethod
+    def _sentence(rng: random.Random, keywords: List[str]) -> str:
+        pool = _WORDS + [word.strip(":.,").lower() for word in keywords if len(word) > 3]
+        words = [rng.choice(pool) for _ in range(rng.randint(8, 16))]
+        return " ".join(words).capitalize() + "."
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, math.ceil(len(text) / _CHARS_PER_TOKEN)) if text else 0
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List
+import re
+from typing import List, Optional, Tuple
 
 _SUMMARY_KEYWORDS = (
     "summary",
@@ -13,6 +14,16 @@ _SUMMARY_KEYWORDS = (
     "executive summary",
 )
 
+SECTION_SUMMARY_MARKER = "SECTION SUMMARY:"
+_SECTION_SUMMARY_PATTERN = re.compile(
+    rf"^\s*\**{re.escape(SECTION_SUMMARY_MARKER)}\**\s*(?P<summary>.*)$",
+    re.IGNORECASE | re.MULTILINE | re.DOTALL,
+)
+_HEADING_LINE_PATTERN = re.compile(r"^\s*\d+(?:\.\d+)*\s*[:.)-]")
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+_FALLBACK_SUMMARY_SENTENCES = 2
+_FALLBACK_SUMMARY_CHARS = 400
+
 def should_elevate_context(section_title: str, subsection_titles: List[str]) -> bool:
     candidates = [section_title, *subsection_titles]
     return any(
@@ -20,3 +31,28 @@ def should_elevate_context(section_title: str, subsection_titles: List[str]) ->
         and any(keyword in normalized for keyword in _SUMMARY_KEYWORDS)
         for normalized in (candidate.strip().lower() for candidate in candidates)
     )
+
+
+def split_section_summary(text: str) -> Tuple[str, Optional[str]]:
+    """Separate a trailing ``SECTION SUMMARY:`` line from an edited section body."""
+
+    match = _SECTION_SUMMARY_PATTERN.search(text or "")
+    if match is None:
+        return text, None
+    summary = " ".join(match.group("summary").split()) or None
+    return text[: match.start()].rstrip(), summary
+
+
+def extractive_summary(body: str) -> str:
+    """Leading sentences of the prose, used when the editor returned no summary."""
+
+    prose = " ".join(
+        line.strip()
+        for line in (body or "").splitlines()
+        if line.strip() and not _HEADING_LINE_PATTERN.match(line)
+    )
+    sentences = _SENTENCE_PATTERN.split(prose)
+    summary = " ".join(sentences[:_FALLBACK_SUMMARY_SENTENCES]).strip()
+    if len(summary) > _FALLBACK_SUMMARY_CHARS:
+        summary = summary[:_FALLBACK_SUMMARY_CHARS].rsplit(" ", 1)[0] + " …"
+    return summary
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+
+from backend.schemas import GenerateRequest
+
+_TITLE_PUNCTUATION_PATTERN = re.compile(r"[^\w\s]+")
+
+
+def normalize_topic_title(title: str) -> str:
+    """Casefold, drop punctuation and collapse whitespace, keeping word order.
+
+    "Python to Java" and "Java to Python" stay distinct, so this is safe to
+    key cached or reused artifacts on.
+    """
+
+    return " ".join(_TITLE_PUNCTUATION_PATTERN.sub(" ", (title or "").casefold()).split())
+
+
+def generation_settings_key(request: GenerateRequest) -> str:
+    """Fingerprint the request settings, other than the topic, that shape a report's content."""
+
+    fingerprint = {
+        "section_count": request.section_count,
+        "include": sorted(subject.casefold() for subject in request.subject_inclusions),
+        "exclude": sorted(subject.casefold() for subject in request.subject_exclusions),
+        "models": {
+            stage: [spec.model, spec.reasoning_effort] for stage, spec in request.models.items()
+        },
+        "writer_fallback": request.writer_fallback,
+        "stream_outline": request.stream_outline,
+        "context_strategy": request.context_strategy,
+        "context_token_budget": (
+            request.context_token_budget if request.context_strategy == "token_budget" else None
+        ),
+    }
+    encoded = json.dumps(fingerprint, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+__all__ = ["generation_settings_key", "normalize_topic_title"]
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Union
+
+_TRACE_EXPORTER_ENV = "EXPLORER_TRACE_EXPORTER"
+_TRACE_FILE_ENV = "EXPLORER_TRACE_FILE"
+DEFAULT_TRACE_FILE = "data/traces.jsonl"
+DEFAULT_TRACE_QUEUE_SIZE = 10_000
+
+_TRACEPARENT_PATTERN = re.compile(
+    r"^(?P<version>[0-9a-f]{2})-(?P<trace_id>[0-9a-f]{32})-(?P<span_id>[0-9a-f]{16})-(?P<flags>[0-9a-f]{2})$"
+)
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """Parse a W3C ``traceparent`` header; malformed or all-zero ids yield None."""
+
+    match = _TRACEPARENT_PATTERN.match((header or "").strip().lower())
+    if match is None or match.group("version") == "ff":
+        return None
+    trace_id, span_id = match.group("trace_id"), match.group("span_id")
+    if set(trace_id) == {"0"} or set(span_id) == {"0"}:
+        return None
+    return SpanContext(trace_id, span_id, sampled=bool(int(match.group("flags"), 16) & 1))
+
+
+class Span:
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        context: SpanContext,
+        parent_id: Optional[str],
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._tracer = tracer
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_time_ns = time.time_ns()
+        self._start_monotonic = time.perf_counter_ns()
+        self.duration_ns: Optional[int] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    @property
+    def ended(self) -> bool:
+        return self.duration_ns is not None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: Union[BaseException, str]) -> None:
+        self.status = "error"
+        self.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+
+    def end(self) -> None:
+        if self.ended:
+            return
+        self.duration_ns = time.perf_counter_ns() - self._start_monotonic
+        self._tracer._export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "start_time_ns": self.start_time_ns,
+            "duration_ms": None if self.duration_ns is None else self.duration_ns / 1_000_000,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    context: Optional[SpanContext] = None
+    ended = True
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_error(self, error: Union[BaseException, str]) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+AnySpan = Union[Span, _NoopSpan]
+Parent = Union[Span, _NoopSpan, SpanContext, None]
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None:
+        ...
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in memory; intended for tests."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def named(self, name: str) -> List[Span]:
+        return [span for span in self.spans if span.name == name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class FileSpanExporter:
+    """Appends finished spans as JSON lines for offline analysis.
+
+    ``export`` only queues the line; a background thread appends queued spans
+    in batches so span ends never wait on file I/O. Spans beyond ``max_queued``
+    are dropped (and counted) rather than growing memory without bound.
+    """
+
+    def __init__(
+        self, path: Union[str, Path], *, max_queued: int = DEFAULT_TRACE_QUEUE_SIZE
+    ) -> None:
+        self.path = Path(path).expanduser()
+        self.max_queued = max_queued
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._reset_writer()
+        if hasattr(os, "register_at_fork"):
+            # The writer thread does not survive fork; children start their own.
+            os.register_at_fork(after_in_child=self._reset_writer)
+        atexit.register(self.flush)
+
+    def _reset_writer(self) -> None:
+        self._queue: "queue.Queue[Union[str, threading.Event]]" = queue.Queue(self.max_queued)
+        self._writer: Optional[threading.Thread] = None
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until every span queued so far is written; False on timeout."""
+
+        if self._writer is None:
+            return True
+        written = threading.Event()
+        self._queue.put(written)
+        return written.wait(timeout)
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="trace-file-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        spans = self._queue
+        while True:
+            items = [spans.get()]
+            while True:
+                try:
+                    items.append(spans.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [item for item in items if isinstance(item, str)]
+            if lines:
+                try:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with self.path.open("a", encoding="utf-8") as handle:
+                        handle.write("".join(lines))
+                except OSError:
+                    self.dropped += len(lines)
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("explorer_current_span", default=None)
+_USE_CURRENT = object()
+
+
+class Tracer:
+    """Creates spans with explicit or context-propagated parents.
+
+    Async generators must pass ``parent`` explicitly across ``yield`` points;
+    ``activate`` only scopes the current span to a block without yields. With
+    no exporter every span is a shared no-op.
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None) -> None:
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start_span(
+        self,
+        name: str,
+        *,
+        parent: Any = _USE_CURRENT,
+        attributes: Optional[Dict[str, Any]] = None,
+        require_parent: bool = False,
+    ) -> AnySpan:
+        if self.exporter is None:
+            return NOOP_SPAN
+        if parent is _USE_CURRENT:
+            parent = _current_span.get()
+        if isinstance(parent, _NoopSpan):
+            return NOOP_SPAN
+        parent_context = parent.context if isinstance(parent, Span) else parent
+        if parent_context is None and require_parent:
+            return NOOP_SPAN
+        if parent_context is not None and not parent_context.sampled:
+            return NOOP_SPAN
+        trace_id = parent_context.trace_id if parent_context else secrets.token_hex(16)
+        context = SpanContext(trace_id, secrets.token_hex(8))
+        return Span(
+            self,
+            name,
+            context,
+            parent_context.span_id if parent_context else None,
+            attributes,
+        )
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        *,
+        parent: Any = _USE_CURRENT,
+        attributes: Optional[Dict[str, Any]] = None,
+        require_parent: bool = False,
+        activate: bool = True,
+    ) -> Iterator[AnySpan]:
+        span = self.start_span(
+            name, parent=parent, attributes=attributes, require_parent=require_parent
+        )
+        token = _current_span.set(span) if activate and isinstance(span, Span) else None
+        try:
+            yield span
+        except BaseException as exception:
+            span.record_error(exception)
+            raise
+        finally:
+            if token is not None:
+                _current_span.reset(token)
+            span.end()
+
+    def _export(self, span: Span) -> None:
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.export(span)
+        except Exception:
+            # Tracing must never break report generation.
+            pass
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def build_tracer(name: Optional[str] = None) -> Tracer:
+    """Return a tracer for ``name`` (or the env): ``file``, ``memory`` or off."""
+
+    selected = (name or os.environ.get(_TRACE_EXPORTER_ENV, "")).strip().lower()
+    if selected in {"", "off", "none", "0"}:
+        return Tracer()
+    if selected == "memory":
+        return Tracer(InMemorySpanExporter())
+    if selected == "file":
+        return Tracer(FileSpanExporter(os.environ.get(_TRACE_FILE_ENV, DEFAULT_TRACE_FILE)))
+    raise ValueError(f"Unknown trace exporter: {selected!r}")
+
+
+_tracer_override: Optional[Tracer] = None
+
+
+@lru_cache
+def _default_tracer() -> Tracer:
+    return build_tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer_override or _default_tracer()
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Install a process-wide tracer (``None`` restores the env default)."""
+
+    global _tracer_override
+    _tracer_override = tracer
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from backend.utils.metrics import LLM_TOKENS
+from backend.utils.pricing import PriceTable, get_price_table
+
+
+@dataclass
+class TokenUsage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    calls: int = 0
+    cost_cents: Optional[float] = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, other: "TokenUsage") -> None:
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.calls += other.calls
+        if self.cost_cents is None or other.cost_cents is None:
+            self.cost_cents = None
+        else:
+            self.cost_cents += other.cost_cents
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "calls": self.calls,
+            "cost_cents": None if self.cost_cents is None else round(self.cost_cents, 4),
+        }
+
+
+class UsageRecorder:
+    """Aggregate token usage reported by the text client, per pipeline stage.
+
+    ``cost_cents`` becomes None for any stage that used a model missing from
+    the price table, so partial prices are never presented as totals.
+    """
+
+    def __init__(self, price_table: Optional[PriceTable] = None) -> None:
+        self.price_table = price_table or get_price_table()
+        self.stages: Dict[str, TokenUsage] = {}
+
+    def record(
+        self,
+        stage: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        *,
+        price_multiplier: float = 1.0,
+    ) -> None:
+        cost_cents = self.price_table.cost_cents(model, prompt_tokens, completion_tokens)
+        usage = TokenUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            calls=1,
+            cost_cents=None if cost_cents is None else cost_cents * price_multiplier,
+        )
+        self.stages.setdefault(stage, TokenUsage()).add(usage)
+
+    @property
+    def total(self) -> TokenUsage:
+        total = TokenUsage()
+        for usage in self.stages.values():
+            total.add(usage)
+        return total
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            **self.total.as_dict(),
+            "stages": {stage: usage.as_dict() for stage, usage in self.stages.items()},
+        }
+
+
+_active_recorder: ContextVar[Optional[Tuple[UsageRecorder, str]]] = ContextVar(
+    "explorer_usage_recorder", default=None
+)
+
+
+@contextmanager
+def recording_usage(recorder: UsageRecorder, stage: str) -> Iterator[None]:
+    """Attribute LLM calls made inside the block (in this task) to ``stage``."""
+
+    token = _active_recorder.set((recorder, stage))
+    try:
+        yield
+    finally:
+        _active_recorder.reset(token)
+
+
+def record_token_usage(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    *,
+    price_multiplier: float = 1.0,
+) -> None:
+    """Record one call's tokens; ``price_multiplier`` scales its list-price cost (batch discounts)."""
+
+    active = _active_recorder.get()
+    if active is None:
+        return
+    recorder, stage = active
+    recorder.record(
+        stage, model, prompt_tokens, completion_tokens, price_multiplier=price_multiplier
+    )
+    LLM_TOKENS.labels(model=model, stage=stage, kind="prompt").inc(prompt_tokens)
+    LLM_TOKENS.labels(model=model, stage=stage, kind="completion").inc(completion_tokens)
+
+
+def record_response_usage(model: str, response: Any) -> None:
+    """Record the ``usage`` block of a Chat Completions or Responses API result."""
+
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    if prompt_tokens is None:
+        prompt_tokens = getattr(usage, "input_tokens", 0)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if completion_tokens is None:
+        completion_tokens = getattr(usage, "output_tokens", 0)
+    record_token_usage(model, int(prompt_tokens or 0), int(completion_tokens or 0))
@@ -0,0 +1 @@
+"""Offline benchmark suites; run modules with ``python -m benchmarks.<name>``."""
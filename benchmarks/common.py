@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile; None for an empty sample."""
+
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    return {
+        "p50": _round(percentile(values, 0.50)),
+        "p95": _round(percentile(values, 0.95)),
+        "p99": _round(percentile(values, 0.99)),
+        "max": _round(max(values) if values else None),
+        "mean": _round(sum(values) / len(values) if values else None),
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 4)
+
+
+class LoopLagSampler:
+    """Measures event-loop lag as the overshoot of a periodic ``asyncio.sleep``."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def __aenter__(self) -> "LoopLagSampler":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(time.perf_counter() - started - self.interval, 0.0))
+
+
+def environment_metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=False,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit or None,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+    }
+
+
+def write_results(suite: str, payload: Dict[str, Any], output: Optional[Path] = None) -> Path:
+    """Write ``payload`` plus environment metadata as JSON and return the path."""
+
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = RESULTS_DIR / f"{suite}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    document = {"suite": suite, "environment": environment_metadata(), **payload}
+    output.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    return output
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    metrics: Dict[str, str],
+    *,
+    tolerance: float = 0.10,
+) -> List[str]:
+    """Describe cases whose metrics regressed by more than ``tolerance``.
+
+    ``metrics`` maps a dotted metric path to ``"lower"`` or ``"higher"``
+    (which direction is better). Cases are matched on their ``case`` key.
+    """
+
+    baseline_cases = {json.dumps(item["case"], sort_keys=True): item for item in baseline["results"]}
+    regressions: List[str] = []
+    for item in current["results"]:
+        key = json.dumps(item["case"], sort_keys=True)
+        previous = baseline_cases.get(key)
+        if previous is None:
+            continue
+        for path, better in metrics.items():
+            old, new = _lookup(previous, path), _lookup(item, path)
+            if old in (None, 0) or new is None:
+                continue
+            change = (new - old) / abs(old)
+            if (better == "lower" and change > tolerance) or (better == "higher" and change < -tolerance):
+                regressions.append(f"{key} {path}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def _lookup(item: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = item
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value if isinstance(value, (int, float)) else None
+
+
+def print_table(rows: List[Dict[str, Any]], columns: Sequence[str]) -> None:
+    widths = {column: max(len(column), *(len(str(row.get(column, ""))) for row in rows)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(str(row.get(column, "")).ljust(widths[column]) for column in columns))
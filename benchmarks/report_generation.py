@@ -0,0 +1,351 @@
+"""End-to-end report generation benchmark against the simulated LLM backend.
+
+Runs batches of reports through ``ReportGeneratorService.stream_report`` (or
+the ``/generate_report`` endpoint) across a grid of concurrency levels,
+section counts and storage modes, then records throughput, time to first
+event, time to first completed section, completion-time percentiles,
+event-loop lag and error counts as JSON for regression comparison.
+
+Examples:
+    python -m benchmarks.report_generation --concurrency 1,8 --sections 3 --storage none,db
+    python -m benchmarks.report_generation --mode http --latency lognormal:median=0.2,sigma=0.5
+    python -m benchmarks.report_generation --compare benchmarks/results/baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import socket
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from benchmarks.common import (
+    LoopLagSampler,
+    compare_results,
+    print_table,
+    summarize,
+    write_results,
+)
+
+SUITE = "report_generation"
+STORAGE_MODES = ("none", "file", "db")
+REGRESSION_METRICS = {
+    "reports_per_minute": "higher",
+    "completion_seconds.p50": "lower",
+    "completion_seconds.p95": "lower",
+    "first_event_seconds.p95": "lower",
+    "first_section_seconds.p95": "lower",
+}
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    concurrency: int
+    sections: int
+    storage: str
+    mode: str = "service"
+
+
+@dataclass
+class ReportSample:
+    first_event: Optional[float] = None
+    first_section: Optional[float] = None
+    completed: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class CaseResult:
+    case: Dict[str, Any]
+    reports: int
+    errors: int
+    wall_seconds: float
+    reports_per_minute: float
+    first_event_seconds: Dict[str, Optional[float]]
+    first_section_seconds: Dict[str, Optional[float]]
+    completion_seconds: Dict[str, Optional[float]]
+    loop_lag_seconds: Dict[str, Optional[float]]
+    error_messages: List[str] = field(default_factory=list)
+
+
+def _parse_int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _parse_storage_list(value: str) -> List[str]:
+    modes = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = sorted(set(modes) - set(STORAGE_MODES))
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown storage modes: {', '.join(unknown)}")
+    return modes
+
+
+def _build_text_client(args: argparse.Namespace) -> Any:
+    from backend.utils.simulated_client import SimulatedTextClient, parse_latency
+
+    return SimulatedTextClient(
+        seed=args.seed,
+        latency=parse_latency(args.latency),
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        paragraph_words=args.paragraph_words,
+    )
+
+
+@contextlib.contextmanager
+def _report_store(storage: str, workdir: Path):
+    from backend.db import Base, create_engine_from_url, create_session_factory
+    from backend.storage import DatabaseReportStore, FilesystemReportStore
+
+    if storage == "none":
+        yield None
+    elif storage == "file":
+        yield FilesystemReportStore(base_dir=workdir / "reports")
+    else:
+        engine = create_engine_from_url(f"sqlite+pysqlite:///{workdir / 'bench.db'}")
+        Base.metadata.create_all(engine)
+        try:
+            yield DatabaseReportStore(
+                base_dir=workdir / "reports", session_factory=create_session_factory(engine)
+            )
+        finally:
+            engine.dispose()
+
+
+def build_service(args: argparse.Namespace, report_store: Any) -> Any:
+    from backend.services.report_service import ReportGeneratorService
+
+    return ReportGeneratorService(text_client=_build_text_client(args), report_store=report_store)
+
+
+def _request_payload(case: BenchmarkCase, index: int) -> Dict[str, Any]:
+    return {
+        "topic": f"Benchmark topic {index}",
+        "mode": "generate_report",
+        "sections": case.sections,
+        "reuse": "off",
+    }
+
+
+async def _service_events(service: Any, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    from backend.schemas import GenerateRequest
+
+    async for event in service.stream_report(GenerateRequest.model_validate(payload)):
+        yield event
+
+
+async def _http_events(client: Any, url: str, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    async with client.stream("POST", url, json=payload) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.strip():
+                yield json.loads(line)
+
+
+async def _measure(events: AsyncIterator[Dict[str, Any]]) -> ReportSample:
+    sample = ReportSample()
+    started = time.perf_counter()
+    try:
+        async for event in events:
+            elapsed = time.perf_counter() - started
+            if sample.first_event is None:
+                sample.first_event = elapsed
+            status = event.get("status")
+            if status == "section_complete" and sample.first_section is None:
+                sample.first_section = elapsed
+            elif status == "complete":
+                sample.completed = elapsed
+            elif status == "error":
+                sample.error = str(event.get("detail", "error"))
+    except Exception as exception:
+        sample.error = f"{type(exception).__name__}: {exception}"
+    if sample.completed is None and sample.error is None:
+        sample.error = "stream ended without a complete event"
+    return sample
+
+
+async def _run_batch(case: BenchmarkCase, reports: int, stream_factory: Any) -> CaseResult:
+    semaphore = asyncio.Semaphore(case.concurrency)
+
+    async def one(index: int) -> ReportSample:
+        async with semaphore:
+            return await _measure(stream_factory(_request_payload(case, index)))
+
+    async with LoopLagSampler() as lag:
+        started = time.perf_counter()
+        samples = await asyncio.gather(*(one(index) for index in range(reports)))
+        wall = time.perf_counter() - started
+
+    completed = [sample for sample in samples if sample.error is None]
+    errors = [sample.error for sample in samples if sample.error is not None]
+    return CaseResult(
+        case=asdict(case),
+        reports=reports,
+        errors=len(errors),
+        wall_seconds=round(wall, 4),
+        reports_per_minute=round(len(completed) / wall * 60, 2) if wall > 0 else 0.0,
+        first_event_seconds=summarize([s.first_event for s in samples if s.first_event is not None]),
+        first_section_seconds=summarize(
+            [s.first_section for s in samples if s.first_section is not None]
+        ),
+        completion_seconds=summarize([s.completed for s in completed if s.completed is not None]),
+        loop_lag_seconds=summarize(lag.samples),
+        error_messages=sorted(set(errors))[:5],
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def _serve_app(service: Any) -> AsyncIterator[str]:
+    """Serve the API in-process with ``service`` injected; yields the base URL.
+
+    A real socket is used because the ASGI test transport buffers streamed
+    responses, which would hide time-to-first-event.
+    """
+
+    import uvicorn
+
+    from backend.api import app, get_report_service
+
+    port = _free_port()
+    app.dependency_overrides[get_report_service] = lambda: service
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+    )
+    task = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            if task.done():
+                task.result()
+            await asyncio.sleep(0.01)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await task
+        app.dependency_overrides.pop(get_report_service, None)
+
+
+async def run_case(case: BenchmarkCase, args: argparse.Namespace) -> CaseResult:
+    with tempfile.TemporaryDirectory(prefix="explorer-bench-") as tmp, _report_store(
+        case.storage, Path(tmp)
+    ) as store:
+        if case.mode == "service":
+            service = build_service(args, store)
+            return await _run_batch(
+                case, args.reports, lambda payload: _service_events(service, payload)
+            )
+
+        import httpx
+
+        async with contextlib.AsyncExitStack() as stack:
+            base_url = args.url or await stack.enter_async_context(
+                _serve_app(build_service(args, store))
+            )
+            limits = httpx.Limits(max_connections=case.concurrency)
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(timeout=args.timeout, limits=limits)
+            )
+            url = f"{base_url.rstrip('/')}/generate_report"
+            return await _run_batch(case, args.reports, lambda payload: _http_events(client, url, payload))
+
+
+def iter_cases(args: argparse.Namespace) -> List[BenchmarkCase]:
+    storages = ["external"] if args.url else args.storage
+    return [
+        BenchmarkCase(concurrency=concurrency, sections=sections, storage=storage, mode=args.mode)
+        for concurrency, sections, storage in itertools.product(
+            args.concurrency, args.sections, storages
+        )
+    ]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("service", "http"), default="service")
+    parser.add_argument("--url", help="Benchmark an already running server (implies --mode http).")
+    parser.add_argument("--concurrency", type=_parse_int_list, default=[1, 4, 16])
+    parser.add_argument("--sections", type=_parse_int_list, default=[3, 8])
+    parser.add_argument("--storage", type=_parse_storage_list, default=list(STORAGE_MODES))
+    parser.add_argument("--reports", type=int, default=32, help="Reports per case.")
+    parser.add_argument("--latency", default="lognormal:median=0.05,sigma=0.5", help="Simulated latency spec.")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--paragraph-words", type=int, default=80)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=300.0, help="HTTP timeout in seconds.")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/).")
+    parser.add_argument("--compare", type=Path, help="Baseline results file to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed regression fraction.")
+    return parser
+
+
+async def run(args: argparse.Namespace) -> List[CaseResult]:
+    results = []
+    for case in iter_cases(args):
+        result = await run_case(case, args)
+        results.append(result)
+        print(
+            f"{case}: {result.reports_per_minute} reports/min, "
+            f"p95 {result.completion_seconds['p95']}s, errors {result.errors}",
+            file=sys.stderr,
+        )
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.url:
+        args.mode = "http"
+    results = asyncio.run(run(args))
+    parameters = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in {"output", "compare", "tolerance"}
+    }
+    payload = {"parameters": parameters, "results": [asdict(result) for result in results]}
+    path = write_results(SUITE, json.loads(json.dumps(payload, default=str)), args.output)
+    print_table(
+        [
+            {
+                **result.case,
+                "reports/min": result.reports_per_minute,
+                "first_event_p50": result.first_event_seconds["p50"],
+                "first_section_p50": result.first_section_seconds["p50"],
+                "p50": result.completion_seconds["p50"],
+                "p95": result.completion_seconds["p95"],
+                "p99": result.completion_seconds["p99"],
+                "lag_p99": result.loop_lag_seconds["p99"],
+                "errors": result.errors,
+            }
+            for result in results
+        ],
+        ["mode", "storage", "concurrency", "sections", "reports/min", "first_event_p50",
+         "first_section_p50", "p50", "p95", "p99", "lag_p99", "errors"],
+    )
+    print(f"Results written to {path}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare_results(
+            baseline, json.loads(path.read_text(encoding="utf-8")), REGRESSION_METRICS,
+            tolerance=args.tolerance,
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,299 @@
+"""Storage and query micro-benchmarks on synthetic databases.
+
+Seeds a database with N completed reports (spread across many users, with
+one "heavy" user owning ``--user-reports`` of them) and times the hot
+persistence paths at that scale:
+
+- ``DatabaseReportStore.prepare_report`` / ``finalize_report``
+- ``FilesystemReportStore.prepare_report`` / ``finalize_report``
+- ``list_user_reports`` + ``build_report_response`` for the heavy user
+- ``get_or_create_saved_topic`` when the slug collides ``--slug-collisions`` times
+- ``ensure_lightweight_schema`` on a current schema and, on SQLite, after
+  a column drift that forces the reports table to be rebuilt
+
+SQLite runs on a temporary file; pass ``--postgres-url`` to repeat every
+size against a local Postgres (its tables are dropped and recreated).
+
+Examples:
+    python -m benchmarks.storage --sizes 1000,10000
+    python -m benchmarks.storage --sizes 1000000 --iterations 5
+    python -m benchmarks.storage --postgres-url postgresql+psycopg://localhost/explorer_bench
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from backend.db import (
+    Base,
+    Report,
+    ReportStatus,
+    SavedTopic,
+    User,
+    create_engine_from_url,
+    create_session_factory,
+    session_scope,
+)
+from backend.db.schema_migrations import ensure_lightweight_schema
+from backend.schemas import GenerateRequest, Outline, Section
+from backend.storage import DatabaseReportStore, FilesystemReportStore
+from backend.utils.api_helpers import build_report_response, get_user_by_email, list_user_reports
+from backend.utils.saved_topics import get_or_create_saved_topic
+from benchmarks.common import compare_results, print_table, summarize, write_results
+
+SUITE = "storage"
+HEAVY_USER_EMAIL = "heavy@bench.example"
+COLLIDING_TITLE = "Benchmark Topic"
+REPORTS_PER_FILLER_USER = 100
+_INSERT_BATCH = 10_000
+REGRESSION_METRICS = {
+    f"operations.{name}.p50": "lower"
+    for name in (
+        "db_prepare_report",
+        "db_finalize_report",
+        "fs_prepare_report",
+        "fs_finalize_report",
+        "list_user_reports",
+        "slug_probe",
+        "ensure_schema_noop",
+    )
+}
+
+_OUTLINE = Outline(
+    report_title="Benchmark Report",
+    sections=[
+        Section(title=f"Section {index}", subsections=[f"Point {index}.{sub}" for sub in range(1, 4)])
+        for index in range(1, 6)
+    ],
+)
+_OUTLINE_PAYLOAD = _OUTLINE.model_dump()
+_REPORT_MARKDOWN = "\n\n".join(
+    f"## {section.title}\n\n" + "\n\n".join(f"### {sub}\n\n" + "Lorem ipsum. " * 60 for sub in section.subsections)
+    for section in _OUTLINE.sections
+)
+_WRITTEN_SECTIONS = [{"title": section.title, "body": "Lorem ipsum. " * 180} for section in _OUTLINE.sections]
+
+
+def _timed(operation: Callable[[int], Any], iterations: int) -> Dict[str, Optional[float]]:
+    durations = []
+    for index in range(iterations):
+        started = time.perf_counter()
+        operation(index)
+        durations.append(time.perf_counter() - started)
+    return summarize(durations)
+
+
+def seed_database(
+    engine: Engine,
+    size: int,
+    *,
+    user_reports: int,
+    slug_collisions: int,
+) -> None:
+    """Bulk insert ``size`` completed reports, one saved topic each."""
+
+    now = datetime.now(timezone.utc)
+    heavy_id = uuid.uuid4()
+    filler_count = max((size - user_reports) // REPORTS_PER_FILLER_USER, 1)
+    users = [{"id": heavy_id, "email": HEAVY_USER_EMAIL, "profile": {}, "usage_counters": {}}]
+    users += [
+        {"id": uuid.uuid4(), "email": f"user{index}@bench.example", "profile": {}, "usage_counters": {}}
+        for index in range(filler_count)
+    ]
+    collision_topics = [
+        {
+            "id": uuid.uuid4(),
+            "slug": "benchmark-topic" if attempt == 0 else f"benchmark-topic-{attempt}",
+            "title": f"{COLLIDING_TITLE} (variant {attempt})",
+            "owner_user_id": users[1 + attempt % filler_count]["id"],
+        }
+        for attempt in range(slug_collisions)
+    ]
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), users)
+        if collision_topics:
+            conn.execute(SavedTopic.__table__.insert(), collision_topics)
+        for start in range(0, size, _INSERT_BATCH):
+            topics, reports = [], []
+            for index in range(start, min(start + _INSERT_BATCH, size)):
+                owner = heavy_id if index < user_reports else users[1 + index % filler_count]["id"]
+                topic_id = uuid.uuid4()
+                created = now - timedelta(seconds=size - index)
+                topics.append(
+                    {
+                        "id": topic_id,
+                        "slug": f"seeded-topic-{index}",
+                        "title": f"Seeded topic {index}",
+                        "owner_user_id": owner,
+                    }
+                )
+                reports.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "saved_topic_id": topic_id,
+                        "owner_user_id": owner,
+                        "outline_snapshot": _OUTLINE_PAYLOAD,
+                        "status": ReportStatus.COMPLETE,
+                        "summary": f"Summary of seeded topic {index}.",
+                        "sections": {"outline": _OUTLINE_PAYLOAD, "written": []},
+                        "content_uri": f"seeded/{index}/report.md",
+                        "model_versions": {},
+                        "quality_scores": {},
+                        "source_references": [],
+                        "tags": [],
+                        "created_at": created,
+                        "updated_at": created,
+                        "generated_completed_at": created,
+                    }
+                )
+            conn.execute(SavedTopic.__table__.insert(), topics)
+            conn.execute(Report.__table__.insert(), reports)
+
+
+def _bench_request(index: int) -> GenerateRequest:
+    return GenerateRequest.model_validate(
+        {
+            "topic": f"Benchmark prepare {index}",
+            "mode": "generate_report",
+            "user_email": HEAVY_USER_EMAIL,
+            "username": "heavy",
+        }
+    )
+
+
+def _bench_store(store: Any, iterations: int, prefix: str) -> Dict[str, Dict[str, Optional[float]]]:
+    handles: List[Any] = []
+    prepare = _timed(lambda index: handles.append(store.prepare_report(_bench_request(index), _OUTLINE)), iterations)
+    finalize = _timed(
+        lambda index: store.finalize_report(handles[index], _REPORT_MARKDOWN, _WRITTEN_SECTIONS, "Summary."),
+        iterations,
+    )
+    return {f"{prefix}_prepare_report": prepare, f"{prefix}_finalize_report": finalize}
+
+
+def run_size(url: str, size: int, workdir: Path, args: argparse.Namespace) -> Dict[str, Any]:
+    engine = create_engine_from_url(url)
+    try:
+        if engine.dialect.name != "sqlite":
+            Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        started = time.perf_counter()
+        seed_database(
+            engine,
+            size,
+            user_reports=min(args.user_reports, size),
+            slug_collisions=args.slug_collisions,
+        )
+        seed_seconds = time.perf_counter() - started
+        session_factory = create_session_factory(engine)
+        reports_dir = workdir / "reports"
+        iterations = args.iterations
+        operations: Dict[str, Dict[str, Optional[float]]] = {}
+
+        store = DatabaseReportStore(base_dir=reports_dir, session_factory=session_factory)
+        operations.update(_bench_store(store, iterations, "db"))
+        operations.update(_bench_store(FilesystemReportStore(base_dir=workdir / "files"), iterations, "fs"))
+
+        def list_reports(_: int) -> None:
+            with session_scope(session_factory) as session:
+                user = get_user_by_email(session, HEAVY_USER_EMAIL)
+                for report in list_user_reports(session, user.id):
+                    build_report_response(report, reports_dir, include_content=False)
+
+        operations["list_user_reports"] = _timed(list_reports, iterations)
+
+        def probe_slug(_: int) -> None:
+            with session_factory() as session:
+                user = get_user_by_email(session, HEAVY_USER_EMAIL)
+                get_or_create_saved_topic(session, user, COLLIDING_TITLE)
+                session.rollback()
+
+        operations["slug_probe"] = _timed(probe_slug, iterations)
+        operations["ensure_schema_noop"] = _timed(lambda _: ensure_lightweight_schema(engine), iterations)
+        if engine.dialect.name == "sqlite":
+            with engine.begin() as conn:
+                conn.execute(text('ALTER TABLE "reports" DROP COLUMN "last_accessed_at"'))
+            operations["ensure_schema_rebuild"] = _timed(lambda _: ensure_lightweight_schema(engine), 1)
+
+        return {
+            "case": {"backend": engine.dialect.name, "reports": size},
+            "seed_seconds": round(seed_seconds, 3),
+            "heavy_user_reports": min(args.user_reports, size),
+            "operations": operations,
+        }
+    finally:
+        engine.dispose()
+
+
+def _backend_slug(url: str) -> str:
+    return url.split(":", 1)[0].split("+", 1)[0]
+
+
+def _parse_sizes(value: str) -> List[int]:
+    return [int(float(item)) for item in value.split(",") if item.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=_parse_sizes, default=[1_000, 10_000, 100_000], help="Report counts, e.g. 1e3,1e6.")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed repetitions per operation.")
+    parser.add_argument("--user-reports", type=int, default=1_000, help="Reports owned by the listed user.")
+    parser.add_argument("--slug-collisions", type=int, default=50, help="Existing slugs the probe must skip.")
+    parser.add_argument("--postgres-url", help="Also benchmark against this (disposable) Postgres database.")
+    parser.add_argument("--skip-sqlite", action="store_true")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/).")
+    parser.add_argument("--compare", type=Path, help="Baseline results file to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression fraction.")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory(prefix="explorer-bench-") as tmp:
+            workdir = Path(tmp)
+            urls = [] if args.skip_sqlite else [f"sqlite+pysqlite:///{workdir / 'bench.db'}"]
+            if args.postgres_url:
+                urls.append(args.postgres_url)
+            for url in urls:
+                result = run_size(url, size, workdir / _backend_slug(url), args)
+                results.append(result)
+                print(f"{result['case']}: seeded in {result['seed_seconds']}s", file=sys.stderr)
+
+    payload = {
+        "parameters": {key: value for key, value in vars(args).items() if key not in {"output", "compare", "postgres_url"}},
+        "results": results,
+    }
+    path = write_results(SUITE, json.loads(json.dumps(payload, default=str)), args.output)
+    rows = [
+        {**result["case"], "operation": name, **{key: stats[key] for key in ("p50", "p95", "max")}}
+        for result in results
+        for name, stats in result["operations"].items()
+    ]
+    print_table(rows, ["backend", "reports", "operation", "p50", "p95", "max"])
+    print(f"Results written to {path}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare_results(
+            baseline, json.loads(path.read_text(encoding="utf-8")), REGRESSION_METRICS,
+            tolerance=args.tolerance,
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,9 +3,14 @@
 from __future__ import annotations
 
 import argparse
+import csv
 import json
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, TextIO
 
@@ -56,6 +61,14 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Print each streamed event to stdout as it arrives.",
     )
+    parser.add_argument(
+        "--delivery",
+        choices=("inline", "chunked", "reference"),
+        help=(
+            "How the server sends the finished report: in the complete event, as report_chunk "
+            "events, or as a stored report id fetched afterwards."
+        ),
+    )
     parser.add_argument(
         "--section-count",
         "--sections",
@@ -83,6 +96,56 @@ def parse_args() -> argparse.Namespace:
         "--username",
         help="Username to store for the user when --user-email is provided (required whenever a user email is supplied).",
     )
+    parser.add_argument(
+        "--batch-manifest",
+        type=Path,
+        help=(
+            "Generate every entry of a JSONL or CSV manifest. Each entry provides a topic "
+            "or a payload_file (relative paths resolve against the manifest)."
+        ),
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Reports generated at the same time in batch mode (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--outdir",
+        type=Path,
+        default=None,
+        help="Directory for batch reports. Defaults to cli/generated_reports/.",
+    )
+    parser.add_argument(
+        "--no-skip-existing",
+        dest="skip_existing",
+        action="store_false",
+        help=(
+            "Regenerate batch entries that would otherwise be skipped: entries whose report "
+            "file already exists in --outdir and, with --offline-batch, entries that already "
+            "have a matching stored report. Over HTTP only local files are checked."
+        ),
+    )
+    parser.add_argument(
+        "--offline-batch",
+        choices=("openai", "local"),
+        help=(
+            "Run the batch in-process through provider Batch API jobs instead of the HTTP "
+            "endpoint ('local' answers the batch files with the configured text client)."
+        ),
+    )
+    parser.add_argument(
+        "--batch-workdir",
+        type=Path,
+        default=CLI_DIR / "batch_jobs",
+        help="Where offline batch request/result JSONL files are kept (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between provider batch status polls (default: %(default)s).",
+    )
     return parser.parse_args()
 
 
@@ -96,9 +159,8 @@ def _safe_topic_stem(topic: str) -> str:
     return "report"
 
 
-def _default_report_outfile(topic: str) -> Path:
+def _default_report_outfile(topic: str, base_dir: Path = GENERATED_REPORTS_DIR) -> Path:
     stem = _safe_topic_stem(topic)
-    base_dir = GENERATED_REPORTS_DIR
     return base_dir / f"{stem} report.md"
 
 
@@ -141,8 +203,11 @@ def _apply_generation_options(
     section_count: int | None,
     subject_inclusions: Optional[List[str]],
     subject_exclusions: Optional[List[str]],
+    delivery: Optional[str] = None,
 ) -> Dict[str, Any]:
     merged_payload = dict(payload)
+    if delivery is not None:
+        merged_payload["delivery"] = delivery
     if section_count is not None:
         merged_payload["section_count"] = section_count
     if subject_inclusions:
@@ -181,28 +246,40 @@ def load_payload(
     subject_exclusions: Optional[List[str]] = None,
     user_email: Optional[str] = None,
     username: Optional[str] = None,
+    delivery: Optional[str] = None,
 ) -> Dict[str, Any]:
     if payload_file is not None:
         data = _load_json_mapping(payload_file)
-        payload = _apply_generation_options(
-            data,
-            section_count,
-            subject_inclusions,
-            subject_exclusions,
-        )
-        payload = _apply_user_metadata(payload, user_email, username)
-        validated = _validate_generate_payload(payload)
-        _enforce_user_metadata_requirements(validated, user_email=user_email)
-        return validated
-
-    if topic is None:
+    elif topic is None:
         raise SystemExit("Provide --topic when --payload-file is omitted.")
-    payload: Dict[str, Any] = {"topic": topic, "mode": "generate_report"}
+    else:
+        data = {"topic": topic, "mode": "generate_report"}
+    return build_payload(
+        data,
+        section_count=section_count,
+        subject_inclusions=subject_inclusions,
+        subject_exclusions=subject_exclusions,
+        user_email=user_email,
+        username=username,
+        delivery=delivery,
+    )
+
+
+def build_payload(
+    data: Dict[str, Any],
+    section_count: int | None = None,
+    subject_inclusions: Optional[List[str]] = None,
+    subject_exclusions: Optional[List[str]] = None,
+    user_email: Optional[str] = None,
+    username: Optional[str] = None,
+    delivery: Optional[str] = None,
+) -> Dict[str, Any]:
     payload = _apply_generation_options(
-        payload,
+        data,
         section_count,
         subject_inclusions,
         subject_exclusions,
+        delivery,
     )
     payload = _apply_user_metadata(payload, user_email, username)
     validated = _validate_generate_payload(payload)
@@ -210,6 +287,217 @@ def load_payload(
     return validated
 
 
+def load_batch_manifest(manifest: Path) -> List[Dict[str, Any]]:
+    """Read manifest entries from a CSV file (header row) or JSONL file."""
+    if not manifest.exists():
+        raise SystemExit(f"Batch manifest '{manifest}' does not exist.")
+    text = manifest.read_text(encoding="utf-8")
+    if manifest.suffix.lower() == ".csv":
+        rows = csv.DictReader(text.splitlines())
+        entries = [
+            {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+            for row in rows
+        ]
+    else:
+        entries = []
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise SystemExit(
+                    f"Manifest line {line_number} must contain valid JSON: {exc}"
+                ) from exc
+            if isinstance(entry, str):
+                entry = {"topic": entry}
+            if not isinstance(entry, dict):
+                raise SystemExit(
+                    f"Manifest line {line_number} must be a topic string or JSON object."
+                )
+            entries.append(entry)
+    return [entry for entry in entries if entry]
+
+
+def _manifest_entry_payload(
+    entry: Dict[str, Any],
+    manifest_dir: Path,
+    args: argparse.Namespace,
+    subject_inclusions: List[str],
+    subject_exclusions: List[str],
+) -> Dict[str, Any]:
+    data = dict(entry)
+    payload_file = data.pop("payload_file", None)
+    if payload_file:
+        path = Path(payload_file)
+        data = {**_load_json_mapping(path if path.is_absolute() else manifest_dir / path), **data}
+    elif "outline" not in data:
+        data.setdefault("mode", "generate_report")
+    # Batch entries should yield to interactive users in the generation scheduler.
+    data.setdefault("priority", "batch")
+    if isinstance(data.get("section_count"), str):
+        try:
+            data["section_count"] = int(data["section_count"])
+        except ValueError as exc:
+            raise SystemExit(f"Invalid section_count in manifest entry: {entry}") from exc
+    return build_payload(
+        data,
+        section_count=args.section_count,
+        subject_inclusions=subject_inclusions,
+        subject_exclusions=subject_exclusions,
+        user_email=args.user_email,
+        username=args.username,
+        delivery=args.delivery,
+    )
+
+
+@dataclass
+class BatchSummary:
+    completed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    durations: List[float] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"Batch finished in {self.elapsed:.1f}s: {self.completed} completed, "
+            f"{self.skipped} skipped, {self.failed} failed."
+        ]
+        if self.completed and self.elapsed > 0:
+            lines.append(f"Throughput: {self.completed * 60 / self.elapsed:.2f} reports/minute.")
+        if self.durations:
+            ordered = sorted(self.durations)
+            p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+            lines.append(
+                f"Per-report time: mean {sum(ordered) / len(ordered):.1f}s, p95 {p95:.1f}s."
+            )
+        return "\n".join(lines)
+
+
+def run_batch(
+    url: str,
+    payloads: List[Dict[str, Any]],
+    outdir: Path,
+    *,
+    concurrency: int,
+    skip_existing: bool,
+    show_progress: bool,
+) -> BatchSummary:
+    summary = BatchSummary()
+    print_lock = threading.Lock()
+    started_at = time.monotonic()
+
+    def generate(payload: Dict[str, Any]) -> tuple[str, Path, Optional[float], Optional[str]]:
+        topic = _infer_topic(payload) or "report"
+        outfile = _default_report_outfile(topic, outdir)
+        if skip_existing and outfile.exists():
+            return "skipped", outfile, None, None
+        item_started = time.monotonic()
+        try:
+            final_event = _stream_report(
+                url, payload, None, show_progress, label=topic, print_lock=print_lock
+            )
+            report = _prepare_final_report(final_event)
+        except (SystemExit, httpx.HTTPError) as exc:
+            return "failed", outfile, None, str(exc)
+        with print_lock:
+            _write_text_file(outfile, report, f"Saved {outfile}")
+        return "complete", outfile, time.monotonic() - item_started, None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(generate, payload) for payload in payloads]
+        for future in as_completed(futures):
+            outcome, outfile, duration, error = future.result()
+            with print_lock:
+                if outcome == "skipped":
+                    summary.skipped += 1
+                    print(f"Skipping {outfile} (already exists).")
+                elif outcome == "failed":
+                    summary.failed += 1
+                    print(f"Failed {outfile.name}: {error}", file=sys.stderr)
+                else:
+                    summary.completed += 1
+                    summary.durations.append(duration or 0.0)
+    summary.elapsed = time.monotonic() - started_at
+    return summary
+
+
+def run_offline_batch(
+    payloads: List[Dict[str, Any]],
+    outdir: Path,
+    *,
+    backend_name: str,
+    workdir: Path,
+    poll_interval: float,
+    skip_existing: bool,
+    show_progress: bool,
+) -> BatchSummary:
+    import asyncio
+
+    from backend.api.dependencies import get_report_matcher, get_report_store
+    from backend.services.batch_service import has_stored_report
+    from backend.services.provider_batch import (
+        LocalBatchBackend,
+        OfflineBatchGenerator,
+        OpenAIBatchBackend,
+    )
+    from backend.utils.openai_client import get_default_text_client
+
+    summary = BatchSummary()
+    report_matcher = get_report_matcher() if skip_existing else None
+    pending: List[tuple[Path, GenerateRequest]] = []
+    for payload in payloads:
+        outfile = _default_report_outfile(_infer_topic(payload) or "report", outdir)
+        # Reports are generated in-process here, so there is no large event to avoid.
+        request = GenerateRequest.model_validate(
+            {**payload, "delivery": "inline", "stream_sections": False}
+        )
+        if skip_existing and outfile.exists():
+            summary.skipped += 1
+            print(f"Skipping {outfile} (already exists).")
+            continue
+        if report_matcher is not None and has_stored_report(report_matcher, request):
+            summary.skipped += 1
+            print(f"Skipping {outfile} (already stored).")
+            continue
+        pending.append((outfile, request))
+    if not pending:
+        return summary
+
+    backend = (
+        OpenAIBatchBackend()
+        if backend_name == "openai"
+        else LocalBatchBackend(get_default_text_client())
+    )
+    generator = OfflineBatchGenerator(
+        backend,
+        workdir=workdir,
+        report_store=get_report_store(),
+        poll_interval=poll_interval,
+    )
+
+    def on_event(index: int, event: Dict[str, Any]) -> None:
+        outfile = pending[index][0]
+        if show_progress:
+            event_for_display = {k: v for k, v in event.items() if k != "report"}
+            _print_progress(json.dumps(event_for_display), outfile.stem, None)
+        if event.get("status") == "complete":
+            _write_text_file(outfile, event.get("report") or "", f"Saved {outfile}")
+
+    requests = [request for _, request in pending]
+    finals = asyncio.run(generator.generate(requests, on_event=on_event))
+    for (outfile, _), final_event in zip(pending, finals):
+        if final_event.get("status") == "complete":
+            summary.completed += 1
+        else:
+            summary.failed += 1
+            print(f"Failed {outfile.name}: {final_event.get('detail')}", file=sys.stderr)
+    summary.elapsed = generator.elapsed_seconds
+    print(f"Submitted {len(generator.text_client.batch_ids)} provider batch jobs.")
+    return summary
+
+
 def _enforce_user_metadata_requirements(
     payload: Dict[str, Any],
     *,
@@ -255,12 +543,28 @@ def _write_text_file(path: Path, contents: str, message: str, show_message: bool
         print(message)
 
 
+def _print_progress(
+    message: str, label: str | None, print_lock: threading.Lock | None
+) -> None:
+    if label:
+        message = f"[{label}] {message}"
+    if print_lock is None:
+        print(message)
+        return
+    with print_lock:
+        print(message)
+
+
 def _collect_stream_events(
     response: httpx.Response,
     raw_stream_handle: TextIO | None,
     show_progress: bool,
+    label: str | None = None,
+    print_lock: threading.Lock | None = None,
 ) -> Dict[str, Any]:
     final_event: Dict[str, Any] | None = None
+    report_chunks: List[str] = []
+    section_texts: List[str] = []
     for line in response.iter_lines():
         if line is None:
             continue
@@ -273,19 +577,68 @@ def _collect_stream_events(
             event = json.loads(line)
         except json.JSONDecodeError:
             if show_progress:
-                print(line)
+                _print_progress(line, label, print_lock)
             continue
+        status = event.get("status")
+        if status == "report_chunk":
+            report_chunks.append(event.get("text", ""))
+        elif status == "section_complete" and "body" in event:
+            section_texts.append(f"{event.get('section', '')}\n\n{event['body']}")
         if show_progress:
-            event_for_display = event
-            if event.get("status") == "complete" and "report" in event:
-                event_for_display = {k: v for k, v in event.items() if k != "report"}
-            print(json.dumps(event_for_display))
-        final_event = event
+            event_for_display = {
+                k: v for k, v in event.items() if k not in _BULKY_EVENT_FIELDS
+            }
+            _print_progress(json.dumps(event_for_display), label, print_lock)
+        if status != "report_chunk":
+            final_event = event
 
     if not final_event:
         raise SystemExit("Stream ended without a JSON payload to write.")
 
-    return final_event
+    return _attach_delivered_report(final_event, report_chunks, section_texts)
+
+
+_BULKY_EVENT_FIELDS = frozenset({"report", "text", "body"})
+
+
+def _attach_delivered_report(
+    final_event: Dict[str, Any], report_chunks: List[str], section_texts: List[str]
+) -> Dict[str, Any]:
+    """Rebuild ``report`` for complete events that moved it out of the event."""
+    if final_event.get("status") != "complete" or "report" in final_event:
+        return final_event
+    delivery = final_event.get("delivery")
+    if delivery == "chunked":
+        if len(report_chunks) != final_event.get("report_chunks"):
+            raise SystemExit(
+                f"Received {len(report_chunks)} report chunks, expected "
+                f"{final_event.get('report_chunks')}."
+            )
+        report = "".join(report_chunks)
+    elif delivery == "sections":
+        report = "\n\n".join([final_event.get("report_title", ""), *section_texts])
+    else:
+        return final_event
+    if len(report) != final_event.get("report_length", len(report)):
+        raise SystemExit("Reassembled report length does not match the complete event.")
+    return {**final_event, "report": report}
+
+
+def _fetch_report_reference(
+    client: httpx.Client, url: str, payload: Dict[str, Any], final_event: Dict[str, Any]
+) -> Dict[str, Any]:
+    report_url = final_event.get("report_url")
+    if final_event.get("status") != "complete" or "report" in final_event or not report_url:
+        return final_event
+    params = {
+        key: payload[key] for key in ("user_email", "username") if payload.get(key)
+    }
+    response = client.get(httpx.URL(url).join(report_url), params=params)
+    response.raise_for_status()
+    content = response.json().get("content")
+    if not isinstance(content, str):
+        return final_event
+    return {**final_event, "report": content.strip()}
 
 
 def _stream_report(
@@ -293,6 +646,8 @@ def _stream_report(
     payload: Dict[str, Any],
     raw_stream: Path | None,
     show_progress: bool,
+    label: str | None = None,
+    print_lock: threading.Lock | None = None,
 ) -> Dict[str, Any]:
     raw_stream_handle: TextIO | None = None
     try:
@@ -303,9 +658,10 @@ def _stream_report(
         with httpx.Client(timeout=None) as client:
             with client.stream("POST", url, json=payload) as response:
                 response.raise_for_status()
-                return _collect_stream_events(
-                    response, raw_stream_handle, show_progress
+                final_event = _collect_stream_events(
+                    response, raw_stream_handle, show_progress, label, print_lock
                 )
+            return _fetch_report_reference(client, url, payload, final_event)
     finally:
         if raw_stream_handle:
             raw_stream_handle.close()
@@ -321,6 +677,9 @@ def main() -> None:
     subject_exclusions = _normalize_subject_args(
         args.subject_exclusions, "--subject-exclusion"
     )
+    if args.batch_manifest is not None:
+        _run_batch_mode(args, subject_inclusions, subject_exclusions)
+        return
     payload = load_payload(
         args.payload_file,
         args.topic,
@@ -329,6 +688,7 @@ def main() -> None:
         subject_exclusions=subject_exclusions,
         user_email=args.user_email,
         username=args.username,
+        delivery=args.delivery,
     )
 
     inferred_topic = _infer_topic(payload)
@@ -350,6 +710,47 @@ def main() -> None:
     _write_text_file(outfile, report, f"Report generation complete. Saved to {outfile}")
 
 
+def _run_batch_mode(
+    args: argparse.Namespace,
+    subject_inclusions: List[str],
+    subject_exclusions: List[str],
+) -> None:
+    if args.concurrency < 1:
+        raise SystemExit("--concurrency must be greater than or equal to 1.")
+    manifest = args.batch_manifest
+    payloads = [
+        _manifest_entry_payload(
+            entry, manifest.parent, args, subject_inclusions, subject_exclusions
+        )
+        for entry in load_batch_manifest(manifest)
+    ]
+    if not payloads:
+        raise SystemExit(f"Batch manifest '{manifest}' does not contain any entries.")
+    outdir = args.outdir or GENERATED_REPORTS_DIR
+    if args.offline_batch:
+        summary = run_offline_batch(
+            payloads,
+            outdir,
+            backend_name=args.offline_batch,
+            workdir=args.batch_workdir,
+            poll_interval=args.poll_interval,
+            skip_existing=args.skip_existing,
+            show_progress=args.show_progress,
+        )
+    else:
+        summary = run_batch(
+            args.url,
+            payloads,
+            outdir,
+            concurrency=args.concurrency,
+            skip_existing=args.skip_existing,
+            show_progress=args.show_progress,
+        )
+    print(summary.format())
+    if summary.failed:
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
     try:
         main()
@@ -1,7 +1,7 @@
 import uuid
 from typing import Any, Dict, List, Optional
 
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 from pydantic import BaseModel, EmailStr, Field
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -18,6 +18,7 @@ from backend.api.dependencies import (
     get_suggestion_service,
 )
 from backend.db import session_scope
+from backend.utils.metrics import CONTENT_TYPE, REGISTRY
 from backend.schemas import GenerateRequest, OutlineRequest, SuggestionsRequest
 from backend.utils.api_helpers import (
     build_report_response,
@@ -72,6 +73,11 @@ async def healthz(_request):
     return JSONResponse({"status": "ok"})
 
 
+@mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+async def metrics(_request):
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @mcp.tool(name="outline.generate", description="Generate an outline from a topic.")
 async def outline_generate(request: OutlineRequest) -> Dict[str, Any]:
     service = get_outline_service()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+
+from backend.db import (
+    Base,
+    Report,
+    ReportStatus,
+    SavedTopic,
+    User,
+    create_engine_from_url,
+    create_session_factory,
+    session_scope,
+)
+from backend.schemas import BatchGenerateRequest, GenerateRequest
+from backend.services.batch_service import BatchReportService
+from backend.services.related_topics import ExistingReportMatcher
+from backend.utils.topic_keys import generation_settings_key, normalize_topic_title
+
+
+def _session_factory():
+    engine = create_engine_from_url("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return create_session_factory(engine)
+
+
+class _FakeReportService:
+    def __init__(self):
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def stream_report(self, request):
+        self.requests.append(request)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield {"status": "started"}
+            await asyncio.sleep(0.01)
+            yield {"status": "complete", "report_title": request.topic, "report": "Body"}
+        finally:
+            self.in_flight -= 1
+
+
+def _item(topic_title, **overrides):
+    return {
+        "topic": topic_title,
+        "mode": "generate_report",
+        "user_email": "batch@example.com",
+        "username": "Batch",
+        **overrides,
+    }
+
+
+def _batch_service(tmp_path, fake_service, stored_item):
+    session_factory = _session_factory()
+    stored_request = GenerateRequest.model_validate(stored_item)
+    with session_scope(session_factory) as session:
+        user = User(email="batch@example.com", full_name="Batch", username="Batch")
+        topic = SavedTopic(slug="solar-power", title=stored_request.topic, owner=user)
+        session.add_all([user, topic])
+        session.flush()
+        session.add(
+            Report(
+                saved_topic=topic,
+                owner=user,
+                status=ReportStatus.COMPLETE,
+                topic_key=normalize_topic_title(stored_request.topic),
+                settings_key=generation_settings_key(stored_request),
+            )
+        )
+    matcher = ExistingReportMatcher(session_factory, base_dir=tmp_path)
+    return BatchReportService(fake_service, report_matcher=matcher)
+
+
+def test_stream_batch_skips_stored_topics_and_limits_concurrency(tmp_path):
+    fake_service = _FakeReportService()
+    batch_service = _batch_service(tmp_path, fake_service, _item("Solar power"))
+    batch_request = BatchGenerateRequest.model_validate(
+        {
+            "concurrency": 2,
+            "requests": [
+                _item(topic_title)
+                for topic_title in ("Solar power", "Wind power", "Tidal power", "Geothermal")
+            ],
+        }
+    )
+
+    async def collect():
+        return [event async for event in batch_service.stream_batch(batch_request)]
+
+    events = asyncio.run(collect())
+
+    assert events[0]["status"] == "batch_started"
+    skipped = [event for event in events if event["status"] == "report_skipped"]
+    assert [event["topic"] for event in skipped] == ["Solar power"]
+    assert sorted(request.topic for request in fake_service.requests) == [
+        "Geothermal",
+        "Tidal power",
+        "Wind power",
+    ]
+    assert {request.priority for request in fake_service.requests} == {"batch"}
+    assert fake_service.peak_in_flight == 2
+    summary = events[-1]
+    assert summary["status"] == "batch_complete"
+    assert (summary["completed"], summary["skipped"], summary["failed"]) == (3, 1, 0)
+
+
+def test_stream_batch_skip_matches_topic_key_and_generation_settings(tmp_path):
+    fake_service = _FakeReportService()
+    batch_service = _batch_service(tmp_path, fake_service, _item("Solar power"))
+    batch_request = BatchGenerateRequest.model_validate(
+        {
+            "requests": [
+                _item("  SOLAR power!"),
+                _item("Power solar"),
+                _item("Solar power", section_count=5),
+            ],
+        }
+    )
+
+    async def collect():
+        return [event async for event in batch_service.stream_batch(batch_request)]
+
+    events = asyncio.run(collect())
+
+    skipped = [event["index"] for event in events if event["status"] == "report_skipped"]
+    assert skipped == [0]
+    assert sorted((request.topic, request.section_count) for request in fake_service.requests) == [
+        ("Power solar", None),
+        ("Solar power", 5),
+    ]
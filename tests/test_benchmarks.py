@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from benchmarks.common import compare_results, percentile
+from benchmarks.report_generation import main
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) is None
+
+
+def test_report_generation_benchmark_writes_comparable_results(tmp_path: Path):
+    output = tmp_path / "results.json"
+
+    exit_code = main(
+        [
+            "--concurrency", "2",
+            "--sections", "2",
+            "--storage", "none,file",
+            "--reports", "3",
+            "--latency", "fixed:0",
+            "--output", str(output),
+        ]
+    )
+
+    assert exit_code == 0
+    document = json.loads(output.read_text(encoding="utf-8"))
+    assert [item["case"]["storage"] for item in document["results"]] == ["none", "file"]
+    for item in document["results"]:
+        assert item["errors"] == 0
+        assert item["reports_per_minute"] > 0
+        assert item["first_section_seconds"]["p50"] <= item["completion_seconds"]["p50"]
+
+    slower = json.loads(json.dumps(document))
+    slower["results"][0]["reports_per_minute"] /= 2
+    regressions = compare_results(document, slower, {"reports_per_minute": "higher"})
+    assert len(regressions) == 1
+
+
+def test_storage_benchmark_covers_every_operation(tmp_path: Path):
+    from benchmarks.storage import main as storage_main
+
+    output = tmp_path / "storage.json"
+
+    assert storage_main(
+        ["--sizes", "200", "--iterations", "2", "--user-reports", "20", "--slug-collisions", "3",
+         "--output", str(output)]
+    ) == 0
+
+    (result,) = json.loads(output.read_text(encoding="utf-8"))["results"]
+    assert result["case"] == {"backend": "sqlite", "reports": 200}
+    assert set(result["operations"]) == {
+        "db_prepare_report",
+        "db_finalize_report",
+        "fs_prepare_report",
+        "fs_finalize_report",
+        "list_user_reports",
+        "slug_probe",
+        "ensure_schema_noop",
+        "ensure_schema_rebuild",
+    }
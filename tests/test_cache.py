@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from backend.utils.cache import TTLCache
+
+
+def test_ttl_cache_marks_stale_entries_and_evicts_least_recently_used():
+    now = [0.0]
+    cache = TTLCache(max_entries=2, ttl=10, stale_ttl=5, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (1, True)
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+
+    now[0] = 12.0
+    assert cache.get("a") == (1, False)
+    now[0] = 16.0
+    assert cache.get("a") is None
+    assert len(cache) == 1
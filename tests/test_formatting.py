@@ -7,7 +7,17 @@ from pathlib import Path
 os.environ.setdefault("OPENAI_API_KEY", "test-key")
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from backend.utils.formatting import parse_outline_json
+import json
+import random
+import re
+
+from backend.utils.formatting import (
+    IncrementalOutlineParser,
+    StreamingHeadingNormalizer,
+    SubsectionHeadingNormalizer,
+    enforce_subsection_headings,
+    parse_outline_json,
+)
 from backend.schemas import Outline
 
 
@@ -38,3 +48,112 @@ def test_parse_outline_json_allows_prefixed_codeblock_noise() -> None:
     assert isinstance(outline, Outline)
     assert outline.report_title == "Topic"
     assert outline.sections == []
+
+
+def test_incremental_outline_parser_emits_sections_for_any_chunking() -> None:
+    payload = {
+        "report_title": "Braces {and} \"quotes\"",
+        "sections": [
+            {"title": "Origins [early]", "subsections": ["A {b}", "C"]},
+            {"title": "Growth", "subsections": []},
+            {"title": "Legacy", "subsections": ["D"]},
+        ],
+    }
+    text = "```json\n" + json.dumps(payload, indent=2) + "\n```"
+    rng = random.Random(7)
+
+    for _ in range(50):
+        parser = IncrementalOutlineParser()
+        emitted = []
+        position = 0
+        while position < len(text):
+            step = rng.randint(1, 12)
+            emitted.extend(section.title for section in parser.feed(text[position : position + step]))
+            position += step
+
+        assert emitted == ["Origins [early]", "Growth", "Legacy"]
+        assert parser.report_title == payload["report_title"]
+        assert parser.finish().sections[0].subsections == ["A {b}", "C"]
+
+
+def _reference_enforce_headings(section_text, subsection_titles):
+    # The original two-pattern implementation, kept as the behavioural spec.
+    hash_heading = re.compile(r"^###\s*")
+    numbered_heading = re.compile(r"^(?:###\s*)?\d+(?:\.\d+)*\s*[:.-]?")
+    result = []
+    cursor = 0
+    for line in section_text.splitlines():
+        stripped = line.lstrip()
+        if cursor < len(subsection_titles) and (
+            hash_heading.match(stripped) or numbered_heading.match(stripped)
+        ):
+            result.append(f"{line[: len(line) - len(stripped)]}{subsection_titles[cursor]}")
+            cursor += 1
+            continue
+        result.append(line)
+    return "\n".join(result)
+
+
+_HEADING_FRAGMENTS = ["### Intro", "1.2: Point", "  ### Indented", "\t3 Tabbed", "Plain prose.", "", "#4 no", "12.5.", "Body 7"]
+
+
+def _random_section_text(rng: random.Random) -> str:
+    separators = ["\n", "\r\n", "\n\n", "\r"]
+    lines = [rng.choice(_HEADING_FRAGMENTS) for _ in range(rng.randint(0, 12))]
+    text = "".join(line + rng.choice(separators) for line in lines)
+    return text if rng.random() < 0.5 else text.rstrip()
+
+
+def test_subsection_heading_normalizer_matches_original_enforcement() -> None:
+    rng = random.Random(11)
+    for _ in range(300):
+        titles = [f"1.{index}: Title {index}" for index in range(1, rng.randint(0, 4) + 1)]
+        text = _random_section_text(rng)
+        normalizer = SubsectionHeadingNormalizer(titles)
+
+        expected = _reference_enforce_headings(text, titles)
+
+        assert normalizer.normalize(text) == expected
+        assert normalizer.normalize(text) == expected  # reusable across passes
+        assert enforce_subsection_headings(text, titles) == expected
+        assert "\n".join(normalizer.normalize_line(line) for line in text.splitlines()) == expected
+
+
+_STREAM_FRAGMENTS = [*_HEADING_FRAGMENTS, "#", "##", "###", " \t ", "\u0663 arabic digit", "## two", "x"]
+_LINE_BREAKS = ["\n", "\r\n", "\r", "\x0b", "\x0c", "\x1c", "\x85", "\u2028"]
+
+
+def _stream(normalizer: StreamingHeadingNormalizer, text: str, rng: random.Random) -> str:
+    output = []
+    position = 0
+    while position < len(text):
+        step = rng.choice([1, 1, 2, 3, rng.randint(1, 40)])
+        output.append(normalizer.feed(text[position : position + step]))
+        position += step
+    output.append(normalizer.finish())
+    return "".join(output)
+
+
+def test_streaming_heading_normalizer_matches_batch_for_any_chunking() -> None:
+    rng = random.Random(23)
+    for _ in range(500):
+        titles = [f"2.{index}: Title {index}" for index in range(1, rng.randint(0, 5) + 1)]
+        pieces = []
+        for _ in range(rng.randint(0, 10)):
+            pieces.append(rng.choice(_STREAM_FRAGMENTS))
+            if rng.random() < 0.85:
+                pieces.append(rng.choice(_LINE_BREAKS))
+        text = "".join(pieces)
+
+        assert _stream(StreamingHeadingNormalizer(titles), text, rng) == enforce_subsection_headings(text, titles)
+
+
+def test_streaming_heading_normalizer_releases_lines_before_their_newline() -> None:
+    normalizer = StreamingHeadingNormalizer(["3.1: Causes"])
+
+    assert normalizer.feed("  ##") == ""
+    assert normalizer.feed("# draft heading") == "  3.1: Causes"
+    assert normalizer.feed(" that runs on\nProse arr") == "\nProse arr"
+    assert normalizer.feed("ives\n### Not replaced") == "ives\n### Not replaced"
+    assert normalizer.finish() == ""
+
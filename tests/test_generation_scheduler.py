@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+
+from backend.schemas import GenerateRequest, Outline, Section
+from backend.services.generation_scheduler import GenerationScheduler
+from backend.services.report_service import ReportGeneratorService, _ReportStreamRunner
+
+
+def _grant_order(scheduler, tickets):
+    order = []
+    pending = list(tickets)
+    while pending:
+        granted = [ticket for ticket in pending if ticket.granted]
+        assert granted, "scheduler stalled"
+        for ticket in granted:
+            order.append(ticket.user_key)
+            pending.remove(ticket)
+            ticket.release()
+    return order
+
+
+def test_scheduler_interleaves_users_fairly():
+    async def scenario():
+        scheduler = GenerationScheduler(max_concurrency=1, per_user_concurrency=1)
+        blocker = scheduler.submit("blocker")
+        heavy = [scheduler.submit("heavy") for _ in range(4)]
+        light = [scheduler.submit("light") for _ in range(2)]
+        blocker.release()
+        return _grant_order(scheduler, [*heavy, *light])
+
+    order = asyncio.run(scenario())
+
+    assert order[:4] == ["heavy", "light", "heavy", "light"]
+
+
+def test_scheduler_prefers_interactive_and_caps_per_user():
+    async def scenario():
+        scheduler = GenerationScheduler(max_concurrency=2, per_user_concurrency=1)
+        first = scheduler.submit("batch-user", "batch")
+        second = scheduler.submit("batch-user", "batch")
+        interactive = scheduler.submit("person", "interactive")
+        state = (first.granted, second.granted, interactive.granted, second.position)
+        first.release()
+        return state, second.granted
+
+    (first_granted, second_granted, interactive_granted, position), after_release = asyncio.run(
+        scenario()
+    )
+
+    assert first_granted and interactive_granted
+    assert not second_granted
+    assert position == 1
+    assert after_release
+
+
+def test_queue_position_ranks_capped_users_last_and_idle_users_are_dropped():
+    async def scenario():
+        scheduler = GenerationScheduler(max_concurrency=2, per_user_concurrency=1)
+        running = scheduler.submit("busy")
+        holder = scheduler.submit("holder")
+        capped = scheduler.submit("busy")
+        waiting = scheduler.submit("other")
+        positions = (capped.position, waiting.position)
+        for ticket in (running, holder, capped, waiting):
+            ticket.release()
+        for index in range(50):
+            scheduler.submit(f"one-off-{index}").release()
+        return positions, scheduler.snapshot()
+
+    (capped_position, waiting_position), snapshot = asyncio.run(scenario())
+
+    # "busy" is at its cap, so the later ticket from "other" is dispatched first.
+    assert (waiting_position, capped_position) == (1, 2)
+    assert snapshot["active"] == snapshot["waiting"] == 0
+    assert snapshot["users"] == {}
+
+
+def test_anonymous_report_streams_are_scheduled_per_client(monkeypatch):
+    monkeypatch.delenv("EXPLORER_DEFAULT_USER_EMAIL", raising=False)
+    outline = Outline(report_title="Anon", sections=[Section(title="Background", subsections=[])])
+    request = GenerateRequest.model_validate({"outline": outline.model_dump()})
+    service = ReportGeneratorService(
+        outline_service=object(), text_client=object(), report_store=None
+    )
+
+    def key(client_id):
+        return _ReportStreamRunner(service, request, client_id=client_id)._scheduler_key
+
+    assert key("10.0.0.1") != key("10.0.0.2")
+    assert key(None) == "system@explorer.local"
+
+
+def test_report_stream_reports_queue_position_while_waiting():
+    class SlowClient:
+        async def call_text_async(self, model_spec, system_prompt, user_prompt, style_hint=None):
+            return "1.1: Overview\nBody"
+
+    outline = Outline(
+        report_title="Queued",
+        sections=[Section(title="Background", subsections=["Overview"])],
+    )
+    request = GenerateRequest.model_validate(
+        {"outline": outline.model_dump(), "user_email": "a@example.com", "username": "A"}
+    )
+
+    async def scenario():
+        scheduler = GenerationScheduler(max_concurrency=1)
+        service = ReportGeneratorService(
+            outline_service=object(),
+            text_client=SlowClient(),
+            report_store=None,
+            scheduler=scheduler,
+        )
+        holder = scheduler.submit("someone-else")
+        asyncio.get_running_loop().call_later(0.05, holder.release)
+        return [event async for event in service.stream_report(request)]
+
+    events = asyncio.run(scenario())
+
+    queued = [event for event in events if event["status"] == "queued"]
+    assert queued[0]["stage"] == "writer"
+    assert queued[0]["position"] == 1
+    assert events[-1]["status"] == "complete"
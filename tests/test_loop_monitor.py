@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.api.main import app
+from backend.utils.loop_monitor import (
+    DEFAULT_INTERVAL_SECONDS,
+    DEFAULT_SLOW_CALLBACK_SECONDS,
+    LOOP_MONITOR,
+    LoopLagMonitor,
+)
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def test_monitor_records_lag_and_captures_blocking_stack():
+    monitor = LoopLagMonitor(interval=0.01, slow_callback_threshold=0.05)
+
+    async def scenario():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        _block_the_loop(0.2)
+        await asyncio.sleep(0.05)
+        monitor.stop()
+
+    asyncio.run(scenario())
+    snapshot = monitor.snapshot()
+
+    assert snapshot["enabled"] is False
+    assert snapshot["samples"] > 0
+    assert snapshot["lag_ms"]["max"] >= 100
+    assert snapshot["slow_callbacks"] == 1
+    (stall,) = snapshot["recent_slow_callbacks"]
+    assert stall["blocked_ms"] >= 100
+    assert any("_block_the_loop" in frame for frame in stall["stack"])
+
+
+def test_loop_monitor_can_be_toggled_at_runtime(monkeypatch):
+    monkeypatch.setenv("EXPLORER_ADMIN_TOKEN", "s3cret")
+    assert TestClient(app).get("/debug/loop-monitor").status_code == 403
+    assert TestClient(app).put("/debug/loop-monitor", json={"enabled": True}).status_code == 403
+    with TestClient(app, headers={"X-Admin-Token": "s3cret"}) as client:
+        assert client.put(
+            "/debug/loop-monitor", json={"enabled": True, "interval_ms": 1}
+        ).status_code == 422
+        enabled = client.put(
+            "/debug/loop-monitor",
+            json={"enabled": True, "interval_ms": 10, "slow_callback_ms": 250, "reset": True},
+        ).json()
+        assert enabled["enabled"] is True
+        assert enabled["interval_ms"] == 10
+
+        disabled = client.put("/debug/loop-monitor", json={"enabled": False}).json()
+        assert disabled["enabled"] is False
+        assert client.get("/debug/loop-monitor").json()["slow_callback_ms"] == 250
+
+    LOOP_MONITOR.configure(
+        interval=DEFAULT_INTERVAL_SECONDS, slow_callback_threshold=DEFAULT_SLOW_CALLBACK_SECONDS
+    )
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from backend.api.main import app
+from backend.utils.metrics import MetricsRegistry
+
+
+def _populate(registry: MetricsRegistry) -> None:
+    registry.counter("demo_calls_total", "Calls.", ["stage"]).labels(stage="writer").inc(2)
+    registry.gauge("demo_active", "Active streams.").labels().inc()
+    registry.histogram("demo_seconds", "Latency.", buckets=(0.5, 1.0)).labels().observe(0.7)
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    _populate(registry)
+
+    text = registry.render()
+
+    assert "# TYPE demo_calls_total counter" in text
+    assert 'demo_calls_total{stage="writer"} 2' in text
+    assert "demo_active 1" in text
+    assert 'demo_seconds_bucket{le="0.5"} 0' in text
+    assert 'demo_seconds_bucket{le="1.0"} 1' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 1' in text
+    assert "demo_seconds_count 1" in text
+
+
+def test_multiprocess_registry_merges_worker_files(tmp_path: Path):
+    other_worker = MetricsRegistry()
+    _populate(other_worker)
+    # A worker that has exited: its counters still count, its gauges do not.
+    (tmp_path / "metrics-999999999.json").write_text(
+        json.dumps(other_worker.snapshot()), encoding="utf-8"
+    )
+    registry = MetricsRegistry(str(tmp_path))
+    _populate(registry)
+
+    text = registry.render()
+
+    assert 'demo_calls_total{stage="writer"} 4' in text
+    assert "demo_active 1" in text
+    assert "demo_seconds_count 2" in text
+    assert any(path.name.startswith("metrics-") for path in tmp_path.iterdir())
+
+
+def test_concurrent_flushes_leave_one_complete_file(tmp_path: Path):
+    registry = MetricsRegistry(str(tmp_path))
+    _populate(registry)
+    errors = []
+
+    def flush_repeatedly():
+        try:
+            for _ in range(20):
+                registry.flush()
+        except Exception as exception:
+            errors.append(exception)
+
+    threads = [threading.Thread(target=flush_repeatedly) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    files = list(tmp_path.iterdir())
+    assert [path.suffix for path in files] == [".json"]
+    assert json.loads(files[0].read_text(encoding="utf-8")) == registry.snapshot()
+
+
+def _read_gauge(tmp_path: Path, name: str):
+    files = list(tmp_path.glob("metrics-*.json"))
+    if not files:
+        return None
+    snapshot = json.loads(files[0].read_text(encoding="utf-8"))
+    return snapshot[name]["samples"][0][1]
+
+
+def test_background_flusher_writes_the_last_change(tmp_path: Path):
+    registry = MetricsRegistry(str(tmp_path))
+    gauge = registry.gauge("demo_active", "Active streams.").labels()
+
+    gauge.inc()
+    gauge.dec()
+    deadline = time.monotonic() + 5.0
+    while _read_gauge(tmp_path, "demo_active") != 0 and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert _read_gauge(tmp_path, "demo_active") == 0
+    [path] = tmp_path.glob("metrics-*.json")
+    pid, start = path.stem.split("-")[1:]
+    assert int(pid) == os.getpid() and start
+
+
+def test_metrics_endpoint_exposes_pipeline_metrics():
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE explorer_active_report_streams gauge" in response.text
+    assert "# TYPE explorer_llm_calls_total counter" in response.text
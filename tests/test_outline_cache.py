@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+from backend.db import Base, create_engine_from_url, create_session_factory
+from backend.schemas import GenerateRequest, Outline, OutlineRequest, Section
+from backend.services.outline_cache import OutlineCache, outline_cache_key
+from backend.services.outline_service import OutlineService
+from backend.services.report_service import ReportGeneratorService
+from backend.storage import DatabaseReportStore
+
+
+class _CountingOutlineService(OutlineService):
+    def __init__(self):
+        super().__init__(text_client=object())
+        self.calls = 0
+
+    async def generate_outline(self, outline_request):
+        self.calls += 1
+        return Outline(
+            report_title=f"Outline {self.calls}",
+            sections=[Section(title="Background", subsections=["Overview"])],
+        )
+
+
+class _EchoTextClient:
+    async def call_text_async(self, model_spec, system_prompt, user_prompt, style_hint=None):
+        return "1.1: Overview\nBody text."
+
+
+def _request(topic: str, **overrides) -> GenerateRequest:
+    return GenerateRequest.model_validate(
+        {"topic": topic, "mode": "generate_report", "sections": 1, **overrides}
+    )
+
+
+def _run(service, request):
+    async def scenario():
+        return [event async for event in service.stream_report(request)]
+
+    return asyncio.run(scenario())
+
+
+def test_report_stream_reuses_cached_outline_for_same_topic_and_settings():
+    outline_service = _CountingOutlineService()
+    service = ReportGeneratorService(
+        outline_service=outline_service,
+        text_client=_EchoTextClient(),
+        outline_cache=OutlineCache(),
+    )
+
+    first = _run(service, _request("Tidal Power"))
+    second = _run(service, _request("  tidal   POWER "))
+    other_settings = _run(service, _request("Tidal Power", sections=2))
+    fresh = _run(service, _request("Tidal Power", fresh_outline=True))
+
+    assert outline_service.calls == 3
+    cached_ready = next(event for event in second if event["status"] == "outline_ready")
+    assert cached_ready["cached"] is True
+    assert cached_ready["outline"]["report_title"] == "Outline 1"
+    assert "generating_outline" not in [event["status"] for event in second]
+    assert second[-1]["status"] == "complete"
+    assert "cached" not in next(event for event in first if event["status"] == "outline_ready")
+    assert "cached" not in next(
+        event for event in other_settings if event["status"] == "outline_ready"
+    )
+    assert "cached" not in next(event for event in fresh if event["status"] == "outline_ready")
+
+
+def test_outline_cache_key_depends_on_topic_word_order():
+    def key(topic: str) -> str:
+        return outline_cache_key(OutlineRequest(topic=topic))
+
+    assert key("Migrating from Python to Java") != key("Migrating from Java to Python")
+    assert key("Cats vs dogs") != key("Dogs vs cats")
+    assert key("Cats vs. dogs!") == key("  cats VS dogs ")
+
+
+def test_outline_cache_falls_back_to_stored_report_snapshots(tmp_path: Path):
+    engine = create_engine_from_url("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session_factory = create_session_factory(engine)
+    store = DatabaseReportStore(base_dir=tmp_path, session_factory=session_factory)
+    service = ReportGeneratorService(
+        outline_service=_CountingOutlineService(),
+        text_client=_EchoTextClient(),
+        report_store=store,
+        outline_cache=OutlineCache(session_factory),
+    )
+    assert _run(service, _request("Tidal Power", reuse="off"))[-1]["status"] == "complete"
+
+    restarted = OutlineCache(session_factory)
+    outline_request = OutlineService.build_outline_request(
+        "Tidal Power", "json", section_count=1
+    )
+
+    cached = asyncio.run(restarted.get(outline_cache_key(outline_request)))
+
+    assert cached is not None
+    assert cached.report_title == "Outline 1"
+
+
+class _SlowStoredOutlineCache(OutlineCache):
+    def _load_stored_outline(self, key):
+        time.sleep(0.2)
+        return Outline(report_title="Stored", sections=[Section(title="Only", subsections=[])])
+
+
+def test_stored_outline_lookup_runs_off_the_event_loop():
+    cache = _SlowStoredOutlineCache()
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        outline = await cache.get("key")
+        task.cancel()
+        return outline, ticks
+
+    outline, ticks = asyncio.run(scenario())
+
+    assert outline.report_title == "Stored"
+    assert ticks >= 5
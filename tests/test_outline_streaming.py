@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from backend.schemas import GenerateRequest, Outline, Section
+from backend.services import report_service
+from backend.services.generation_scheduler import GenerationScheduler
+from backend.services.outline_service import OutlineService
+from backend.services.report_service import ReportGeneratorService
+from backend.utils.formatting import IncrementalOutlineParser
+
+_OUTLINE = {
+    "report_title": "Tidal Power",
+    "sections": [
+        {"title": "Origins", "subsections": ["Early mills"]},
+        {"title": "Modern plants", "subsections": ["Barrages"]},
+    ],
+}
+
+
+class _StreamingTextClient:
+    def __init__(self, outline_text: str):
+        self.outline_text = outline_text
+        self.outline_finished = False
+
+    async def stream_text_async(self, model_spec, system_prompt, user_prompt, style_hint=None):
+        midpoint = self.outline_text.index('{"title": "Modern')
+        yield self.outline_text[:midpoint]
+        await asyncio.sleep(0.05)
+        yield self.outline_text[midpoint:]
+        self.outline_finished = True
+
+    async def call_text_async(self, model_spec, system_prompt, user_prompt, style_hint=None):
+        if "Modern plants" not in user_prompt:
+            assert not self.outline_finished
+        return "Body text."
+
+
+def _collect(text_client, scheduler=None):
+    request = GenerateRequest.model_validate(
+        {"topic": "Tidal Power", "mode": "generate_report", "sections": 2, "stream_outline": True}
+    )
+
+    async def scenario():
+        service = ReportGeneratorService(
+            outline_service=OutlineService(text_client=text_client),
+            text_client=text_client,
+            scheduler=scheduler() if scheduler else None,
+        )
+        return [event async for event in service.stream_report(request)]
+
+    return asyncio.run(scenario())
+
+
+def test_streamed_outline_starts_first_section_before_outline_finishes():
+    events = _collect(_StreamingTextClient(json.dumps(_OUTLINE)))
+    statuses = [event["status"] for event in events]
+
+    first_write = statuses.index("writing_section")
+    assert statuses.index("outline_section_ready") < first_write < statuses.index("outline_ready")
+    ready = [event for event in events if event["status"] == "outline_section_ready"]
+    assert [event["section"] for event in ready] == ["1: Origins", "2: Modern plants"]
+    assert ready[1]["subsections"] == ["2.1: Barrages"]
+    final = events[-1]
+    assert final["status"] == "complete"
+    assert final["report"].startswith("Tidal Power\n\n1: Origins")
+    assert "2: Modern plants" in final["report"]
+
+
+def test_streamed_outline_reports_unparseable_outline():
+    events = _collect(_StreamingTextClient('{"report_title": "Tidal Power", "sections": [{"title": "Modern plants"'))
+
+    assert events[-1]["status"] == "error"
+    assert events[-1]["detail"].startswith("Failed to parse outline JSON")
+    assert events[-1]["raw_outline"].startswith('{"report_title"')
+
+
+def test_streamed_outline_reports_queue_position_for_the_outline_slot():
+    def busy_scheduler():
+        # Two slots, so the first section can be written while the outline still streams.
+        scheduler = GenerationScheduler(max_concurrency=2)
+        for user in ("first-user", "second-user"):
+            holder = scheduler.submit(user)
+            asyncio.get_running_loop().call_later(0.05, holder.release)
+        return scheduler
+
+    events = _collect(_StreamingTextClient(json.dumps(_OUTLINE)), scheduler=busy_scheduler)
+
+    queued = [event for event in events if event["status"] == "queued"]
+    assert queued[0]["stage"] == "outline"
+    assert queued[0]["position"] == 1
+    assert events[-1]["status"] == "complete"
+
+
+class _RenamingOutlineParser(IncrementalOutlineParser):
+    def finish(self):
+        outline = super().finish()
+        return Outline(
+            report_title=outline.report_title,
+            sections=[outline.sections[0], Section(title="Renamed", subsections=[])],
+        )
+
+
+def test_streamed_outline_keeps_written_sections_when_final_outline_differs(monkeypatch):
+    monkeypatch.setattr(report_service, "IncrementalOutlineParser", _RenamingOutlineParser)
+
+    events = _collect(_StreamingTextClient(json.dumps(_OUTLINE)))
+
+    [mismatch] = [event for event in events if event["status"] == "outline_mismatch"]
+    assert mismatch["written_sections"] == ["Origins", "Modern plants"]
+    assert mismatch["final_outline"]["sections"][1]["title"] == "Renamed"
+    [ready] = [event for event in events if event["status"] == "outline_ready"]
+    assert [section["title"] for section in ready["outline"]["sections"]] == [
+        "Origins",
+        "Modern plants",
+    ]
+    assert events[-1]["status"] == "complete"
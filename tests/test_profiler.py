@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.api.main import app
+from backend.utils.profiler import sample_stacks, to_collapsed, to_speedscope, tracemalloc_diff
+
+
+def _spin_until(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_attributes_time_to_busy_thread():
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin_until, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        samples = sample_stacks(0.2, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert samples.samples > 5
+    collapsed = to_collapsed(samples)
+    busy_lines = [line for line in collapsed.splitlines() if line.startswith("busy-worker;")]
+    assert any("_spin_until (" in line for line in busy_lines)
+
+    speedscope = to_speedscope(samples)
+    (profile,) = [item for item in speedscope["profiles"] if item["name"] == "busy-worker"]
+    assert len(profile["samples"]) == len(profile["weights"])
+    frame_names = {speedscope["shared"]["frames"][index]["name"] for row in profile["samples"] for index in row}
+    assert "_spin_until" in frame_names
+
+
+def test_tracemalloc_diff_reports_allocations_made_during_window():
+    retained = []
+
+    def allocate():
+        time.sleep(0.05)
+        retained.append([bytearray(1024) for _ in range(2000)])
+
+    worker = threading.Thread(target=allocate)
+    worker.start()
+    diff = tracemalloc_diff(0.2, top=5, include="test_profiler")
+    worker.join()
+
+    assert diff["size_diff_bytes"] >= 1024 * 2000
+    assert any("test_profiler.py" in line for line in diff["top"][0]["traceback"])
+
+
+def test_profiling_endpoints_require_admin_token(monkeypatch):
+    client = TestClient(app)
+
+    monkeypatch.delenv("EXPLORER_ADMIN_TOKEN", raising=False)
+    assert client.get("/debug/profile", params={"seconds": 0.05}).status_code == 404
+
+    monkeypatch.setenv("EXPLORER_ADMIN_TOKEN", "s3cret")
+    assert client.get(
+        "/debug/profile", params={"seconds": 0.05}, headers={"X-Admin-Token": "wrong"}
+    ).status_code == 403
+
+    response = client.get(
+        "/debug/profile",
+        params={"seconds": 0.05, "format": "speedscope"},
+        headers={"X-Admin-Token": "s3cret"},
+    )
+    assert response.status_code == 200
+    assert response.json()["exporter"] == "explorer-profiler"
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from backend.schemas import GenerateRequest
+from backend.services.provider_batch import LocalBatchBackend, OfflineBatchGenerator
+from backend.utils.pricing import BATCH_PRICE_MULTIPLIER, get_price_table
+from backend.utils.usage import record_token_usage
+
+
+class _PromptAwareClient:
+    """Answers outline, writer and editor prompts the way a real model roughly would."""
+
+    def __init__(self, fail_first_writer: bool = False):
+        self._fail_first_writer = fail_first_writer
+
+    async def call_text_async(self, model_spec, system_prompt, user_prompt, style_hint=None):
+        record_token_usage(model_spec.model, 10, 5)
+        if system_prompt == "You generate structured outlines.":
+            topic = re.search(r'topic of "([^"]+)"', user_prompt).group(1)
+            return json.dumps(
+                {
+                    "report_title": topic,
+                    "sections": [
+                        {"title": "Origins", "subsections": ["Early days"]},
+                        {"title": "Outlook", "subsections": ["Next steps"]},
+                    ],
+                }
+            )
+        if system_prompt.startswith("You write"):
+            if self._fail_first_writer:
+                self._fail_first_writer = False
+                raise RuntimeError("writer overloaded")
+            return "### heading\nDraft text"
+        body = user_prompt.split("Section body to edit:\n", 1)[1].strip()
+        return body.replace("Draft", "Edited")
+
+
+def _requests(*topics):
+    return [
+        GenerateRequest.model_validate({"topic": topic, "mode": "generate_report"})
+        for topic in topics
+    ]
+
+
+def test_offline_batch_runs_one_batch_per_pipeline_step(tmp_path: Path):
+    backend = LocalBatchBackend(_PromptAwareClient(), polls_until_complete=1)
+    generator = OfflineBatchGenerator(
+        backend, workdir=tmp_path, poll_interval=0, idle_flush_seconds=0.05
+    )
+    seen_statuses = []
+
+    finals = asyncio.run(
+        generator.generate(
+            _requests("Solar power", "Wind power"),
+            on_event=lambda index, event: seen_statuses.append((index, event["status"])),
+        )
+    )
+
+    assert [final["status"] for final in finals] == ["complete", "complete"]
+    assert finals[0]["report"] == (
+        "Solar power\n\n1: Origins\n\n1.1: Early days\nEdited text"
+        "\n\n2: Outlook\n\n2.1: Next steps\nEdited text"
+    )
+    # One outline batch, then writer and editor batches for each of the two sections.
+    assert len(backend.submitted) == 5
+    for input_path in backend.submitted:
+        lines = input_path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])["url"] == "/v1/chat/completions"
+    assert (1, "complete") in seen_statuses
+
+
+def test_offline_batch_surfaces_line_errors_to_the_runner(tmp_path: Path):
+    backend = LocalBatchBackend(_PromptAwareClient(fail_first_writer=True))
+    generator = OfflineBatchGenerator(
+        backend, workdir=tmp_path, poll_interval=0, idle_flush_seconds=0.05
+    )
+
+    finals = asyncio.run(generator.generate(_requests("Solar power")))
+
+    assert finals[0]["status"] == "error"
+    assert "writer overloaded" in finals[0]["detail"]
+
+
+def test_offline_batch_records_output_usage_on_each_run(tmp_path: Path):
+    backend = LocalBatchBackend(_PromptAwareClient())
+    generator = OfflineBatchGenerator(
+        backend, workdir=tmp_path, poll_interval=0, idle_flush_seconds=0.05
+    )
+
+    finals = asyncio.run(generator.generate(_requests("Solar power", "Wind power")))
+
+    output_lines = (tmp_path / "batch-0001-output.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(output_lines[0])["response"]["body"]["usage"]["total_tokens"] == 15
+    # Each run made one outline call plus a writer and an editor call per section.
+    for final in finals:
+        assert final["usage"]["calls"] == 5
+        assert final["usage"]["prompt_tokens"] == 50
+        assert final["usage"]["completion_tokens"] == 25
+        assert set(final["usage"]["stages"]) == {"outline", "writer", "editor"}
+        # Batch calls are priced at the Batch API discount, not the synchronous rate.
+        list_price = get_price_table().cost_cents("gpt-4.1-nano", 50, 25)
+        assert final["usage"]["cost_cents"] == pytest.approx(
+            list_price * BATCH_PRICE_MULTIPLIER, abs=1e-4
+        )
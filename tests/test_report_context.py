@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+
+from backend.schemas import GenerateRequest, Outline, Section
+from backend.services.report_context import build_report_context, estimate_tokens
+from backend.services.report_service import ReportGeneratorService
+from backend.services.report_state import ReportSegments, WrittenSection
+from backend.utils.summary import split_section_summary
+
+_LONG_BODY = " ".join(f"Sentence number {index} about tides." for index in range(200))
+
+
+def _sections():
+    return [
+        WrittenSection(title="1: Origins", body=_LONG_BODY, summary="Tides moved mills."),
+        WrittenSection(title="2: Plants", body=_LONG_BODY),
+    ]
+
+
+def test_context_strategies_shrink_prompt_context():
+    full = build_report_context("full", _sections())
+    rolling = build_report_context("rolling_summary", _sections())
+    budgeted = build_report_context("token_budget", _sections(), token_budget=200)
+
+    assert full.tokens == full.full_tokens == estimate_tokens(full.text)
+    assert "1: Origins\n\nTides moved mills." in rolling.text
+    assert "2: Plants\n\nSentence number 0 about tides. Sentence number 1 about tides." in rolling.text
+    assert rolling.tokens < full.tokens / 10
+    assert budgeted.tokens <= 200
+    assert budgeted.text.count(" …") == 2
+    assert budgeted.status_fields() == {
+        "context_strategy": "token_budget",
+        "context_tokens": budgeted.tokens,
+        "full_context_tokens": full.tokens,
+    }
+
+
+def test_report_segments_track_length_and_join_once():
+    segments = ReportSegments()
+    for section in _sections():
+        segments.append(section)
+    segments.set_title("Tidal Power")
+    expected = "\n\n".join(["Tidal Power", *(f"{s.title}\n\n{s.body}" for s in _sections())])
+
+    assert len(segments) == len(expected)
+    assert segments.text() == expected
+    assert segments.text() is segments.text()
+    assert segments.sections_text() == expected[len("Tidal Power\n\n") :]
+    assert build_report_context("full", segments) == build_report_context("full", _sections())
+    assert build_report_context("rolling_summary", segments).full_tokens == estimate_tokens(
+        segments.sections_text()
+    )
+
+
+def test_split_section_summary_strips_trailing_summary_line():
+    body, summary = split_section_summary("1.1: Intro\nText.\n\nSection summary:  Short   recap.")
+
+    assert body == "1.1: Intro\nText."
+    assert summary == "Short recap."
+    assert split_section_summary("Text only.") == ("Text only.", None)
+
+
+class _RecordingTextClient:
+    def __init__(self):
+        self.writer_prompts = []
+
+    async def call_text_async(self, model_spec, system_prompt, user_prompt, style_hint=None):
+        if "Section body to edit" in user_prompt:
+            assert "SECTION SUMMARY:" in user_prompt
+            return f"{_LONG_BODY}\nSECTION SUMMARY: Recap of this section."
+        self.writer_prompts.append(user_prompt)
+        return _LONG_BODY
+
+
+def test_rolling_summary_strategy_feeds_summaries_to_conclusion():
+    text_client = _RecordingTextClient()
+    service = ReportGeneratorService(outline_service=object(), text_client=text_client)
+    outline = Outline(
+        report_title="Tidal Power",
+        sections=[
+            Section(title="Origins", subsections=[]),
+            Section(title="Conclusion", subsections=[]),
+        ],
+    )
+    request = GenerateRequest(outline=outline, context_strategy="rolling_summary")
+
+    async def scenario():
+        return [event async for event in service.stream_report(request)]
+
+    events = asyncio.run(scenario())
+
+    writing = [event for event in events if event["status"] == "writing_section"]
+    assert "context_tokens" not in writing[0]
+    assert writing[1]["context_strategy"] == "rolling_summary"
+    assert writing[1]["context_tokens"] < writing[1]["full_context_tokens"]
+    assert "Recap of this section." in text_client.writer_prompts[1]
+    assert "SECTION SUMMARY" not in events[-1]["report"]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from backend.services.report_events import (
+    ReportEventLog,
+    ReportEventLogRegistry,
+    ReportStreamLimitError,
+    format_sse_event,
+    iter_json,
+    parse_event_id,
+)
+
+
+def test_event_log_replays_only_missed_events():
+    async def scenario():
+        log = ReportEventLog("stream")
+        for status in ("started", "generating_outline", "outline_ready", "begin_sections"):
+            log.append({"status": status})
+        log.close()
+        return [event_id for event_id, _ in log.events_after(2)], [
+            event["status"] async for _, event in log.follow(2)
+        ]
+
+    replay_ids, replay_statuses = asyncio.run(scenario())
+
+    assert replay_ids == [3, 4]
+    assert replay_statuses == ["outline_ready", "begin_sections"]
+
+
+def test_event_log_keeps_outline_payload_after_eviction():
+    async def scenario():
+        log = ReportEventLog("stream", max_events=2)
+        log.append({"status": "started"})
+        log.append({"status": "outline_ready", "outline": {"report_title": "Big"}})
+        for _ in range(5):
+            log.append({"status": "writing_section"})
+        return log.events_after(0)
+
+    replay = asyncio.run(scenario())
+
+    assert replay[0] == (2, {"status": "outline_ready", "outline": {"report_title": "Big"}})
+    assert [event_id for event_id, _ in replay] == [2, 6, 7]
+
+
+def test_event_log_reports_gap_when_resume_point_was_evicted():
+    async def scenario():
+        log = ReportEventLog("stream", max_events=2)
+        log.append({"status": "started"})
+        log.append({"status": "outline_ready", "outline": {"report_title": "Big"}})
+        for _ in range(4):
+            log.append({"status": "writing_section"})
+        log.close()
+        return [(event_id, event["status"]) async for event_id, event in log.follow(1)], [
+            event["status"] async for _, event in log.follow(4)
+        ]
+
+    behind, caught_up = asyncio.run(scenario())
+
+    assert behind == [
+        (1, "replay_gap"),
+        (2, "outline_ready"),
+        (5, "writing_section"),
+        (6, "writing_section"),
+    ]
+    assert caught_up == ["writing_section", "writing_section"]
+
+
+def test_registry_caps_running_streams():
+    async def endless():
+        yield {"status": "started"}
+        await asyncio.Event().wait()
+
+    async def scenario():
+        registry = ReportEventLogRegistry(max_live_streams=1)
+        registry.start(endless())
+        with pytest.raises(ReportStreamLimitError):
+            registry.start(endless())
+        for task in list(registry._tasks):
+            task.cancel()
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+
+def test_registry_resume_does_not_regenerate_events():
+    produced = []
+
+    async def fake_report_stream():
+        for index, status in enumerate(("started", "outline_ready", "complete"), start=1):
+            produced.append(status)
+            yield {"status": status, "event_id": index}
+            await asyncio.sleep(0)
+
+    async def scenario():
+        registry = ReportEventLogRegistry()
+        log = registry.start(fake_report_stream())
+        first_connection = []
+        async for event_id, event in log.follow(0):
+            first_connection.append(event_id)
+            break  # Simulate the client dropping after the first event.
+        resumed = registry.get(log.stream_id)
+        assert resumed is log
+        return first_connection, [event async for _, event in resumed.follow(1)]
+
+    first_connection, resumed_events = asyncio.run(scenario())
+
+    assert first_connection == [1]
+    assert [event["status"] for event in resumed_events] == ["outline_ready", "complete"]
+    assert produced == ["started", "outline_ready", "complete"]
+
+
+def test_registry_records_stream_failures_as_error_events():
+    async def failing_stream():
+        yield {"status": "started"}
+        raise RuntimeError("provider down")
+
+    async def scenario():
+        registry = ReportEventLogRegistry()
+        log = registry.start(failing_stream())
+        return [event async for _, event in log.follow(0)]
+
+    events = asyncio.run(scenario())
+
+    assert events[-1] == {"status": "error", "detail": "provider down"}
+
+
+def test_sse_event_ids_round_trip():
+    frame = format_sse_event("abc123", 7, {"status": "started"})
+
+    assert frame.startswith("id: abc123:7\n")
+    assert frame.endswith("\n\n")
+    assert parse_event_id("abc123:7") == ("abc123", 7)
+    assert parse_event_id("missing-separator") is None
+    assert parse_event_id("abc123:not-a-number") is None
+
+
+def test_chunked_json_matches_json_dumps_for_large_fields():
+    report = "Title\n\n" + "Caf\u00e9 \"quoted\" \\ tab\t \U0001f30a emoji. " * 500
+    event = {"status": "complete", "report": report, "usage": {"total_tokens": 3}, "event_id": 9}
+
+    pieces = list(iter_json(event, chunk_chars=97))
+
+    assert len(pieces) > 10
+    assert max(len(piece) for piece in pieces) < 97 * 6 + 20
+    assert "".join(pieces) == json.dumps(event)
+    assert list(iter_json({"status": "started"})) == [json.dumps({"status": "started"})]
+
@@ -58,10 +58,12 @@ class NoopReportStore:
             report_path=base_dir / "noop-report.md",
         )
 
-    def prepare_report(self, request, outline):
+    def prepare_report(self, request, outline, *, outline_cache_key=None):
         return self._handle
 
-    def finalize_report(self, handle, report_markdown, written_sections, summary=None):
+    def finalize_report(
+        self, handle, report_markdown, written_sections, summary=None, *, usage=None, token_usage=None
+    ):
         return None
 
     def discard_report(self, handle):
@@ -133,12 +135,73 @@ def test_report_generator_stream_produces_complete_report():
     final_event = events[-1]
     assert final_event["report_title"] == "Insights"
     assert final_event["report"] == "Insights\n\n1: Background\n\n1.1: Overview\nEdited body"
+    assert [event["event_id"] for event in events] == list(range(1, len(events) + 1))
     assert final_event["outline_used"] == outline.model_dump()
 
     call_models = [model for model, *_ in stub_text_client.calls]
     assert call_models == ["writer-model", "editor-model"]
 
 
+def _collect(service, request):
+    events = []
+
+    async def collect_events():
+        async for event in service.stream_report(request):
+            events.append(event)
+
+    asyncio.run(collect_events())
+    return events
+
+
+def test_report_generator_chunked_and_section_delivery_omit_report_from_complete():
+    outline = Outline(
+        report_title="Insights",
+        sections=[
+            Section(title="Background", subsections=["Overview"]),
+            Section(title="Outlook", subsections=["Trends"]),
+        ],
+    )
+    edited = ["### Overview\n" + "Edited background. " * 150, "### Trends\nEdited outlook"]
+    expected = (
+        "Insights\n\n1: Background\n\n1.1: Overview\n" + ("Edited background. " * 150).strip()
+        + "\n\n2: Outlook\n\n2.1: Trends\nEdited outlook"
+    )
+
+    def run(**options):
+        service = ReportGeneratorService(
+            outline_service=DummyOutlineService(),
+            text_client=StubTextClient(["draft", edited[0], "draft", edited[1]]),
+            report_store=NoopReportStore(),
+        )
+        request = GenerateRequest.model_validate({"outline": outline.model_dump(), **options})
+        return _collect(service, request)
+
+    events = run(delivery="chunked", report_chunk_chars=1024)
+    chunks = [event for event in events if event["status"] == "report_chunk"]
+    final_event = events[-1]
+    assert "report" not in final_event
+    assert final_event["delivery"] == "chunked"
+    assert final_event["report_chunks"] == len(chunks) == 3
+    assert [chunk["index"] for chunk in chunks] == [0, 1, 2]
+    assert "".join(chunk["text"] for chunk in chunks) == expected
+    assert final_event["report_length"] == len(expected)
+    assert [event["event_id"] for event in events] == list(range(1, len(events) + 1))
+
+    # Without a database store there is nothing to reference, so chunks are sent instead.
+    assert run(delivery="reference")[-1]["delivery"] == "chunked"
+
+    events = run(stream_sections=True, delivery="chunked")
+    final_event = events[-1]
+    assert final_event["delivery"] == "sections"
+    assert not any(event["status"] == "report_chunk" for event in events)
+    sections = [
+        f"{event['section']}\n\n{event['body']}"
+        for event in events
+        if event["status"] == "section_complete"
+    ]
+    assert "\n\n".join([final_event["report_title"], *sections]) == expected
+
+
 def test_report_generator_editing_failure_emits_error_event():
     outline = Outline(
         report_title="Insights",
@@ -389,7 +452,7 @@ def test_generate_report_endpoint_streams_events():
             self._delay_between_events = delay_between_events
             self.requests = []
 
-        async def stream_report(self, generate_request):
+        async def stream_report(self, generate_request, *, trace_parent=None, client_id=None):
             self.requests.append(generate_request)
             for index, event in enumerate(self._events):
                 if index and self._delay_between_events:
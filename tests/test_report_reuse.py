@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+from backend.db import Base, create_engine_from_url, create_session_factory
+from backend.schemas import GenerateRequest, Outline, Section
+from backend.services.related_topics import ExistingReportMatcher
+from backend.services.report_service import ReportGeneratorService
+from backend.storage import DatabaseReportStore
+from backend.utils.embeddings import HashingEmbeddingBackend
+
+
+class _FailingTextClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def call_text_async(self, model_spec, system_prompt, user_prompt, style_hint=None):
+        self.calls += 1
+        raise AssertionError("Reused reports must not call the LLM")
+
+
+class _OutlineStub:
+    async def generate_outline(self, outline_request):
+        raise RuntimeError("stop after the reuse lookup")
+
+    def build_outline_request(self, topic, fmt, **kwargs):
+        return None
+
+
+def _request(topic: str, reuse: str, **overrides) -> GenerateRequest:
+    return GenerateRequest.model_validate(
+        {
+            "topic": topic,
+            "mode": "generate_report",
+            "user_email": "me@example.com",
+            "username": "Me",
+            "reuse": reuse,
+            "return": "report_with_outline",
+            **overrides,
+        }
+    )
+
+
+def _service_with_stored_report(tmp_path: Path, topic: str, threshold: float = 0.9):
+    engine = create_engine_from_url(f"sqlite+pysqlite:///{tmp_path / 'reuse.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = create_session_factory(engine)
+    backend = HashingEmbeddingBackend()
+    store = DatabaseReportStore(
+        base_dir=tmp_path, session_factory=session_factory, embedding_backend=backend
+    )
+    outline = Outline(report_title=topic, sections=[Section(title="Origins", subsections=[])])
+    handle = store.prepare_report(_request(topic, "off"), outline)
+    store.finalize_report(handle, f"{topic}\n\n1: Origins\n\nStored body.", [])
+    text_client = _FailingTextClient()
+    service = ReportGeneratorService(
+        outline_service=_OutlineStub(),
+        text_client=text_client,
+        report_store=store,
+        report_matcher=ExistingReportMatcher(
+            session_factory, base_dir=tmp_path, embedding_backend=backend, threshold=threshold
+        ),
+    )
+    return service, handle, text_client
+
+
+def _collect(service, request):
+    async def scenario():
+        events = []
+        try:
+            async for event in service.stream_report(request):
+                events.append(event)
+        except RuntimeError:
+            pass
+        return events
+
+    return asyncio.run(scenario())
+
+
+def test_reuse_return_streams_stored_report_for_same_normalized_title(tmp_path: Path):
+    service, handle, text_client = _service_with_stored_report(
+        tmp_path, "History of the Roman Empire"
+    )
+
+    events = _collect(service, _request("  history of the ROMAN empire!", "return"))
+
+    assert [event["status"] for event in events] == ["started", "complete"]
+    final = events[-1]
+    assert final["report"].endswith("Stored body.")
+    assert final["outline_used"]["report_title"] == "History of the Roman Empire"
+    assert final["reused_report"]["report_id"] == str(handle.report_id)
+    assert final["reused_report"]["match"] == "title"
+    assert text_client.calls == 0
+
+
+def test_reuse_offer_reports_embedding_match_and_keeps_generating(tmp_path: Path):
+    service, handle, _ = _service_with_stored_report(
+        tmp_path, "History of the Roman Empire", threshold=0.8
+    )
+
+    events = _collect(service, _request("The history of the Roman empires", "offer"))
+
+    offer = events[1]
+    assert offer["status"] == "existing_report"
+    assert offer["match"] == "embedding"
+    assert offer["similarity"] >= 0.8
+    assert offer["report_id"] == str(handle.report_id)
+    assert events[2]["status"] == "generating_outline"
+
+
+def test_reuse_ignores_unrelated_topics(tmp_path: Path):
+    service, _, _ = _service_with_stored_report(tmp_path, "History of the Roman Empire")
+
+    events = _collect(service, _request("Medieval troubadour poetry", "return"))
+
+    assert [event["status"] for event in events[:2]] == ["started", "generating_outline"]
+
+
+def test_reuse_lookup_is_opt_in(tmp_path: Path):
+    service, _, _ = _service_with_stored_report(tmp_path, "History of the Roman Empire")
+    request = _request("History of the Roman Empire", "off").model_dump(by_alias=True)
+    del request["reuse"]
+
+    events = _collect(service, GenerateRequest.model_validate(request))
+
+    assert [event["status"] for event in events[:2]] == ["started", "generating_outline"]
+
+
+def test_reuse_requires_same_word_order_and_generation_settings(tmp_path: Path):
+    service, _, _ = _service_with_stored_report(
+        tmp_path, "Migrating from Python to Java", threshold=1.01
+    )
+
+    reversed_topic = _collect(service, _request("Migrating from Java to Python", "return"))
+    other_sections = _collect(
+        service, _request("Migrating from Python to Java", "return", section_count=5)
+    )
+    other_writer = _collect(
+        service,
+        _request(
+            "Migrating from Python to Java",
+            "return",
+            models={"writer": {"model": "other-writer"}},
+        ),
+    )
+
+    for events in (reversed_topic, other_sections, other_writer):
+        assert [event["status"] for event in events[:2]] == ["started", "generating_outline"]
+
+
+class _SlowMatcher:
+    def match(self, user_email, topic, settings_key):
+        time.sleep(0.2)
+        return None
+
+
+def test_reuse_lookup_runs_off_the_event_loop():
+    service = ReportGeneratorService(
+        outline_service=_OutlineStub(),
+        text_client=_FailingTextClient(),
+        report_matcher=_SlowMatcher(),
+    )
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        try:
+            async for _ in service.stream_report(_request("Tidal power", "offer")):
+                pass
+        except RuntimeError:
+            pass
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(scenario()) >= 5
+
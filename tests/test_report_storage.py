@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -8,6 +11,7 @@ from sqlalchemy import select
 from backend.db import (
     Base,
     Report,
+    ReportHeading,
     ReportStatus,
     SavedTopic,
     User,
@@ -16,7 +20,9 @@ from backend.db import (
     session_scope,
 )
 from backend.schemas import GenerateRequest, Outline, Section
+from backend.services.report_service import ReportGeneratorService
 from backend.storage import DatabaseReportStore
+from backend.utils.embeddings import HashingEmbeddingBackend
 
 
 def _session_factory():
@@ -57,12 +63,17 @@ def test_database_report_store_persists_artifacts(tmp_path: Path):
         assert stored.summary is None
         assert stored.content_uri.endswith("report.md")
         assert stored.sections["written"][0]["title"] == "1: Introduction"
+        assert [heading.heading for heading in stored.headings] == [
+            "1: Introduction",
+            "1.1: Framing",
+        ]
+        assert {heading.owner_user_id for heading in stored.headings} == {stored.owner_user_id}
 
 
 def test_database_report_store_discards_failed_reports(tmp_path: Path):
     session_factory = _session_factory()
     store = DatabaseReportStore(base_dir=tmp_path / "reports", session_factory=session_factory)
-    outline = Outline(report_title="Failure Case", sections=[])
+    outline = Outline(report_title="Failure Case", sections=[Section(title="Doomed", subsections=[])])
     request = GenerateRequest.model_validate(
         {
             "topic": "Failure topic",
@@ -76,6 +87,7 @@ def test_database_report_store_discards_failed_reports(tmp_path: Path):
     with session_scope(session_factory) as session:
         stored = session.get(Report, handle.report_id)
         assert stored is None
+        assert session.scalars(select(ReportHeading)).all() == []
     assert not handle.report_dir.exists()
 
 
@@ -257,3 +269,108 @@ def test_prepare_report_does_not_merge_different_titles_with_same_slug(tmp_path:
         assert first_report is not None
         assert second_report is not None
         assert first_report.saved_topic_id != second_report.saved_topic_id
+
+
+def test_finalize_report_accumulates_user_usage_counters(tmp_path: Path):
+    session_factory = _session_factory()
+    store = DatabaseReportStore(base_dir=tmp_path / "reports", session_factory=session_factory)
+    outline = Outline(report_title="Usage", sections=[])
+    request = GenerateRequest.model_validate(
+        {
+            "topic": "Usage topic",
+            "mode": "generate_report",
+            "user_email": "usage@example.com",
+            "username": "Usage",
+        }
+    )
+
+    for _ in range(2):
+        handle = store.prepare_report(request, outline)
+        store.finalize_report(handle, "Usage", [], usage={"reports": 1, "llm_calls": 3})
+
+    with session_scope(session_factory) as session:
+        user = session.get(User, handle.owner_user_id)
+        assert user.usage_counters == {"reports": 2, "llm_calls": 6}
+
+
+def test_concurrent_finalizes_keep_every_usage_count(tmp_path: Path):
+    engine = create_engine_from_url(f"sqlite+pysqlite:///{tmp_path / 'reports.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = create_session_factory(engine)
+    store = DatabaseReportStore(base_dir=tmp_path / "reports", session_factory=session_factory)
+    request = GenerateRequest.model_validate(
+        {
+            "topic": "Usage topic",
+            "mode": "generate_report",
+            "user_email": "usage@example.com",
+            "username": "Usage",
+        }
+    )
+    outline = Outline(report_title="Usage", sections=[])
+    handles = [store.prepare_report(request, outline) for _ in range(8)]
+    barrier = threading.Barrier(len(handles))
+
+    def finalize(handle):
+        barrier.wait()
+        store.finalize_report(handle, "Usage", [], usage={"reports": 1, "llm_calls": 3})
+
+    threads = [threading.Thread(target=finalize, args=(handle,)) for handle in handles]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with session_scope(session_factory) as session:
+        user = session.get(User, handles[0].owner_user_id)
+        assert user.usage_counters == {"reports": 8, "llm_calls": 24}
+
+
+class _SlowEmbeddingBackend(HashingEmbeddingBackend):
+    def embed(self, texts):
+        time.sleep(0.2)
+        return super().embed(texts)
+
+
+class _EchoTextClient:
+    async def call_text_async(self, model_spec, system_prompt, user_prompt, style_hint=None):
+        return "1.1: Framing\nBody text."
+
+
+def test_report_finalize_runs_off_the_event_loop(tmp_path: Path):
+    engine = create_engine_from_url(f"sqlite+pysqlite:///{tmp_path / 'reports.db'}")
+    Base.metadata.create_all(engine)
+    store = DatabaseReportStore(
+        base_dir=tmp_path / "reports",
+        session_factory=create_session_factory(engine),
+        embedding_backend=_SlowEmbeddingBackend(),
+    )
+    service = ReportGeneratorService(text_client=_EchoTextClient(), report_store=store)
+    request = GenerateRequest.model_validate(
+        {
+            "outline": {
+                "report_title": "Solar Energy Growth",
+                "sections": [{"title": "Introduction", "subsections": ["Framing"]}],
+            },
+            "reuse": "off",
+        }
+    )
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        events = [event async for event in service.stream_report(request)]
+        task.cancel()
+        return events, ticks
+
+    events, ticks = asyncio.run(scenario())
+
+    assert events[-1]["status"] == "complete"
+    assert ticks >= 5
+
@@ -47,6 +47,9 @@ def test_ensure_lightweight_schema_rebuilds_legacy_tables(tmp_path: Path):
         "saved_topic_id",
         "owner_user_id",
         "outline_snapshot",
+        "outline_cache_key",
+        "topic_key",
+        "settings_key",
         "status",
         "language",
         "output_format",
@@ -76,6 +79,19 @@ def test_ensure_lightweight_schema_rebuilds_legacy_tables(tmp_path: Path):
         assert row.username == row.full_name == "Legacy Owner"
 
 
+def test_ensure_lightweight_schema_rebuilds_tables_with_named_indexes(tmp_path: Path):
+    engine = create_engine_from_url(_legacy_sqlite_url(tmp_path / "indexed.db"))
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql('ALTER TABLE "reports" DROP COLUMN "last_accessed_at"')
+
+    ensure_lightweight_schema(engine)
+
+    inspector = inspect(engine)
+    assert "last_accessed_at" in [column["name"] for column in inspector.get_columns("reports")]
+    assert "ix_reports_owner_created_at" in {index["name"] for index in inspector.get_indexes("reports")}
+
+
 def _create_legacy_schema(engine):
     user_id = str(uuid.uuid4())
     topic_id = str(uuid.uuid4())
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+
+from backend.schemas import GenerateRequest
+from backend.services.outline_service import OutlineService
+from backend.services.report_service import ReportGeneratorService
+from backend.utils.simulated_client import (
+    FixedLatency,
+    LogNormalLatency,
+    ParetoLatency,
+    SimulatedLLMError,
+    SimulatedTextClient,
+    parse_latency,
+)
+
+
+def _report_events(client: SimulatedTextClient, **overrides):
+    service = ReportGeneratorService(
+        outline_service=OutlineService(text_client=client), text_client=client
+    )
+    request = GenerateRequest.model_validate(
+        {"topic": "Tidal Power", "mode": "generate_report", "sections": 3, **overrides}
+    )
+
+    async def scenario():
+        return [event async for event in service.stream_report(request)]
+
+    return asyncio.run(scenario())
+
+
+def test_simulated_backend_drives_a_full_report_deterministically():
+    first = _report_events(SimulatedTextClient(seed=3, paragraph_words=20))
+    second = _report_events(SimulatedTextClient(seed=3, paragraph_words=20))
+
+    final = first[-1]
+    assert final["status"] == "complete"
+    assert final["report"] == second[-1]["report"]
+    assert final["report"].startswith("Understanding Tidal Power\n\n1: ")
+    assert "3: Conclusion" in final["report"]
+    assert "1.1: " in final["report"]
+    assert final["usage"]["stages"]["writer"]["calls"] == 3
+    assert final["usage"]["total_tokens"] > 0
+
+
+def test_simulated_backend_streams_outline_chunks():
+    events = _report_events(SimulatedTextClient(paragraph_words=10), stream_outline=True)
+
+    statuses = [event["status"] for event in events]
+    assert statuses.count("outline_section_ready") == 3
+    assert statuses[-1] == "complete"
+
+
+def test_simulated_backend_injects_errors_at_the_configured_rate():
+    client = SimulatedTextClient(error_rate=0.3)
+    model = GenerateRequest(topic="x", mode="generate_report").models["writer"]
+
+    async def scenario():
+        failures = 0
+        for index in range(200):
+            try:
+                await client.call_text_async(model, "system", f"prompt {index}")
+            except SimulatedLLMError:
+                failures += 1
+        return failures
+
+    assert 40 <= asyncio.run(scenario()) <= 80
+
+
+def test_parse_latency_builds_distributions():
+    rng = random.Random(0)
+
+    assert parse_latency("fixed:0.25") == FixedLatency(0.25)
+    assert parse_latency("lognormal:median=2,sigma=0.1") == LogNormalLatency(2.0, 0.1)
+    heavy = parse_latency("pareto:scale=0.5,alpha=1.2,cap=10")
+    assert heavy == ParetoLatency(0.5, 1.2, 10.0)
+    samples = [heavy.sample(rng) for _ in range(2000)]
+    assert min(samples) >= 0.5 and max(samples) <= 10.0
+    with pytest.raises(ValueError):
+        parse_latency("uniform:1")
@@ -1,9 +1,16 @@
+import argparse
 import json
 from pathlib import Path
 
 import pytest
 
-from cli.stream_report import _prepare_final_report, load_payload
+from cli.stream_report import (
+    _attach_delivered_report,
+    _manifest_entry_payload,
+    _prepare_final_report,
+    load_batch_manifest,
+    load_payload,
+)
 
 
 def test_load_payload_requires_json_object(tmp_path: Path) -> None:
@@ -50,6 +57,18 @@ def test_prepare_final_report_requires_report_field() -> None:
     assert "'report'" in str(excinfo.value)
 
 
+def test_attach_delivered_report_reassembles_chunks_and_sections() -> None:
+    chunked = {"status": "complete", "delivery": "chunked", "report_chunks": 2, "report_length": 8}
+    assert _prepare_final_report(_attach_delivered_report(chunked, ["Title", "\n\nA"], [])) == "Title\n\nA"
+
+    with pytest.raises(SystemExit):
+        _attach_delivered_report(chunked, ["Title"], [])
+
+    sections = {"status": "complete", "delivery": "sections", "report_title": "Title"}
+    report = _attach_delivered_report(sections, [], ["1: A\n\nBody"])["report"]
+    assert report == "Title\n\n1: A\n\nBody"
+
+
 def test_load_payload_requires_username_with_user_email() -> None:
     with pytest.raises(SystemExit) as excinfo:
         load_payload(
@@ -84,3 +103,45 @@ def test_load_payload_allows_override_when_payload_supplies_username(tmp_path: P
 
     assert payload["user_email"] == "override@example.com"
     assert payload["username"] == "Payload User"
+
+
+def test_load_batch_manifest_reads_jsonl_and_csv(tmp_path: Path) -> None:
+    jsonl_manifest = tmp_path / "topics.jsonl"
+    jsonl_manifest.write_text(
+        '"Solar power"\n\n{"topic": "Wind power", "section_count": 3}\n{"payload_file": "p.json"}\n',
+        encoding="utf-8",
+    )
+    csv_manifest = tmp_path / "topics.csv"
+    csv_manifest.write_text("topic,section_count\nTidal power,2\nGeothermal,\n", encoding="utf-8")
+
+    assert load_batch_manifest(jsonl_manifest) == [
+        {"topic": "Solar power"},
+        {"topic": "Wind power", "section_count": 3},
+        {"payload_file": "p.json"},
+    ]
+    assert load_batch_manifest(csv_manifest) == [
+        {"topic": "Tidal power", "section_count": "2"},
+        {"topic": "Geothermal"},
+    ]
+
+
+def test_manifest_entries_default_to_batch_priority(tmp_path: Path) -> None:
+    args = argparse.Namespace(section_count=None, user_email=None, username=None, delivery=None)
+
+    default = _manifest_entry_payload({"topic": "Solar power"}, tmp_path, args, [], [])
+    explicit = _manifest_entry_payload(
+        {"topic": "Wind power", "priority": "interactive"}, tmp_path, args, [], []
+    )
+
+    assert default["priority"] == "batch"
+    assert explicit["priority"] == "interactive"
+
+
+def test_load_batch_manifest_rejects_invalid_lines(tmp_path: Path) -> None:
+    manifest = tmp_path / "topics.jsonl"
+    manifest.write_text("[1, 2]\n", encoding="utf-8")
+
+    with pytest.raises(SystemExit) as excinfo:
+        load_batch_manifest(manifest)
+
+    assert "line 1" in str(excinfo.value)
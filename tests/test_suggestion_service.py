@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import time
+
+from sqlalchemy import select
 
 from backend.db import (
     Base,
     Report,
+    ReportHeading,
     ReportStatus,
     SavedTopic,
     User,
@@ -12,8 +16,13 @@ from backend.db import (
     create_session_factory,
     session_scope,
 )
-from backend.schemas import SuggestionsRequest
+from backend.db.schema_migrations import backfill_report_headings
+from backend.schemas import GenerateRequest, Outline, Section, SuggestionsRequest
+from backend.services.related_topics import RelatedTopicFinder
 from backend.services.suggestion_service import SuggestionService
+from backend.storage import DatabaseReportStore
+from backend.utils.cache import TTLCache
+from backend.utils.embeddings import HashingEmbeddingBackend
 
 
 class _StubSuggestionClient:
@@ -35,40 +44,133 @@ def _session_factory():
     return create_session_factory(engine)
 
 
-def test_load_report_headings_collects_all_subsections():
-    session_factory = _session_factory()
+def _add_report(session_factory, email, slug, sections, **report_fields):
     with session_scope(session_factory) as session:
-        user = User(email="seed@example.com", full_name="Seeder", username="Seeder")
-        session.add(user)
-        session.flush()
-        topic = SavedTopic(slug="topic", title="Topic", owner=user)
+        user = session.scalar(select(User).where(User.email == email))
+        if user is None:
+            user = User(email=email, full_name="Seeder", username="Seeder")
+            session.add(user)
+            session.flush()
+        topic = SavedTopic(slug=slug, title=slug.title(), owner=user)
         session.add(topic)
         session.flush()
+        outline = {"report_title": slug.title(), "sections": sections}
+        report_fields.setdefault("status", ReportStatus.COMPLETE)
         report = Report(
             saved_topic=topic,
             owner=user,
-            status=ReportStatus.COMPLETE,
-            sections={
-                "outline": {
-                    "sections": [
-                        {"title": "Section One", "subsections": ["First A", "First B"]},
-                        {"title": "Section Two", "subsections": ["Second A"]},
-                    ]
-                }
-            },
+            outline_snapshot=outline,
+            sections={"outline": outline},
+            **report_fields,
         )
         session.add(report)
+        session.flush()
+        report.set_headings(outline)
+
+
+def test_load_report_headings_collects_all_subsections():
+    session_factory = _session_factory()
+    _add_report(
+        session_factory,
+        "seed@example.com",
+        "topic",
+        [
+            {"title": "Section One", "subsections": ["First A", "First B"]},
+            {"title": "Section Two", "subsections": ["Second A"]},
+        ],
+    )
 
     service = SuggestionService(text_client=object(), session_factory=session_factory)
-    request = SuggestionsRequest.model_validate({"include_report_headings": True})
+    request = SuggestionsRequest.model_validate(
+        {"include_report_headings": True, "user_email": "seed@example.com"}
+    )
 
     seeds = service._collect_seeds(request)
 
-    assert "Section One" in seeds
-    assert "Section Two" in seeds
-    assert "First A" in seeds
-    assert "First B" in seeds
-    assert "Second A" in seeds
+    assert seeds == ["Section One", "First A", "First B", "Section Two", "Second A"]
+
+
+def test_load_report_headings_is_scoped_to_requesting_user():
+    session_factory = _session_factory()
+    _add_report(
+        session_factory,
+        "mine@example.com",
+        "mine",
+        [{"title": "My Section", "subsections": []}],
+    )
+    _add_report(
+        session_factory,
+        "other@example.com",
+        "theirs",
+        [{"title": "Their Section", "subsections": []}],
+    )
+    service = SuggestionService(text_client=object(), session_factory=session_factory)
+    request = SuggestionsRequest.model_validate(
+        {"include_report_headings": True, "user_email": "mine@example.com"}
+    )
+
+    assert service._collect_seeds(request) == ["My Section"]
+
+
+def test_load_report_headings_skips_unfinished_and_deleted_reports():
+    session_factory = _session_factory()
+    _add_report(
+        session_factory, "seed@example.com", "done", [{"title": "Kept", "subsections": []}]
+    )
+    _add_report(
+        session_factory,
+        "seed@example.com",
+        "running",
+        [{"title": "Running", "subsections": []}],
+        status=ReportStatus.RUNNING,
+    )
+    _add_report(
+        session_factory,
+        "seed@example.com",
+        "failed",
+        [{"title": "Failed", "subsections": []}],
+        status=ReportStatus.FAILED,
+    )
+    _add_report(
+        session_factory,
+        "seed@example.com",
+        "deleted",
+        [{"title": "Deleted", "subsections": []}],
+        is_deleted=True,
+    )
+    service = SuggestionService(text_client=object(), session_factory=session_factory)
+    request = SuggestionsRequest.model_validate(
+        {"include_report_headings": True, "user_email": "seed@example.com"}
+    )
+
+    assert service._collect_seeds(request) == ["Kept"]
+
+
+def test_backfill_report_headings_indexes_existing_reports():
+    engine = create_engine_from_url("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session_factory = create_session_factory(engine)
+    with session_scope(session_factory) as session:
+        user = User(email="legacy@example.com", full_name="Legacy", username="Legacy")
+        topic = SavedTopic(slug="legacy", title="Legacy", owner=user)
+        session.add(
+            Report(
+                saved_topic=topic,
+                owner=user,
+                outline_snapshot={
+                    "report_title": "Legacy",
+                    "sections": [{"title": "Old Section", "subsections": ["Old Sub"]}],
+                },
+            )
+        )
+
+    assert backfill_report_headings(engine) == 1
+    assert backfill_report_headings(engine) == 0
+    with session_scope(session_factory) as session:
+        headings = session.scalars(
+            select(ReportHeading.heading).order_by(ReportHeading.position)
+        ).all()
+    assert headings == ["Old Section", "Old Sub"]
 
 
 def test_generate_with_free_roam_merges_sources():
@@ -133,6 +235,102 @@ def test_generate_keeps_guided_results_when_free_roam_fails():
     assert len(client.calls) == 2
 
 
+class _DelayedSuggestionClient:
+    def __init__(self, responses):
+        self._responses = list(responses)
+
+    async def call_text_async(self, model_spec, system_prompt, user_prompt, style_hint=None):
+        delay, response = self._responses.pop(0)
+        await asyncio.sleep(delay)
+        return response
+
+
+def _free_roam_request():
+    return SuggestionsRequest.model_validate(
+        {
+            "topic": "AI",
+            "enable_free_roam": True,
+            "max_suggestions": 4,
+            "model": {"model": "test-model"},
+        }
+    )
+
+
+def test_generate_runs_guided_and_free_roam_passes_concurrently():
+    client = _DelayedSuggestionClient(
+        [
+            (0.2, '{"suggestions":[{"title":"AI Safety"}]}'),
+            (0.2, '{"suggestions":[{"title":"AI Safety"},{"title":"Compute Policy"}]}'),
+        ]
+    )
+    service = SuggestionService(text_client=client, session_factory=None)
+
+    started = time.perf_counter()
+    response = asyncio.run(service.generate(_free_roam_request()))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35
+    assert [(item.title, item.source) for item in response.suggestions] == [
+        ("AI Safety", "guided"),
+        ("Compute Policy", "free_roam"),
+    ]
+
+
+def test_generate_returns_guided_results_when_free_roam_times_out():
+    client = _DelayedSuggestionClient(
+        [
+            (0.0, '{"suggestions":[{"title":"AI Safety"}]}'),
+            (5.0, '{"suggestions":[{"title":"Compute Policy"}]}'),
+        ]
+    )
+    service = SuggestionService(
+        text_client=client, session_factory=None, free_roam_timeout=0.1
+    )
+
+    started = time.perf_counter()
+    response = asyncio.run(service.generate(_free_roam_request()))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0
+    assert [item.title for item in response.suggestions] == ["AI Safety"]
+
+
+def test_generate_skips_free_roam_wait_when_guided_fills_the_list():
+    client = _DelayedSuggestionClient(
+        [
+            (0.0, '{"suggestions":[{"title":"A"},{"title":"B"},{"title":"C"},{"title":"D"}]}'),
+            (5.0, '{"suggestions":[{"title":"Compute Policy"}]}'),
+        ]
+    )
+    service = SuggestionService(text_client=client, session_factory=None)
+
+    started = time.perf_counter()
+    response = asyncio.run(service.generate(_free_roam_request()))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0
+    assert [item.source for item in response.suggestions] == ["guided"] * 4
+
+
+def test_generate_bounds_free_roam_by_grace_after_guided_completes():
+    client = _DelayedSuggestionClient(
+        [
+            (0.2, '{"suggestions":[{"title":"AI Safety"}]}'),
+            (5.0, '{"suggestions":[{"title":"Compute Policy"}]}'),
+        ]
+    )
+    service = SuggestionService(
+        text_client=client, session_factory=None, free_roam_grace=0.1
+    )
+
+    started = time.perf_counter()
+    response = asyncio.run(service.generate(_free_roam_request()))
+    elapsed = time.perf_counter() - started
+
+    assert 0.3 <= elapsed < 1.0
+    assert [item.title for item in response.suggestions] == ["AI Safety"]
+
+
 def test_parse_titles_accepts_fenced_json_payload():
     service = SuggestionService(text_client=object(), session_factory=None)
     raw = """```json
@@ -142,3 +340,131 @@ def test_parse_titles_accepts_fenced_json_payload():
     titles = service._parse_titles(raw, 5)
 
     assert titles == ["AI Safety", "Model Evaluation"]
+
+
+def test_generate_serves_repeated_seed_sets_from_cache():
+    client = _StubSuggestionClient(['{"suggestions":[{"title":"AI Safety"}]}'])
+    service = SuggestionService(text_client=client, session_factory=None)
+
+    async def scenario():
+        first = await service.generate(
+            SuggestionsRequest.model_validate({"topic": "AI", "seeds": ["Robotics"]})
+        )
+        second = await service.generate(
+            SuggestionsRequest.model_validate({"topic": "robotics", "seeds": ["ai"]})
+        )
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second
+    assert len(client.calls) == 1
+
+
+def test_generate_refreshes_stale_results_in_background():
+    now = [0.0]
+    client = _StubSuggestionClient(
+        [
+            '{"suggestions":[{"title":"Old Idea"}]}',
+            '{"suggestions":[{"title":"New Idea"}]}',
+        ]
+    )
+    service = SuggestionService(text_client=client, session_factory=None)
+    service.cache = TTLCache(ttl=10, stale_ttl=100, clock=lambda: now[0])
+    request = SuggestionsRequest.model_validate({"topic": "AI"})
+
+    async def scenario():
+        await service.generate(request)
+        now[0] = 20.0
+        stale = await service.generate(request)
+        await asyncio.gather(*service._refreshes)
+        refreshed = await service.generate(request)
+        return stale, refreshed
+
+    stale, refreshed = asyncio.run(scenario())
+
+    assert [item.title for item in stale.suggestions] == ["Old Idea"]
+    assert [item.title for item in refreshed.suggestions] == ["New Idea"]
+    assert len(client.calls) == 2
+
+
+def test_related_mode_returns_nearest_past_topics_without_llm(tmp_path):
+    session_factory = _session_factory()
+    backend = HashingEmbeddingBackend()
+    store = DatabaseReportStore(
+        base_dir=tmp_path, session_factory=session_factory, embedding_backend=backend
+    )
+    topics = {
+        "Solar Energy Storage": ["Battery Storage", "Grid Integration"],
+        "Lithium Battery Chemistry": ["Cathode Materials", "Battery Lifespan"],
+        "Medieval Poetry": ["Troubadours", "Epic Verse"],
+    }
+    for topic, headings in topics.items():
+        request = GenerateRequest.model_validate(
+            {
+                "topic": topic,
+                "mode": "generate_report",
+                "user_email": "me@example.com",
+                "username": "Me",
+            }
+        )
+        outline = Outline(
+            report_title=topic,
+            sections=[Section(title=heading, subsections=[]) for heading in headings],
+        )
+        handle = store.prepare_report(request, outline)
+        store.finalize_report(handle, f"# {topic}", [])
+
+    with session_scope(session_factory) as session:
+        report = session.scalars(select(Report)).first()
+        assert report.embedding_model == backend.model_name
+        assert report.embedding_dimensions == len(report.embedding) == backend.dimensions
+        assert all(heading.embedding for heading in report.headings)
+
+    service = SuggestionService(
+        text_client=object(), session_factory=session_factory, embedding_backend=backend
+    )
+    response = asyncio.run(
+        service.generate(
+            SuggestionsRequest.model_validate(
+                {
+                    "topic": "Solar battery storage",
+                    "mode": "related",
+                    "user_email": "me@example.com",
+                }
+            )
+        )
+    )
+
+    titles = [item.title for item in response.suggestions]
+    assert titles[0] == "Solar Energy Storage"
+    assert "Lithium Battery Chemistry" in titles
+    assert "Medieval Poetry" not in titles
+    assert {item.source for item in response.suggestions} == {"related"}
+
+
+def test_related_topic_indexes_keep_only_recent_users(tmp_path):
+    session_factory = _session_factory()
+    backend = HashingEmbeddingBackend()
+    store = DatabaseReportStore(
+        base_dir=tmp_path, session_factory=session_factory, embedding_backend=backend
+    )
+    emails = ["a@example.com", "b@example.com", "c@example.com"]
+    for email in emails:
+        request = GenerateRequest.model_validate(
+            {
+                "topic": "Solar Energy",
+                "mode": "generate_report",
+                "user_email": email,
+                "username": "U",
+            }
+        )
+        handle = store.prepare_report(request, Outline(report_title="Solar Energy", sections=[]))
+        store.finalize_report(handle, "# Solar Energy", [])
+    finder = RelatedTopicFinder(session_factory, backend, max_indexes=2)
+
+    for email in emails:
+        assert [match.title for match in finder.find(email, ["Solar"])] == ["Solar Energy"]
+
+    assert len(finder._indexes) == 2
+    assert finder._indexes.get("a@example.com") is None
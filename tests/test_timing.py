@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+
+from backend.schemas import GenerateRequest, Outline, Section
+from backend.services.report_service import ReportGeneratorService
+from backend.utils.metrics import STAGE_DURATION
+from backend.utils.timing import LatencyHistogram, Stopwatch
+
+
+def test_latency_histogram_uses_cumulative_buckets():
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(seconds)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == 3.65
+
+
+def test_stopwatch_reads_the_injected_clock():
+    ticks = iter([10.0, 10.25])
+
+    assert Stopwatch(clock=lambda: next(ticks)).elapsed_ms() == 250.0
+
+
+class _SlowTextClient:
+    async def call_text_async(self, model_spec, system_prompt, user_prompt, style_hint=None):
+        await asyncio.sleep(0.05 if "Section body to edit" in user_prompt else 0.01)
+        return "Body text."
+
+
+def test_report_stream_reports_stage_durations_and_timings_block():
+    service = ReportGeneratorService(outline_service=object(), text_client=_SlowTextClient())
+    outline = Outline(report_title="Tides", sections=[Section(title="Origins", subsections=[])])
+    editor_count = STAGE_DURATION.labels(stage="editor").count
+
+    async def scenario(include_timings):
+        request = GenerateRequest(outline=outline, include_timings=include_timings)
+        return [event async for event in service.stream_report(request)]
+
+    events = asyncio.run(scenario(True))
+
+    by_status = {event["status"]: event for event in events}
+    assert by_status["editing_section"]["writer_duration_ms"] > 0
+    assert by_status["section_complete"]["editor_duration_ms"] >= 40
+    timings = events[-1]["timings"]
+    assert timings["sections"][0]["section"] == "1: Origins"
+    assert timings["editor_ms"] == by_status["section_complete"]["editor_duration_ms"]
+    assert timings["total_ms"] >= timings["writer_ms"] + timings["editor_ms"]
+    assert STAGE_DURATION.labels(stage="editor").count == editor_count + 1
+    assert "timings" not in asyncio.run(scenario(False))[-1]
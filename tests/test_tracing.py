@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from backend.api.dependencies import get_report_service
+from backend.api.main import app
+from backend.db import Base, create_engine_from_url, create_session_factory
+from backend.schemas import GenerateRequest, Outline, Section
+from backend.services.report_service import ReportGeneratorService
+from backend.storage import DatabaseReportStore
+from backend.utils.tracing import (
+    FileSpanExporter,
+    InMemorySpanExporter,
+    Tracer,
+    parse_traceparent,
+    set_tracer,
+)
+
+_TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+class _EchoTextClient:
+    async def call_text_async(self, model_spec, system_prompt, user_prompt, style_hint=None):
+        return "Body text."
+
+
+def _service(tmp_path: Path) -> ReportGeneratorService:
+    engine = create_engine_from_url("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    store = DatabaseReportStore(
+        base_dir=tmp_path, session_factory=create_session_factory(engine), embedding_backend=None
+    )
+    return ReportGeneratorService(
+        outline_service=object(), text_client=_EchoTextClient(), report_store=store
+    )
+
+
+def _request() -> GenerateRequest:
+    outline = Outline(
+        report_title="Tides",
+        sections=[Section(title="Origins", subsections=[]), Section(title="Plants", subsections=[])],
+    )
+    return GenerateRequest(outline=outline)
+
+
+def test_parse_traceparent_rejects_malformed_headers():
+    context = parse_traceparent(_TRACEPARENT)
+
+    assert context is not None and context.to_traceparent() == _TRACEPARENT
+    assert parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    assert parse_traceparent("garbage") is None
+
+
+def test_report_spans_form_one_tree_under_the_propagated_parent(tmp_path: Path):
+    exporter = InMemorySpanExporter()
+    set_tracer(Tracer(exporter))
+    try:
+        service = _service(tmp_path)
+
+        async def scenario():
+            stream = service.stream_report(_request(), trace_parent=parse_traceparent(_TRACEPARENT))
+            return [event async for event in stream]
+
+        events = asyncio.run(scenario())
+    finally:
+        set_tracer(None)
+
+    assert events[0]["trace_id"] == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert {span.context.trace_id for span in exporter.spans} == {events[0]["trace_id"]}
+    by_id = {span.context.span_id: span for span in exporter.spans}
+    (report,) = exporter.named("report")
+    assert report.parent_id == "00f067aa0ba902b7"
+    sections = exporter.named("report.section")
+    assert [span.attributes["section"] for span in sections] == ["1: Origins", "2: Plants"]
+    assert all(span.parent_id == report.context.span_id for span in sections)
+    llm_calls = exporter.named("llm.call")
+    assert len(llm_calls) == 4
+    for call in llm_calls:
+        stage_span = by_id[call.parent_id]
+        assert stage_span.name == f"stage.{call.attributes['stage']}"
+        assert by_id[stage_span.parent_id].name == "report.section"
+    for name in ("db.session", "file.write"):
+        children = exporter.named(name)
+        assert children
+        assert {by_id[span.parent_id].name for span in children} <= {
+            "storage.prepare",
+            "storage.finalize",
+        }
+
+
+def test_file_exporter_writes_json_lines(tmp_path: Path):
+    path = tmp_path / "traces.jsonl"
+    exporter = FileSpanExporter(path)
+    tracer = Tracer(exporter)
+
+    with tracer.span("outer") as outer:
+        with tracer.span("inner"):
+            pass
+
+    assert exporter.flush()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert '"name": "inner"' in lines[0]
+    assert f'"parent_id": "{outer.context.span_id}"' in lines[0]
+
+
+def test_file_exporter_does_not_write_on_the_calling_thread(tmp_path: Path, monkeypatch):
+    exporter = FileSpanExporter(tmp_path / "traces.jsonl")
+    writer_threads = set()
+    original_open = Path.open
+
+    def recording_open(self, *args, **kwargs):
+        writer_threads.add(threading.get_ident())
+        return original_open(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "open", recording_open)
+    tracer = Tracer(exporter)
+    for index in range(50):
+        with tracer.span(f"span-{index}"):
+            pass
+
+    assert exporter.flush()
+    assert threading.get_ident() not in writer_threads
+    assert len((tmp_path / "traces.jsonl").read_text(encoding="utf-8").splitlines()) == 50
+
+
+def test_generate_report_endpoint_propagates_traceparent():
+    captured = {}
+
+    class _RecordingService:
+        async def stream_report(self, generate_request, *, trace_parent=None, client_id=None):
+            captured["trace_parent"] = trace_parent
+            yield {"status": "complete"}
+
+    app.dependency_overrides[get_report_service] = lambda: _RecordingService()
+    try:
+        response = TestClient(app).post(
+            "/generate_report",
+            json={"topic": "Tides", "mode": "generate_report"},
+            headers={"traceparent": _TRACEPARENT},
+        )
+    finally:
+        app.dependency_overrides.pop(get_report_service, None)
+
+    assert response.status_code == 200
+    assert captured["trace_parent"].trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
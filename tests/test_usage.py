@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from backend.db import Base, Report, create_engine_from_url, create_session_factory, session_scope
+from backend.schemas import GenerateRequest, ModelSpec, Outline, Section
+from backend.services.report_service import ReportGeneratorService
+from backend.storage import DatabaseReportStore
+from backend.utils.openai_client import OpenAITextClient
+from backend.utils.pricing import load_price_table
+from backend.utils.usage import UsageRecorder, record_token_usage, recording_usage
+
+
+def test_price_table_matches_dated_snapshots_and_accepts_overrides():
+    table = load_price_table('{"house-model": {"input": 1.0, "output": 3.0}}')
+
+    assert table.cost_cents("gpt-4o-mini-2024-07-18", 1_000_000, 0) == pytest.approx(15.0)
+    assert table.cost_cents("house-model", 500_000, 500_000) == pytest.approx(200.0)
+    assert table.cost_cents("unknown-model", 10, 10) is None
+
+
+def test_usage_recorder_attributes_calls_to_the_active_stage():
+    recorder = UsageRecorder(load_price_table(""))
+
+    record_token_usage("gpt-4.1-nano", 100, 100)
+    with recording_usage(recorder, "writer"):
+        record_token_usage("gpt-4.1-nano", 1_000, 500)
+        record_token_usage("gpt-4.1-nano", 1_000, 500)
+    with recording_usage(recorder, "editor"):
+        record_token_usage("mystery-model", 10, 10)
+
+    summary = recorder.summary()
+    assert summary["stages"]["writer"] == {
+        "prompt_tokens": 2_000,
+        "completion_tokens": 1_000,
+        "total_tokens": 3_000,
+        "calls": 2,
+        "cost_cents": 0.06,
+    }
+    assert summary["total_tokens"] == 3_020
+    assert summary["cost_cents"] is None
+
+
+class _FakeCompletions:
+    async def create(self, **kwargs):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="Body text."))],
+            usage=SimpleNamespace(prompt_tokens=120, completion_tokens=80),
+        )
+
+
+def _openai_client() -> OpenAITextClient:
+    async_client = SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions()))
+    return OpenAITextClient(sync_client=object(), async_client=async_client)
+
+
+class _ChatUnsupportedCompletions:
+    async def create(self, **kwargs):
+        raise RuntimeError("This model is only supported in v1/responses")
+
+
+class _FakeResponses:
+    async def create(self, **kwargs):
+        return SimpleNamespace(
+            output_text="1: Origins\n2: Outlook",
+            usage=SimpleNamespace(input_tokens=30, output_tokens=12),
+        )
+
+
+def test_stream_text_falls_back_to_responses_api_as_one_chunk():
+    async_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=_ChatUnsupportedCompletions()),
+        responses=_FakeResponses(),
+    )
+    client = OpenAITextClient(sync_client=object(), async_client=async_client)
+    recorder = UsageRecorder(load_price_table(""))
+
+    async def scenario():
+        with recording_usage(recorder, "outline"):
+            return [
+                chunk
+                async for chunk in client.stream_text_async(
+                    ModelSpec(model="o1-pro"), "system", "user"
+                )
+            ]
+
+    assert asyncio.run(scenario()) == ["1: Origins\n2: Outlook"]
+    assert recorder.summary()["stages"]["outline"]["total_tokens"] == 42
+
+
+def test_report_usage_is_reported_and_persisted(tmp_path: Path):
+    engine = create_engine_from_url("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    store = DatabaseReportStore(
+        base_dir=tmp_path, session_factory=create_session_factory(engine), embedding_backend=None
+    )
+    service = ReportGeneratorService(
+        outline_service=object(), text_client=_openai_client(), report_store=store
+    )
+    outline = Outline(report_title="Tides", sections=[Section(title="Origins", subsections=[])])
+    request = GenerateRequest(
+        outline=outline, models={"writer": ModelSpec(model="gpt-4.1-nano")}
+    )
+
+    async def scenario():
+        return [event async for event in service.stream_report(request)]
+
+    final = asyncio.run(scenario())[-1]
+
+    assert final["status"] == "complete"
+    usage = final["usage"]
+    assert usage["stages"]["writer"]["total_tokens"] == 200
+    assert usage["stages"]["editor"]["calls"] == 1
+    assert usage["total_tokens"] == 400
+    with session_scope(store._session_factory) as session:
+        report = session.query(Report).one()
+        assert report.token_count == 400
+        assert report.cost_cents == 1
+        assert report.sections["usage"]["stages"]["writer"]["prompt_tokens"] == 120